@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from benchmarks.baseline import Baseline, Comparison
+from benchmarks.benchmark_result import BenchmarkResult
+from benchmarks.benchmark_suite import BenchmarkSuite
+from pathlib import Path
+import argparse
+import sys
+
+# The baseline that is compared against by default.
+BASELINE_PATH: Path = Path(__file__).resolve().parent / "baseline.json"
+
+def Main() -> int:
+    """
+        Runs the benchmarks, writes the results as json and compares them against the baseline.
+        Run from the project root with: python -m benchmarks
+
+        :return: The exit code, 1 if a result regressed compared to the baseline.
+        :rtype: int
+    """
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(prog="python -m benchmarks", description="Benchmarks training and inference.")
+    parser.add_argument("--quick", action="store_true", help="Fewer rows, sizes and repeats, for a fast sanity check.")
+    parser.add_argument("--output", type=Path, default=None, help="Where to write the results as json.")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="The baseline to compare against.")
+    parser.add_argument("--save-baseline", action="store_true", help="Store the results as the new baseline instead of comparing.")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="How much worse than the baseline a result may be, ex: 0.2 for 20%%.")
+    arguments: argparse.Namespace = parser.parse_args()
+
+    if arguments.quick:
+        suite: BenchmarkSuite = BenchmarkSuite(rows=1000, batchSizes=(32,), widths=(16,), repeats=1, latencySamples=500, threadCounts=(1, 2), workerCounts=(1, 2))
+    else:
+        suite: BenchmarkSuite = BenchmarkSuite()
+
+    results: list[BenchmarkResult] = suite.Run(lambda result: print(result, flush=True))
+
+    if arguments.output is not None:
+        Baseline.Save(results, arguments.output)
+        print(f"Results written to {arguments.output}")
+
+    if arguments.save_baseline:
+        Baseline.Save(results, arguments.baseline)
+        print(f"Baseline written to {arguments.baseline}")
+        return 0
+
+    if not arguments.baseline.exists():
+        print(f"No baseline to compare against at {arguments.baseline}, store one with --save-baseline.")
+        return 0
+
+    comparisons: list[Comparison] = Baseline.Compare(results, Baseline.Load(arguments.baseline), arguments.tolerance)
+    regressions: list[Comparison] = [comparison for comparison in comparisons if comparison.IsRegression()]
+
+    print(f"\nCompared {len(comparisons)} results against {arguments.baseline}:")
+    for comparison in comparisons:
+        print(comparison)
+
+    print(f"{len(regressions)} regression(s) beyond {arguments.tolerance:.0%}.")
+
+    return 1 if len(regressions) > 0 else 0
+
+if __name__ == "__main__":
+    sys.exit(Main())
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+from benchmarks.benchmark_result import BenchmarkResult
+from pathlib import Path
+import json
+import platform
+import numpy as np
+
+class Comparison():
+    """
+        A benchmark result compared against the same benchmark in a baseline.
+    """
+
+    def __init__(self: "Comparison", result: BenchmarkResult, baselineValue: float, tolerance: float) -> None:
+        """
+            :param result: The new result.
+            :type result: benchmarks.BenchmarkResult
+
+            :param baselineValue: The value of the same benchmark in the baseline.
+            :type baselineValue: float
+
+            :param tolerance: How much worse than the baseline the result may be, ex: 0.2 for 20%.
+            :type tolerance: float
+        """
+        self.result: BenchmarkResult = result
+        self.baselineValue: float    = baselineValue
+        self.tolerance: float        = tolerance
+
+    def GetChange(self) -> float:
+        """
+            :return: How much better (positive) or worse (negative) the result is compared to the baseline, ex: -0.25 for 25% worse.
+            :rtype: float
+        """
+        if self.baselineValue == 0 or self.result.value == 0:
+            return 0.0
+
+        # Throughputs compare as new / old and times as old / new, so that a 2x speedup is +100% for both.
+        ratio: float = self.result.value / self.baselineValue if self.result.higherIsBetter else self.baselineValue / self.result.value
+
+        return ratio - 1.0
+
+    def IsRegression(self) -> bool:
+        return self.GetChange() < -self.tolerance
+
+    def __repr__(self) -> str:
+        status: str = "REGRESSION" if self.IsRegression() else "ok"
+
+        return f"{self.result.GetKey()}: {self.baselineValue:.6g} -> {self.result.value:.6g} ({self.GetChange():+.1%}) {status}"
+
+class Baseline():
+    """
+        Reads and writes benchmark results as json, and compares new results against stored ones.
+        The file also holds a description of the machine, since results are only comparable on the same machine.
+    """
+
+    VERSION: int = 1
+
+    @staticmethod
+    def Save(results: list[BenchmarkResult], path: str | Path) -> None:
+        """
+            :param results: The results to save.
+            :type results: list[benchmarks.BenchmarkResult]
+
+            :param path: The path of the json file.
+            :type path: str | pathlib.Path
+        """
+        document: dict = {
+            "version": Baseline.VERSION,
+            "machine": Baseline.GetMachine(),
+            "results": [result.ToDict() for result in results]
+        }
+
+        filePath: Path = Path(path).resolve()
+        filePath.parent.mkdir(parents=True, exist_ok=True)
+
+        with open(filePath, "w") as f:
+            json.dump(document, f, indent=2)
+            f.write("\n")
+
+    @staticmethod
+    def Load(path: str | Path) -> list[BenchmarkResult]:
+        """
+            :param path: The path of the json file.
+            :type path: str | pathlib.Path
+
+            :return: The stored results.
+            :rtype: list[benchmarks.BenchmarkResult]
+
+            :raises FileNotFoundError: If the file does not exist.
+            :raises TypeError: If the file is of another version.
+        """
+        filePath: Path = Path(path).resolve()
+
+        if not filePath.exists():
+            raise FileNotFoundError(f"The baseline file does not exist: {filePath}")
+
+        with open(filePath, "r") as f:
+            document: dict = json.load(f)
+
+        if document.get("version") != Baseline.VERSION:
+            raise TypeError(f"Unsupported baseline version: {document.get('version')}!")
+
+        return [BenchmarkResult.FromDict(values) for values in document["results"]]
+
+    @staticmethod
+    def Compare(results: list[BenchmarkResult], baseline: list[BenchmarkResult], tolerance: float = 0.2) -> list[Comparison]:
+        """
+            Compares the results against the baseline. Results that aren't in the baseline are left out.
+
+            :param results: The new results.
+            :type results: list[benchmarks.BenchmarkResult]
+
+            :param baseline: The stored results.
+            :type baseline: list[benchmarks.BenchmarkResult]
+
+            :param tolerance: How much worse than the baseline a result may be before it counts as a regression.
+            :type tolerance: float
+
+            :return: One comparison per result found in the baseline.
+            :rtype: list[benchmarks.Comparison]
+        """
+        baselineValues: dict[str, float] = {result.GetKey(): result.value for result in baseline}
+
+        return [Comparison(result, baselineValues[result.GetKey()], tolerance) for result in results if result.GetKey() in baselineValues]
+
+    @staticmethod
+    def GetMachine() -> dict[str, str]:
+        return {
+            "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(),
+            "python": platform.python_version(),
+            "numpy": np.__version__
+        }
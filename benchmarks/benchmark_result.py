@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+class BenchmarkResult():
+    """
+        One measurement of a benchmark, ex: the images per second of TrainOneEpoch with a batch size of 32.
+    """
+
+    def __init__(self: "BenchmarkResult", name: str, parameters: dict[str, int | str], metric: str, value: float, higherIsBetter: bool) -> None:
+        """
+            :param name: The name of the benchmark, ex: "train_one_epoch".
+            :type name: str
+
+            :param parameters: The settings the benchmark ran with, ex: {"batchSize": 32, "width": 64}.
+            :type parameters: dict[str, int | str]
+
+            :param metric: What was measured, ex: "images_per_second".
+            :type metric: str
+
+            :param value: The measured value.
+            :type value: float
+
+            :param higherIsBetter: True for throughputs, False for times and latencies.
+            :type higherIsBetter: bool
+        """
+        self.name: str                         = name
+        self.parameters: dict[str, int | str]  = parameters
+        self.metric: str                       = metric
+        self.value: float                      = value
+        self.higherIsBetter: bool              = higherIsBetter
+
+    def GetKey(self) -> str:
+        """
+            :return: A key that is the same for the same benchmark, settings and metric, used to find it in a baseline.
+            :rtype: str
+        """
+        parameters: str = ",".join(f"{key}={value}" for (key, value) in sorted(self.parameters.items()))
+
+        return f"{self.name}[{parameters}].{self.metric}"
+
+    def ToDict(self) -> dict:
+        return {
+            "name": self.name,
+            "parameters": self.parameters,
+            "metric": self.metric,
+            "value": self.value,
+            "higherIsBetter": self.higherIsBetter
+        }
+
+    @staticmethod
+    def FromDict(values: dict) -> "BenchmarkResult":
+        return BenchmarkResult(values["name"], dict(values["parameters"]), values["metric"], float(values["value"]), bool(values["higherIsBetter"]))
+
+    def __repr__(self) -> str:
+        return f"{self.GetKey()} = {self.value:.6g}"
@@ -0,0 +1,284 @@
+from __future__ import annotations
+
+from benchmarks.benchmark_result import BenchmarkResult
+from benchmarks.synthetic_dataset import SyntheticDataset
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from mnist.mnist_dataloader import MnistDataloader
+from nn.costs.cross_entropy import CrossEntropy
+from nn.layers.dense import Dense
+from nn.layers.relu import Relu
+from nn.layers.softmax import Softmax
+from nn.memory import Memory
+from nn.network import Network
+from nn.networks.data_parallel import DataParallel
+from nn.networks.sequential import Sequential
+from nn.optimizers.sgd import Sgd
+from pathlib import Path
+import numpy as np
+import tempfile
+import time
+
+class BenchmarkSuite():
+    """
+        Times the training and inference paths of the project at several batch sizes and layer widths:
+        TrainOneEpoch, Evaluate, single image Compute latency, Compute throughput from several threads sharing
+        one network, training split over several processes (nn.DataParallel), dataloader throughput and
+        Memory save / load.
+        Every benchmark runs a few times and keeps the best time, since slower runs are noise (other processes,
+        cold caches) rather than the code.
+    """
+
+    # Where main.py reads the real dataset from.
+    DATASET_PATH: Path = Path(__file__).resolve().parent.parent / "mnist" / "data" / "mnist_train.csv"
+
+    def __init__(self: "BenchmarkSuite", rows: int = 5000, batchSizes: tuple[int, ...] = (1, 32, 256), widths: tuple[int, ...] = (16, 128),
+                 repeats: int = 3, latencySamples: int = 2000, threadCounts: tuple[int, ...] = (1, 2, 4), workerCounts: tuple[int, ...] = (1, 2, 4),
+                 dtype: np.typing.DTypeLike = np.float32) -> None:
+        """
+            :param rows: The amount of images in the benchmark dataset.
+            :type rows: int
+
+            :param batchSizes: The batch sizes to train, evaluate and read with.
+            :type batchSizes: tuple[int, ...]
+
+            :param widths: The widths of the hidden layer of the benchmarked networks.
+            :type widths: tuple[int, ...]
+
+            :param repeats: How many times each benchmark runs. The best run is kept.
+            :type repeats: int
+
+            :param latencySamples: The amount of single image Compute calls the latency percentiles are taken over.
+            :type latencySamples: int
+
+            :param threadCounts: The amounts of threads that compute with one shared network at once.
+            :type threadCounts: tuple[int, ...]
+
+            :param workerCounts: The amounts of processes that a batch is split over when training with nn.DataParallel.
+            :type workerCounts: tuple[int, ...]
+
+            :param dtype: The floating point type of the networks and dataloaders.
+            :type dtype: numpy.typing.DTypeLike
+        """
+        if rows < 1 or repeats < 1 or latencySamples < 1 or min(threadCounts, default=1) < 1 or min(workerCounts, default=1) < 1:
+            raise TypeError("The rows, repeats, latency samples, thread counts and worker counts have to be at least 1!")
+
+        self._rows: int                     = rows
+        self._batchSizes: tuple[int, ...]   = tuple(batchSizes)
+        self._widths: tuple[int, ...]       = tuple(widths)
+        self._repeats: int                  = repeats
+        self._latencySamples: int           = latencySamples
+        self._threadCounts: tuple[int, ...] = tuple(threadCounts)
+        self._workerCounts: tuple[int, ...] = tuple(workerCounts)
+        self._dtype: np.dtype               = np.dtype(dtype)
+
+    def Run(self, log: Callable[[BenchmarkResult], None] | None = None) -> list[BenchmarkResult]:
+        """
+            Runs every benchmark.
+
+            :param log: Called with every result as soon as it's measured.
+            :type log: Callable[[benchmarks.BenchmarkResult], None] | None
+
+            :return: All results.
+            :rtype: list[benchmarks.BenchmarkResult]
+        """
+        results: list[BenchmarkResult] = []
+
+        def add(result: BenchmarkResult) -> None:
+            results.append(result)
+
+            if log is not None:
+                log(result)
+
+        with tempfile.TemporaryDirectory() as directory:
+            datasetPath: Path = SyntheticDataset.Write(Path(directory) / "benchmark.csv", self._rows, BenchmarkSuite.DATASET_PATH)
+
+            for batchSize in self._batchSizes:
+                for useCache in (False, True):
+                    add(self.BenchmarkDataloader(datasetPath, batchSize, useCache))
+
+            for width in self._widths:
+                for batchSize in self._batchSizes:
+                    add(self.BenchmarkTraining(datasetPath, width, batchSize))
+                    add(self.BenchmarkEvaluation(datasetPath, width, batchSize))
+
+                for result in self.BenchmarkComputeLatency(width):
+                    add(result)
+
+                for threads in self._threadCounts:
+                    add(self.BenchmarkThreadScaling(width, threads))
+
+                for batchSize in self._batchSizes:
+                    for workers in self._workerCounts:
+                        add(self.BenchmarkDataParallel(width, workers, batchSize))
+
+                for result in self.BenchmarkMemory(Path(directory), width):
+                    add(result)
+
+        return results
+
+    def CreateNetwork(self, width: int) -> Network:
+        """
+            :param width: The width of the hidden layer.
+            :type width: int
+
+            :return: A network shaped like the one in main.py.
+            :rtype: nn.Network
+        """
+        layers: list = [Dense(28 * 28, width), Relu(width), Dense(width, 10), Softmax(10)]
+
+        return Sequential(layers, CrossEntropy(10), Sgd(0.01), dtype=self._dtype)
+
+    def BenchmarkDataloader(self, datasetPath: Path, batchSize: int, useCache: bool) -> BenchmarkResult:
+        """
+            :return: The rows per second of reading one epoch with ReadOneBatch.
+            :rtype: benchmarks.BenchmarkResult
+        """
+        def run() -> None:
+            dataloader: MnistDataloader = MnistDataloader(datasetPath, batchSize, useCache=useCache, dtype=self._dtype)
+
+            while len(dataloader.ReadOneBatch()) > 0:
+                pass
+
+        MnistDataloader(datasetPath, useCache=useCache) # Writes the cache outside of the timing.
+        seconds: float = self._bestTime(run)
+
+        return BenchmarkResult("dataloader", {"batchSize": batchSize, "source": "cache" if useCache else "csv"}, "rows_per_second", self._rows / seconds, True)
+
+    def BenchmarkTraining(self, datasetPath: Path, width: int, batchSize: int) -> BenchmarkResult:
+        """
+            Trains from the cache, so that the time is spent in the network rather than in parsing text.
+
+            :return: The images per second of TrainOneEpoch.
+            :rtype: benchmarks.BenchmarkResult
+        """
+        network: Network            = self.CreateNetwork(width)
+        dataloader: MnistDataloader = MnistDataloader(datasetPath, batchSize, useCache=True, dtype=self._dtype)
+
+        def run() -> None:
+            network.TrainOneEpoch(dataloader)
+            dataloader.Reset()
+
+        seconds: float = self._bestTime(run)
+
+        return BenchmarkResult("train_one_epoch", {"batchSize": batchSize, "width": width}, "images_per_second", self._rows / seconds, True)
+
+    def BenchmarkEvaluation(self, datasetPath: Path, width: int, chunkSize: int) -> BenchmarkResult:
+        """
+            :return: The images per second of Evaluate, reading chunkSize images at a time.
+            :rtype: benchmarks.BenchmarkResult
+        """
+        network: Network            = self.CreateNetwork(width)
+        dataloader: MnistDataloader = MnistDataloader(datasetPath, chunkSize, useCache=True, dtype=self._dtype)
+
+        def run() -> None:
+            network.Evaluate(dataloader, chunkSize)
+            dataloader.Reset()
+
+        seconds: float = self._bestTime(run)
+
+        return BenchmarkResult("evaluate", {"batchSize": chunkSize, "width": width}, "images_per_second", self._rows / seconds, True)
+
+    def BenchmarkComputeLatency(self, width: int) -> list[BenchmarkResult]:
+        """
+            :return: The 50th and 99th percentile of the time a single image Compute call takes, in microseconds,
+            for the network and for the network frozen with nn.Network.Freeze.
+            :rtype: list[benchmarks.BenchmarkResult]
+        """
+        network: Network               = self.CreateNetwork(width)
+        images: np.ndarray             = np.random.default_rng(0).random((self._latencySamples, 28 * 28)).astype(self._dtype)
+        results: list[BenchmarkResult] = []
+
+        for (name, compute) in (("compute_latency", network.Compute), ("frozen_compute_latency", network.Freeze().Compute)):
+            latencies: np.ndarray = np.empty(self._latencySamples)
+
+            for image in images[:100]: # Warm up.
+                compute(image)
+
+            for (index, image) in enumerate(images):
+                start: float     = time.perf_counter()
+                compute(image)
+                latencies[index] = time.perf_counter() - start
+
+            (p50, p99) = np.percentile(latencies, [50, 99]) * 1e6
+
+            results.append(BenchmarkResult(name, {"width": width}, "p50_microseconds", float(p50), False))
+            results.append(BenchmarkResult(name, {"width": width}, "p99_microseconds", float(p99), False))
+
+        return results
+
+    def BenchmarkThreadScaling(self, width: int, threads: int, batchSize: int = 32) -> BenchmarkResult:
+        """
+            Every thread computes its share of the rows in batches, all with the same network. Compare the results
+            of different thread counts to see how well inference scales, numpy lets go of the GIL in the matrix multiplications.
+
+            :return: The images per second of all threads together.
+            :rtype: benchmarks.BenchmarkResult
+        """
+        network: Network         = self.CreateNetwork(width)
+        images: np.ndarray       = np.random.default_rng(0).random((self._rows, 28 * 28)).astype(self._dtype)
+        shares: list[np.ndarray] = np.array_split(images, threads)
+
+        def compute(share: np.ndarray) -> None:
+            for start in range(0, len(share), batchSize):
+                network.Compute(share[start:start + batchSize])
+
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            seconds: float = self._bestTime(lambda: list(pool.map(compute, shares)))
+
+        return BenchmarkResult("compute_threads", {"batchSize": batchSize, "threads": threads, "width": width}, "images_per_second", self._rows / seconds, True)
+
+    def BenchmarkDataParallel(self, width: int, workers: int, batchSize: int) -> BenchmarkResult:
+        """
+            Trains one epoch of random rows with nn.DataParallel, every batch split over the given amount of worker
+            processes. Compare it with 1 worker at the same batch size to find the batch size from which splitting
+            pays for sending every batch to the workers and summing their gradients.
+
+            :return: The images per second of TrainOnArrays.
+            :rtype: benchmarks.BenchmarkResult
+        """
+        random: np.random.Generator = np.random.default_rng(0)
+        inputs: np.ndarray          = random.random((self._rows, 28 * 28)).astype(self._dtype)
+        expected: np.ndarray        = np.eye(10, dtype=self._dtype)[random.integers(0, 10, size=self._rows)]
+
+        with DataParallel(self.CreateNetwork(width), workers) as trainer:
+            def run() -> None:
+                for start in range(0, self._rows, batchSize):
+                    trainer.TrainOnArrays(inputs[start:start + batchSize], expected[start:start + batchSize])
+
+            seconds: float = self._bestTime(run)
+
+        return BenchmarkResult("train_data_parallel", {"batchSize": batchSize, "width": width, "workers": workers}, "images_per_second", self._rows / seconds, True)
+
+    def BenchmarkMemory(self, directory: Path, width: int) -> list[BenchmarkResult]:
+        """
+            :return: The time Memory takes to save and to load a network (with and without memory-mapping), in milliseconds.
+            :rtype: list[benchmarks.BenchmarkResult]
+        """
+        memory: Memory   = Memory()
+        network: Network = self.CreateNetwork(width)
+        path: Path       = directory / f"network_{width}.model"
+
+        saveSeconds: float = self._bestTime(lambda: memory.SaveNetwork(network, path))
+        loadSeconds: float = self._bestTime(lambda: memory.LoadNetwork(path))
+        mapSeconds: float  = self._bestTime(lambda: memory.LoadNetwork(path, memoryMap=True))
+
+        return [
+            BenchmarkResult("memory", {"width": width}, "save_milliseconds", saveSeconds * 1e3, False),
+            BenchmarkResult("memory", {"width": width}, "load_milliseconds", loadSeconds * 1e3, False),
+            BenchmarkResult("memory", {"width": width}, "load_memory_mapped_milliseconds", mapSeconds * 1e3, False)
+        ]
+
+    def _bestTime(self, run: Callable[[], None]) -> float:
+        """
+            :return: The fastest of the repeated runs, in seconds.
+            :rtype: float
+        """
+        best: float = float("inf")
+
+        for _ in range(self._repeats):
+            start: float = time.perf_counter()
+            run()
+            best = min(best, time.perf_counter() - start)
+
+        return best
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from pathlib import Path
+import numpy as np
+
+class SyntheticDataset():
+    """
+        Writes datasets in the mnist csv format (value[0] := the label, value[1:] := the 28 * 28 pixels),
+        so the benchmarks can run without the real dataset. If the real dataset exists, its first rows are
+        used instead, so the numbers stay comparable to training on mnist.
+    """
+
+    # Roughly the share of black pixels in an mnist image, which matters for the size of the csv text.
+    ZERO_FRACTION: float = 0.8
+
+    @staticmethod
+    def Write(path: str | Path, rows: int, source: str | Path | None = None, seed: int = 0) -> Path:
+        """
+            :param path: Where to write the csv file.
+            :type path: str | pathlib.Path
+
+            :param rows: The amount of images.
+            :type rows: int
+
+            :param source: A real mnist csv file to take the first rows from. Random images are generated if it
+            doesn't exist or has fewer rows.
+            :type source: str | pathlib.Path | None
+
+            :param seed: The seed of the random images, so every run benchmarks the same data.
+            :type seed: int
+
+            :return: The absolute path of the written file.
+            :rtype: pathlib.Path
+        """
+        filePath: Path = Path(path).resolve()
+        lines: list[str] = []
+
+        if source is not None and Path(source).exists():
+            with open(source, "r") as f:
+                for line in f:
+                    if len(lines) >= rows:
+                        break
+
+                    lines.append(line.rstrip("\n"))
+
+        generator: np.random.Generator = np.random.default_rng(seed)
+        missing: int                   = rows - len(lines)
+
+        if missing > 0:
+            labels: np.ndarray = generator.integers(0, 10, size=missing)
+            pixels: np.ndarray = generator.integers(1, 256, size=(missing, 28 * 28))
+            pixels[generator.random(size=pixels.shape) < SyntheticDataset.ZERO_FRACTION] = 0
+
+            lines += [",".join(map(str, [label, *imagePixels])) for (label, imagePixels) in zip(labels, pixels)]
+
+        with open(filePath, "w") as f:
+            f.write("\n".join(lines) + "\n")
+
+        return filePath
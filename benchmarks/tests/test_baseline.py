@@ -0,0 +1,61 @@
+import tempfile
+import unittest
+
+from benchmarks.baseline import Baseline, Comparison
+from benchmarks.benchmark_result import BenchmarkResult
+from benchmarks.benchmark_suite import BenchmarkSuite
+from pathlib import Path
+
+class TestBaselineComparison(unittest.TestCase):
+    def test_finds_regressions(self) -> None:
+        # Arrange:
+        baseline: list[BenchmarkResult] = [
+            BenchmarkResult("train_one_epoch", {"batchSize": 32, "width": 16}, "images_per_second", 1000.0, True),
+            BenchmarkResult("compute_latency", {"width": 16}, "p99_microseconds", 100.0, False)
+        ]
+        results: list[BenchmarkResult] = [
+            BenchmarkResult("train_one_epoch", {"width": 16, "batchSize": 32}, "images_per_second", 700.0, True),
+            BenchmarkResult("compute_latency", {"width": 16}, "p99_microseconds", 50.0, False),
+            BenchmarkResult("evaluate", {"batchSize": 32, "width": 16}, "images_per_second", 10.0, True) # Not in the baseline.
+        ]
+
+        # Act:
+        comparisons: list[Comparison] = Baseline.Compare(results, baseline, 0.2)
+
+        # Assert:
+        self.assertEqual(len(comparisons), 2)
+        self.assertTrue(comparisons[0].IsRegression())
+        self.assertAlmostEqual(comparisons[0].GetChange(), -0.3)
+        self.assertFalse(comparisons[1].IsRegression())
+        self.assertAlmostEqual(comparisons[1].GetChange(), 1.0) # Twice as fast.
+
+    def test_save_load_round_trip(self) -> None:
+        # Arrange:
+        results: list[BenchmarkResult] = [BenchmarkResult("memory", {"width": 16}, "save_milliseconds", 1.5, False)]
+
+        with tempfile.TemporaryDirectory() as directory:
+            path: Path = Path(directory) / "results.json"
+
+            # Act:
+            Baseline.Save(results, path)
+            loaded: list[BenchmarkResult] = Baseline.Load(path)
+
+        # Assert:
+        self.assertEqual([result.GetKey() for result in loaded], [result.GetKey() for result in results])
+        self.assertEqual(loaded[0].value, 1.5)
+        self.assertFalse(loaded[0].higherIsBetter)
+
+class TestBenchmarkSuite(unittest.TestCase):
+    def test_runs_on_synthetic_data(self) -> None:
+        # Arrange:
+        suite: BenchmarkSuite = BenchmarkSuite(rows=40, batchSizes=(8,), widths=(4,), repeats=1, latencySamples=10, threadCounts=(1, 2), workerCounts=(1, 2))
+
+        # Act:
+        results: list[BenchmarkResult] = suite.Run()
+
+        # Assert:
+        self.assertEqual({result.name for result in results}, {"dataloader", "train_one_epoch", "evaluate", "compute_latency", "frozen_compute_latency", "compute_threads", "train_data_parallel", "memory"})
+        self.assertTrue(all(result.value > 0 for result in results))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+from gui.prediction_worker import PredictionWorker
+from mnist.preprocessor import Preprocessor
 from nn.network import Network
 import tkinter as tk
 import numpy as np
+import traceback
 
 class App():
     """
@@ -15,21 +18,33 @@ class App():
 
     CELL_SIZE: int = 8  # Size in pixels of the cells.
     GRID_SIZE: int = 28 # Size of the grid (x * x).
+    FRAME_MS: int  = 16 # The canvas is updated at most once per frame (about 60 per second).
 
-    def __init__(self: "App", network: Network) -> None:
+    def __init__(self: "App", network: Network, preprocess: bool = True) -> None:
         """
             :param network: The network of which to validate!
             :type network: nn.Network
+
+            :param preprocess: Tells if the drawn digit is scaled and centered like the mnist digits before it's predicted, see mnist.Preprocessor.
+            :type preprocess: bool
         """
-        self._network: Network = network
+        self._network: Network                  = network
+        self._preprocessor: Preprocessor | None = Preprocessor() if preprocess else None
 
         self._root: tk.Tk | None                 = None
         self._canvas: tk.Canvas | None           = None
         self._predictionVar: tk.StringVar | None = None
+        self._worker: PredictionWorker | None    = None
 
         # Grid state:
         self._grid: list[list[float]] = [[0.0 for _ in range(self.GRID_SIZE)] for _ in range(self.GRID_SIZE)]
 
+        # Canvas state, the cells are created once and only the changed (dirty) ones are recoloured every frame:
+        self._cells: list[list[int]]           = []
+        self._dirtyCells: set[tuple[int, int]] = set()
+        self._frameJob: str | None             = None
+        self._predictPending: bool             = False
+
     def _drawCell(self, event: tk.Event) -> None:
         """
             Draws a cell under the mouse.
@@ -43,56 +58,77 @@ class App():
         y = event.y // self.CELL_SIZE
 
         if 0 <= x < self.GRID_SIZE and 0 <= y < self.GRID_SIZE:
-            # Accumulate instead of overwrite (optional but recommended)
-            self._grid[y][x] = 1.0
-
-            self._redrawGrid()
-            self._predict()
+            # Moving within a cell that's already drawn changes nothing.
+            if self._grid[y][x] != 1.0:
+                self._grid[y][x] = 1.0
+                self._dirtyCells.add((x, y))
+                self._scheduleFrame(predict=True)
 
     def _smoothGrid(self, event: tk.Event) -> None:
-        kernel = np.array([
-            [0, 1, 0],
-            [1, 4, 1],
-            [0, 1, 0]
-        ], dtype=np.float64) / 8.0
+        """
+            Blurs the drawn grid when the mouse is released, so the strokes get soft edges like the mnist digits.
 
-        grid = np.array(self._grid, dtype=np.float64)
-        smoothed = np.zeros_like(grid)
+            :param event: The mouse event.
+            :type event: tk.Event
+        """
+        grid: np.ndarray     = np.array(self._grid, dtype=np.float64)
+        smoothed: np.ndarray = Preprocessor.Blur(grid[np.newaxis])[0]
 
-        for y in range(1, self.GRID_SIZE - 1):
-            for x in range(1, self.GRID_SIZE - 1):
-                region = grid[y-1:y+2, x-1:x+2]
-                smoothed[y, x] = np.sum(region * kernel)
+        self._markChanged(smoothed)
+        self._grid = smoothed.tolist()
 
-        # Clamp values to [0.0, 1.0]
-        smoothed = np.clip(smoothed, 0.0, 1.0)
+        self._scheduleFrame(predict=True)
 
-        self._grid = smoothed.tolist()
+    def _markChanged(self, grid: np.ndarray) -> None:
+        """
+            Marks the cells that differ between the current grid and the given one as dirty.
+
+            :param grid: The new grid, of shape (GRID_SIZE, GRID_SIZE).
+            :type grid: numpy.ndarray
+        """
+        (ys, xs) = np.nonzero(grid != np.array(self._grid, dtype=np.float64))
+        self._dirtyCells.update(zip(xs.tolist(), ys.tolist()))
 
-        self._redrawGrid()
-        self._predict()
+    def _scheduleFrame(self, predict: bool = False) -> None:
+        """
+            Makes sure the dirty cells are drawn on the next frame. Any amount of events before it share one update.
+
+            :param predict: Tells if the network should predict the grid on that frame as well.
+            :type predict: bool
+        """
+        assert self._root is not None
+
+        self._predictPending = self._predictPending or predict
 
-    def _redrawGrid(self) -> None:
+        if self._frameJob is None:
+            self._frameJob = self._root.after(self.FRAME_MS, self._drawFrame)
+
+    def _drawFrame(self) -> None:
+        """
+            Recolours the dirty cells and, if asked for, predicts the grid once.
+        """
         assert self._canvas is not None
 
-        self._canvas.delete("all")
-        self._drawGridLines()
+        self._frameJob = None
 
-        for y in range(self.GRID_SIZE):
-            for x in range(self.GRID_SIZE):
-                value = self._grid[y][x]
-                if value > 0.0:
-                    shade = int(255 * (1.0 - value))
-                    color = f"#{shade:02x}{shade:02x}{shade:02x}"
-
-                    self._canvas.create_rectangle(
-                        x * self.CELL_SIZE,
-                        y * self.CELL_SIZE,
-                        (x + 1) * self.CELL_SIZE,
-                        (y + 1) * self.CELL_SIZE,
-                        fill=color,
-                        outline=""
-                    )
+        for (x, y) in self._dirtyCells:
+            self._canvas.itemconfigure(self._cells[y][x], fill=App._getColor(self._grid[y][x]))
+
+        self._dirtyCells.clear()
+
+        if self._predictPending:
+            self._predictPending = False
+            self._predict()
+
+    @staticmethod
+    def _getColor(value: float) -> str:
+        """
+            :return: The colour of a cell, white for 0.0 and black for 1.0.
+            :rtype: str
+        """
+        shade = int(255 * (1.0 - value))
+
+        return f"#{shade:02x}{shade:02x}{shade:02x}"
 
     def _clearGrid(self, event: tk.Event) -> None:
         """
@@ -103,65 +139,90 @@ class App():
         """
         assert self._predictionVar is not None
 
+        self._markChanged(np.zeros((self.GRID_SIZE, self.GRID_SIZE), dtype=np.float64))
+
         for y in range(self.GRID_SIZE):
             for x in range(self.GRID_SIZE):
                 self._grid[y][x] = 0.0
 
+        # A prediction still waiting for the next frame, or running on the worker, would overwrite this.
+        self._predictPending = False
+        if self._worker is not None:
+            self._worker.Cancel()
         self._predictionVar.set("Prediction: ?")
-        self._redrawGrid()
+        self._scheduleFrame()
 
-    def _drawGridLines(self) -> None:
+    def _createCells(self) -> None:
         """
-            Draw the grid lines.
+            Creates a rectangle for every cell, once. After this the cells are only recoloured.
         """
         assert self._canvas is not None
 
         self._canvas.delete("all")
 
-        for y in range(self.GRID_SIZE):
-            for x in range(self.GRID_SIZE):
-                value = self._grid[y][x]
-                if value > 0.0:
-                    shade = int(255 * (1.0 - value))
-                    color = f"#{shade:02x}{shade:02x}{shade:02x}"
-
-                    self._canvas.create_rectangle(
-                        x * self.CELL_SIZE,
-                        y * self.CELL_SIZE,
-                        (x + 1) * self.CELL_SIZE,
-                        (y + 1) * self.CELL_SIZE,
-                        fill=color,
-                        outline=""
-                    )
+        self._cells = [
+            [
+                self._canvas.create_rectangle(
+                    x * self.CELL_SIZE,
+                    y * self.CELL_SIZE,
+                    (x + 1) * self.CELL_SIZE,
+                    (y + 1) * self.CELL_SIZE,
+                    fill=App._getColor(self._grid[y][x]),
+                    outline=""
+                )
+                for x in range(self.GRID_SIZE)
+            ]
+            for y in range(self.GRID_SIZE)
+        ]
+        self._dirtyCells.clear()
 
     def _predict(self) -> None:
         """
-            Predicts the number using the model.
+            Hands a snapshot of the grid to the prediction worker, the result is shown by _showPrediction.
         """
-        assert self._predictionVar is not None
+        assert self._worker is not None
 
-        # Convert grid to a numpy array.
-        inputArray: np.ndarray = np.array(
-            [
-                float(self._grid[y][x])  # invert: black=0.0, white=1.0!
-                for y in range(self.GRID_SIZE)
-                for x in range(self.GRID_SIZE)
-            ],
-            dtype=np.float64
-        )
+        # A copy, so the grid can be drawn on while the worker predicts.
+        inputArray: np.ndarray = np.array(self._grid, dtype=self._network.GetDtype()).reshape(-1)
+
+        self._worker.Submit(inputArray)
+
+    def _postPrediction(self, generation: int, output: np.ndarray | None, error: Exception | None) -> None:
+        """
+            Called on the worker's thread, hands the output over to the Tk thread.
+        """
+        assert self._root is not None
 
         try:
-            output: np.ndarray = self._network.Compute(inputArray)
+            self._root.after(0, self._showPrediction, generation, output, error)
+        except (RuntimeError, tk.TclError):
+            pass # The window has been closed.
+
+    def _showPrediction(self, generation: int, output: np.ndarray | None, error: Exception | None = None) -> None:
+        """
+            Shows the prediction, unless the grid was changed or cleared after it was submitted.
+
+            :param generation: The generation of the prediction, see gui.PredictionWorker.
+            :type generation: int
 
-            # If Compute returns class probabilities
-            if hasattr(output, "__len__"):
-                prediction = int(np.argmax(output))
-            else:
-                prediction = int(output)
+            :param output: The output of the network, None if it raised an error.
+            :type output: numpy.ndarray | None
 
-            self._predictionVar.set(f"Prediction: {prediction}")
-        except Exception:
+            :param error: The error the network or the preprocessor raised, if any. Printed even if the prediction is stale.
+            :type error: Exception | None
+        """
+        assert self._predictionVar is not None and self._worker is not None
+
+        if error is not None:
+            traceback.print_exception(type(error), error, error.__traceback__)
+
+        if not self._worker.IsLatest(generation):
+            return
+
+        if error is not None or output is None:
             self._predictionVar.set("Prediction: error")
+        else:
+            self._predictionVar.set(f"Prediction: {int(np.argmax(output))}")
 
     def Run(self) -> None:
         """
@@ -188,8 +249,8 @@ class App():
         )
         predictionLabel.grid(row=1, column=0, pady=10)
 
-        # Draw grid lines once.
-        self._drawGridLines()
+        # Create the cells once.
+        self._createCells()
 
         # Mouse bindings.
         self._canvas.bind("<Button-1>", self._drawCell)
@@ -197,4 +258,10 @@ class App():
         self._canvas.bind("<Button-3>", self._clearGrid)
         self._canvas.bind("<ButtonRelease-1>", self._smoothGrid)
 
-        self._root.mainloop()
+        # Predictions run in the background, so drawing never waits for the network.
+        self._worker = PredictionWorker(self._network, self._postPrediction, self._preprocessor)
+
+        try:
+            self._root.mainloop()
+        finally:
+            self._worker.Close()
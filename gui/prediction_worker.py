@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from mnist.preprocessor import Preprocessor
+from nn.frozen_network import FrozenNetwork
+from nn.network import Network
+from typing import Callable
+import numpy as np
+import threading
+
+class PredictionWorker():
+    """
+        Runs the network on a background thread for a GUI, so a slow prediction never blocks drawing. Only the
+        latest submitted inputs are kept: submitting while a prediction is running replaces the inputs that are
+        waiting, so the worker skips every stale grid and goes straight to the newest one.
+
+        Every submit gets a generation number that is given to the callback along with the output, or the error the
+        network (or the preprocessor) raised, so a bug isn't hidden behind a missing prediction. The callback
+        is called on the worker's thread, so a GUI should hand the result over to its own thread (ex: with Tk's
+        after) and check IsLatest there, since newer inputs may have been submitted in the meantime.
+    """
+
+    # Callback type: (generation, output, error). Either the output or the error is None.
+    Callback = Callable[[int, np.ndarray | None, Exception | None], None]
+
+    def __init__(self: "PredictionWorker", network: Network | FrozenNetwork, callback: "PredictionWorker.Callback",
+                 preprocessor: Preprocessor | None = None) -> None:
+        """
+            :param network: The network to predict with. Its Compute has to be thread safe.
+            :type network: nn.Network | nn.FrozenNetwork
+
+            :param callback: Called with the generation, the output of the network and None after every prediction,
+            or with the generation, None and the exception if the network or the preprocessor raised one.
+            :type callback: PredictionWorker.Callback
+
+            :param preprocessor: Prepares the inputs on the worker's thread before they are predicted, if given.
+            :type preprocessor: mnist.Preprocessor | None
+        """
+        self._network: Network | FrozenNetwork                   = network
+        self._callback: PredictionWorker.Callback                = callback
+        self._preprocessor: Preprocessor | None                  = preprocessor
+        self._condition: threading.Condition                     = threading.Condition()
+        self._pending: tuple[int, np.ndarray] | None             = None
+        self._generation: int                                    = 0
+        self._closed: bool                                       = False
+
+        self._thread: threading.Thread = threading.Thread(target=self._work, name="PredictionWorker", daemon=True)
+        self._thread.start()
+
+    def Submit(self, inputs: np.ndarray) -> int:
+        """
+            Replaces the inputs waiting to be predicted, if any.
+
+            :param inputs: The inputs of the network. They're used as they are, so pass a copy that won't be changed.
+            :type inputs: numpy.ndarray
+
+            :return: The generation of the prediction.
+            :rtype: int
+
+            :raises RuntimeError: If the worker has been closed.
+        """
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("The prediction worker has been closed!")
+
+            self._generation += 1
+            self._pending     = (self._generation, inputs)
+            self._condition.notify()
+
+            return self._generation
+
+    def Cancel(self) -> None:
+        """
+            Drops the inputs waiting to be predicted and makes the running prediction stale.
+        """
+        with self._condition:
+            self._generation += 1
+            self._pending     = None
+
+    def IsLatest(self, generation: int) -> bool:
+        """
+            :return: True if nothing was submitted or canceled after the given generation.
+            :rtype: bool
+        """
+        with self._condition:
+            return generation == self._generation
+
+    def Close(self) -> None:
+        """
+            Stops the background thread. The inputs waiting to be predicted are dropped.
+        """
+        with self._condition:
+            if self._closed:
+                return
+
+            self._closed  = True
+            self._pending = None
+            self._condition.notify()
+
+        self._thread.join()
+
+    def _work(self) -> None:
+        """
+            The loop of the background thread: waits for inputs and predicts the latest ones.
+        """
+        while True:
+            with self._condition:
+                while self._pending is None and not self._closed:
+                    self._condition.wait()
+
+                if self._closed:
+                    return
+
+                (generation, inputs) = self._pending
+                self._pending        = None
+
+            output: np.ndarray | None = None
+            error: Exception | None   = None
+
+            try:
+                if self._preprocessor is not None:
+                    inputs = self._preprocessor.Process(inputs)
+
+                output = self._network.Compute(inputs)
+            except Exception as exception:
+                error = exception # Handed to the callback, a GUI shouldn't lose its worker over one bad prediction.
+
+            # Inputs submitted in the meantime make this output stale, nobody is waiting for it.
+            if self.IsLatest(generation):
+                self._callback(generation, output, error)
@@ -0,0 +1,192 @@
+import contextlib
+import io
+import time
+import tkinter as tk
+import unittest
+
+from gui.app import App
+from gui.prediction_worker import PredictionWorker
+from nn.costs.cross_entropy import CrossEntropy
+from nn.layers.dense import Dense
+from nn.layers.relu import Relu
+from nn.layers.softmax import Softmax
+from nn.networks.sequential import Sequential
+from types import SimpleNamespace
+from typing import Callable
+import numpy as np
+
+class _FakeRoot():
+    """
+        Keeps the scheduled callbacks instead of running a Tk event loop, so the tests don't need a display.
+    """
+
+    def __init__(self) -> None:
+        self.jobs: list[Callable[[], None]] = []
+
+    def after(self, ms: int, callback: Callable[..., None], *args: object) -> str:
+        self.jobs.append(lambda: callback(*args))
+        return f"after#{len(self.jobs)}"
+
+    def RunJobs(self) -> None:
+        (jobs, self.jobs) = (self.jobs, [])
+        for job in jobs:
+            job()
+
+class _FakeCanvas():
+    def __init__(self) -> None:
+        self.created: int            = 0
+        self.configured: list[tuple]     = []
+
+    def delete(self, *items: object) -> None:
+        pass
+
+    def create_rectangle(self, *coordinates: int, **options: object) -> int:
+        self.created += 1
+        return self.created
+
+    def itemconfigure(self, item: int, **options: object) -> None:
+        self.configured.append((item, options["fill"]))
+
+class _FakeVar():
+    def __init__(self) -> None:
+        self.value: str = ""
+
+    def set(self, value: str) -> None:
+        self.value = value
+
+def _createApp(test: unittest.TestCase) -> tuple[App, _FakeRoot, _FakeCanvas]:
+    app: App = App(Sequential([Dense(28 * 28, 16), Relu(16), Dense(16, 10), Softmax(10)], CrossEntropy(10), 0.1))
+
+    root: _FakeRoot     = _FakeRoot()
+    canvas: _FakeCanvas = _FakeCanvas()
+
+    app._root          = root
+    app._canvas        = canvas
+    app._predictionVar = _FakeVar()
+    app._worker        = PredictionWorker(app._network, app._postPrediction)
+    app._createCells()
+
+    test.addCleanup(app._worker.Close)
+
+    return (app, root, canvas)
+
+def _event(x: int, y: int) -> SimpleNamespace:
+    return SimpleNamespace(x=x * App.CELL_SIZE + 1, y=y * App.CELL_SIZE + 1)
+
+class TestApp(unittest.TestCase):
+    def test_cells_are_created_once(self) -> None:
+        # Arrange:
+        (app, root, canvas) = _createApp(self)
+
+        # Act:
+        for x in range(10):
+            app._drawCell(_event(x, 5))
+        root.RunJobs()
+        app._clearGrid(_event(0, 0))
+        root.RunJobs()
+
+        # Assert:
+        self.assertEqual(canvas.created, App.GRID_SIZE * App.GRID_SIZE)
+
+    def test_only_dirty_cells_are_recoloured(self) -> None:
+        # Arrange:
+        (app, root, canvas) = _createApp(self)
+
+        # Act:
+        app._drawCell(_event(3, 4))
+        app._drawCell(_event(3, 4)) # The same cell again.
+        app._drawCell(_event(4, 4))
+        root.RunJobs()
+
+        # Assert:
+        self.assertEqual(sorted(canvas.configured), sorted([(app._cells[4][3], "#000000"), (app._cells[4][4], "#000000")]))
+
+    def test_events_are_coalesced_into_one_frame(self) -> None:
+        # Arrange:
+        (app, root, canvas) = _createApp(self)
+
+        predictions: list[int] = []
+        app._predict = lambda: predictions.append(1)
+
+        # Act:
+        for x in range(20):
+            app._drawCell(_event(x, 10))
+        scheduled: int = len(root.jobs)
+        root.RunJobs()
+
+        # Assert:
+        self.assertEqual(scheduled, 1)
+        self.assertEqual(len(predictions), 1)
+        self.assertEqual(len(canvas.configured), 20)
+        self.assertEqual(app._predictionVar.value, "")
+
+    def test_clear_recolours_drawn_cells_and_skips_prediction(self) -> None:
+        # Arrange:
+        (app, root, canvas) = _createApp(self)
+        app._drawCell(_event(1, 1))
+        app._drawCell(_event(2, 2))
+
+        # Act:
+        app._clearGrid(_event(0, 0))
+        root.RunJobs()
+
+        # Assert:
+        self.assertEqual(sorted(canvas.configured), sorted([(app._cells[1][1], "#ffffff"), (app._cells[2][2], "#ffffff")]))
+        self.assertEqual(app._predictionVar.value, "Prediction: ?")
+
+    def test_prediction_is_posted_back_and_shown(self) -> None:
+        # Arrange:
+        (app, root, _) = _createApp(self)
+        expected: int  = int(np.argmax(app._network.Compute(np.zeros(App.GRID_SIZE * App.GRID_SIZE))))
+
+        # Act:
+        app._predict()
+        deadline: float = time.perf_counter() + 10
+        while len(root.jobs) <= 0 and time.perf_counter() < deadline:
+            time.sleep(0.001) # The worker posts the result with after.
+        root.RunJobs()
+
+        # Assert:
+        self.assertEqual(app._predictionVar.value, f"Prediction: {expected}")
+
+    def test_stale_prediction_is_not_shown(self) -> None:
+        # Arrange:
+        (app, _, _)     = _createApp(self)
+        generation: int = app._worker.Submit(np.zeros(App.GRID_SIZE * App.GRID_SIZE))
+
+        # Act:
+        app._clearGrid(_event(0, 0))
+        app._showPrediction(generation, np.eye(10)[3])
+
+        # Assert:
+        self.assertEqual(app._predictionVar.value, "Prediction: ?")
+
+    def test_prediction_error_is_shown_and_printed(self) -> None:
+        # Arrange:
+        (app, _, _)     = _createApp(self)
+        generation: int = app._worker.Submit(np.zeros(App.GRID_SIZE * App.GRID_SIZE))
+        app._worker.Close()
+        stderr: io.StringIO = io.StringIO()
+
+        # Act:
+        with contextlib.redirect_stderr(stderr):
+            app._showPrediction(generation, None, ValueError("Broken network!"))
+
+        # Assert:
+        self.assertEqual(app._predictionVar.value, "Prediction: error")
+        self.assertIn("ValueError: Broken network!", stderr.getvalue())
+
+    def test_prediction_after_the_window_closed(self) -> None:
+        # Arrange:
+        (app, root, _) = _createApp(self)
+
+        def closed(*args: object) -> None:
+            raise tk.TclError('can\'t invoke "after" command: application has been destroyed')
+
+        root.after = closed
+
+        # Act & Assert:
+        app._postPrediction(1, np.eye(10)[3], None) # Doesn't raise.
+
+if __name__ == "__main__":
+    unittest.main()
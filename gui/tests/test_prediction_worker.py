@@ -0,0 +1,102 @@
+import threading
+import unittest
+
+from gui.prediction_worker import PredictionWorker
+import numpy as np
+
+class _SlowNetwork():
+    """
+        Blocks every Compute until it's released, so the tests control when a prediction finishes.
+    """
+
+    def __init__(self) -> None:
+        self.started: threading.Semaphore = threading.Semaphore(0)
+        self.release: threading.Semaphore = threading.Semaphore(0)
+        self.computed: list[float]        = []
+
+    def Compute(self, inputs: np.ndarray) -> np.ndarray:
+        self.started.release()
+        self.release.acquire()
+
+        if np.isnan(inputs[0]):
+            raise RuntimeError("Bad inputs!")
+
+        self.computed.append(float(inputs[0]))
+        return inputs * 2
+
+class TestPredictionWorker(unittest.TestCase):
+    def setUp(self) -> None:
+        self.network: _SlowNetwork = _SlowNetwork()
+        self.results: list[tuple]  = []
+        self.done: threading.Event = threading.Event()
+
+        def callback(generation: int, output: np.ndarray | None, error: Exception | None) -> None:
+            self.results.append((generation, output, error))
+            self.done.set()
+
+        self.worker: PredictionWorker = PredictionWorker(self.network, callback)
+
+    def tearDown(self) -> None:
+        self.network.release.release() # In case a prediction is still blocked.
+        self.worker.Close()
+
+    def test_only_the_latest_inputs_are_predicted(self) -> None:
+        # Arrange:
+        self.worker.Submit(np.array([1.0]))
+        self.assertTrue(self.network.started.acquire(timeout=10))
+
+        # Act:
+        for value in (2.0, 3.0, 4.0): # Submitted while the first one is running.
+            latest: int = self.worker.Submit(np.array([value]))
+
+        self.network.release.release()
+        self.assertTrue(self.network.started.acquire(timeout=10))
+        self.network.release.release()
+        self.assertTrue(self.done.wait(timeout=10))
+
+        # Assert:
+        self.assertEqual(self.network.computed, [1.0, 4.0])
+        self.assertEqual(len(self.results), 1) # The first output was stale by the time it was ready.
+        self.assertEqual(self.results[0][0], latest)
+        np.testing.assert_array_equal(self.results[0][1], [8.0])
+
+    def test_cancel_makes_the_running_prediction_stale(self) -> None:
+        # Arrange:
+        generation: int = self.worker.Submit(np.array([1.0]))
+        self.assertTrue(self.network.started.acquire(timeout=10))
+
+        # Act:
+        self.worker.Cancel()
+        self.network.release.release()
+        self.worker.Close()
+
+        # Assert:
+        self.assertFalse(self.worker.IsLatest(generation))
+        self.assertEqual(self.results, [])
+
+    def test_errors_are_passed_to_the_callback(self) -> None:
+        # Arrange:
+        self.network.release.release()
+
+        # Act:
+        generation: int = self.worker.Submit(np.array([np.nan]))
+        self.assertTrue(self.done.wait(timeout=10))
+
+        # Assert:
+        self.assertEqual(len(self.results), 1)
+        (resultGeneration, output, error) = self.results[0]
+        self.assertEqual(resultGeneration, generation)
+        self.assertIsNone(output)
+        self.assertIsInstance(error, RuntimeError)
+        self.assertEqual(str(error), "Bad inputs!")
+
+    def test_submit_after_close_raises(self) -> None:
+        # Arrange:
+        self.worker.Close()
+
+        # Act & Assert:
+        with self.assertRaises(RuntimeError):
+            self.worker.Submit(np.array([1.0]))
+
+if __name__ == "__main__":
+    unittest.main()
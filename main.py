@@ -1,124 +1,370 @@
-from enum import Enum
+from __future__ import annotations
+
 from pathlib import Path
-from gui.app import App
-from mnist.mnist_dataloader import MnistDataloader
-from nn.cost import Cost
-from nn.costs.mse import Mse
-from nn.layer import Layer
-from nn.layers.dense import Dense
-from nn.layers.relu import Relu
-from nn.layers.softmax import Softmax
-from nn.memory import Memory
-from nn.network import Network
-from nn.networks.sequential import Sequential
-from gui.mnist_gui import MnistGui
-
-class Mode(Enum):
-    TRAIN = 0
-    GUI   = 1
-    TRAIN_THEN_GUI = 2
-    MNIST_GUI = 3
+import argparse
+import sys
+
+# Only the standard library is imported here. Every command imports what it needs itself, so that
+# ex: predicting doesn't pay for tkinter and drawing doesn't pay for opening the training data.
 
 mainFilePath: Path = Path(__file__).resolve().parent
-memory: Memory     = Memory()
 
 # The sizes of the networks input / output.
 INPUT_SIZE: int  = 28 * 28
 OUTPUT_SIZE: int = 10
 
-# General settings:
-mode: Mode = Mode.GUI
-
-# Training settings:
-layers: list[Layer]                 = [
-    Dense(INPUT_SIZE, 16),
-    Relu(16),
-    Dense(16, OUTPUT_SIZE),
-    Relu(OUTPUT_SIZE),
-    Softmax(OUTPUT_SIZE)
-]
-costFunction: Cost                    = Mse(OUTPUT_SIZE)
-learningRate: float                   = 0.01
-trainingNetwork: Network              = Sequential(layers, costFunction, learningRate)
-trainingDataSetPath: Path             = mainFilePath / "mnist" / "data" / "mnist_train.csv"
-batchSize: int                        = 10
-trainingDataloader: MnistDataloader   = MnistDataloader(trainingDataSetPath, batchSize)
-epochsToTrain: int                    = 10
-trainingNetworkSaveName: str          = "first_run.pkl"
-trainingNetworkSavePath: Path         = mainFilePath / trainingNetworkSaveName
-evaluationDataSetPath: Path           = mainFilePath / "mnist" / "data" / "mnist_test.csv"
-evaluationDataloader: MnistDataloader = MnistDataloader(evaluationDataSetPath, batchSize)
-
-def Train() -> Network:
-    """
-        Function for handling training.
-    """
-    for epoch in range(epochsToTrain):
-        epochCost: float = trainingNetwork.TrainOneEpoch(trainingDataloader)
-        epochCost = epochCost / learningRate # Since learning rate has already influenced the cost.
+# Default settings:
+DEFAULT_MODEL_PATH: Path    = mainFilePath / "95percent.model"
+TRAINING_DATA_PATH: Path    = mainFilePath / "mnist" / "data" / "mnist_train.csv"
+EVALUATION_DATA_PATH: Path  = mainFilePath / "mnist" / "data" / "mnist_test.csv"
+TRAINING_SAVE_PATH: Path    = mainFilePath / "first_run.model"
+EVALUATION_CHUNK_SIZE: int  = 1000
+OPTIMIZERS: tuple[str, ...] = ("adam", "sgd", "momentum", "nesterov")
+
+def Train(arguments: argparse.Namespace):
+    """
+        Trains a new network, evaluates it and saves it.
+
+        :return: The trained network.
+        :rtype: nn.Network
+    """
+    from mnist.mnist_dataloader import MnistDataloader
+    from nn.costs.cross_entropy import CrossEntropy
+    from nn.evaluation_report import EvaluationReport
+    from nn.layers.dense import Dense
+    from nn.layers.relu import Relu
+    from nn.layers.softmax import Softmax
+    from nn.memory import Memory
+    from nn.network import Network
+    from nn.networks.sequential import Sequential
+    import numpy as np
+
+    layers: list = [
+        Dense(INPUT_SIZE, arguments.hidden),
+        Relu(arguments.hidden),
+        Dense(arguments.hidden, OUTPUT_SIZE),
+        Relu(OUTPUT_SIZE),
+        Softmax(OUTPUT_SIZE)
+    ]
+    computeDtype: np.dtype              = np.dtype(arguments.dtype)
+    network: Network                    = Sequential(layers, CrossEntropy(OUTPUT_SIZE), _createOptimizer(arguments.optimizer, arguments.learning_rate), dtype=computeDtype)
+    shuffle                             = _createShuffle(arguments.shuffle, arguments.shuffle_seed)
+    trainingDataloader: MnistDataloader = MnistDataloader(arguments.train_data, arguments.batch_size, shuffle=shuffle, useCache=arguments.cache, dtype=computeDtype)
+
+    for epoch in range(arguments.epochs):
+        epochCost: float = network.TrainOneEpoch(trainingDataloader)
         print(f"Epoch {epoch + 1} cost: {epochCost}")
         trainingDataloader.Reset()
 
-    accuracy: float = trainingNetwork.Evaluate(evaluationDataloader)
+    evaluationDataloader: MnistDataloader = MnistDataloader(arguments.test_data, arguments.batch_size, useCache=arguments.cache, dtype=computeDtype)
+    report: EvaluationReport              = network.EvaluateReport(evaluationDataloader, EVALUATION_CHUNK_SIZE)
 
-    print(f"Accuracy of trained model: {accuracy}.")
+    print(f"Accuracy of trained model: {report.GetAccuracy()} ({report.GetThroughput():.0f} images/s).")
 
-    # Ask the user if you should save or not.
-    answer: str = input("Save trained network? [y/n]: ").strip().lower()
+    if arguments.save is not None:
+        savePath: Path | None = arguments.save
+    else:
+        # Ask the user if you should save or not.
+        answer: str           = input(f"Save trained network to {TRAINING_SAVE_PATH}? [y/n]: ").strip().lower()
+        savePath: Path | None = TRAINING_SAVE_PATH if answer in ("y", "yes") else None
 
-    if answer in ("y", "yes"):
-        memory.SaveNetwork(trainingNetwork, trainingNetworkSavePath)
-        print("Network saved!")
+    if savePath is not None:
+        Memory().SaveNetwork(network, savePath)
+        print(f"Network saved to {savePath}!")
     else:
         print("Network not saved!")
 
-    return trainingNetwork
+    if arguments.then_gui:
+        _runApp(network)
 
-# GUI settings:
-guiNetworkLoadPath: Path = mainFilePath / "95percent.pkl"
+    return network
 
-def Gui(network: Network | None = None):
+def Evaluate(arguments: argparse.Namespace) -> None:
     """
-        Runs the application and the GUI.
+        Evaluates a saved network on a dataset.
     """
-    if network is None:
-        guiNetwork: Network      = memory.LoadNetwork(guiNetworkLoadPath)
-        app: App                 = App(guiNetwork)
-    else:
-        guiNetwork: Network = network
-        app: App            = App(guiNetwork)
+    from mnist.mnist_dataloader import MnistDataloader
+    from nn.evaluation_report import EvaluationReport
+    from nn.network import Network
 
-    app.Run()
+    network: Network            = _loadNetwork(arguments.model)
+    dataloader: MnistDataloader = MnistDataloader(arguments.data, useCache=arguments.cache, dtype=network.GetDtype())
+    report: EvaluationReport    = network.EvaluateReport(dataloader, arguments.chunk_size)
 
-def MnistGuiApp(network: Network | None = None):
+    print(f"Accuracy: {report.GetAccuracy()} ({report.correct}/{report.total}, {report.GetThroughput():.0f} images/s).")
+
+def Gui(arguments: argparse.Namespace) -> None:
+    """
+        Runs the application where you draw digits yourself.
+    """
+    _runApp(_loadNetwork(arguments.model), not arguments.raw)
+
+def MnistGuiApp(arguments: argparse.Namespace) -> None:
+    """
+        Runs the application that shows the model's predictions on the images of a dataset.
     """
-        Runs the application and the GUI.
+    from gui.mnist_gui import MnistGui
+    from mnist.mnist_dataloader import MnistDataloader
+    from nn.network import Network
+
+    network: Network            = _loadNetwork(arguments.model)
+    dataloader: MnistDataloader = MnistDataloader(arguments.data, 1, useCache=arguments.cache, dtype=network.GetDtype())
+
+    MnistGui(network, dataloader).Run()
+
+def Predict(arguments: argparse.Namespace) -> None:
     """
-    dataloader: MnistDataloader = trainingDataloader
+        Prints the predicted digit of every image in a csv file (or stdin). Every line holds the 28 * 28 pixels
+        (0 to 255), optionally after the label like in the mnist csv files.
+    """
+    from nn.frozen_network import FrozenNetwork
+    import numpy as np
 
-    if network is None:
-        guiNetwork: Network = memory.LoadNetwork(guiNetworkLoadPath)
-        app: MnistGui       = MnistGui(guiNetwork, dataloader)
+    if str(arguments.images) == "-":
+        text: str = sys.stdin.read()
     else:
-        guiNetwork: Network = network
-        app: MnistGui       = MnistGui(guiNetwork, dataloader)
+        with open(arguments.images, "r") as f:
+            text: str = f.read()
+
+    lines: list[str]       = [line for line in text.splitlines() if line.strip() != ""]
+    values: np.ndarray     = np.array([[float(value) for value in line.split(",")] for line in lines]).reshape(len(lines), -1)
+    network: FrozenNetwork = _loadNetwork(arguments.model).Freeze()
 
-    app.Run()
+    if values.shape[1] == 1 + INPUT_SIZE:
+        values = values[:, 1:] # The label isn't needed to predict.
+    elif values.shape[1] != INPUT_SIZE:
+        raise SystemExit(f"Every line needs {INPUT_SIZE} pixel values, optionally after a label, got {values.shape[1]}!")
 
-def Main():
+    values = np.clip(values, 0, 255) / 255
+
+    if arguments.preprocess:
+        from mnist.preprocessor import Preprocessor
+
+        values = Preprocessor().Process(values) # The whole batch at once.
+
+    outputs: np.ndarray = network.Compute(values)
+
+    for probabilities in outputs:
+        prediction: int = int(np.argmax(probabilities))
+        print(f"{prediction} ({probabilities[prediction]:.3f})")
+
+def Quantize(arguments: argparse.Namespace) -> None:
+    """
+        Quantizes the dense layers of a saved network to int8, prints how much accuracy that costs and saves it.
+    """
+    from mnist.mnist_dataloader import MnistDataloader
+    from nn.memory import Memory
+    from nn.network import Network
+    from nn.quantizer import QuantizationReport, Quantizer
+
+    network: Network     = _loadNetwork(arguments.model)
+    quantizer: Quantizer = Quantizer(arguments.calibration_size, arguments.accumulate)
+    quantized: Network   = quantizer.Quantize(network, MnistDataloader(arguments.calibration_data, useCache=arguments.cache, dtype=network.GetDtype()))
+
+    evaluationDataloader: MnistDataloader = MnistDataloader(arguments.test_data, useCache=arguments.cache, dtype=network.GetDtype())
+    report: QuantizationReport            = Quantizer.Compare(network, quantized, evaluationDataloader, EVALUATION_CHUNK_SIZE)
+
+    print(report.GetSummary())
+
+    if arguments.output is not None:
+        Memory().SaveNetwork(quantized, arguments.output)
+        print(f"Quantized network saved to {arguments.output}!")
+
+def Prune(arguments: argparse.Namespace) -> None:
+    """
+        Removes the hidden units of a saved network that are dead or contribute little, optionally fine tunes it, and saves it.
+    """
+    from mnist.mnist_dataloader import MnistDataloader
+    from nn.memory import Memory
+    from nn.network import Network
+    from nn.pruner import Pruner
+
+    network: Network = Memory().LoadNetwork(arguments.model) # Not memory-mapped, since fine tuning writes the weights.
+    pruner: Pruner   = Pruner(arguments.activation_threshold, arguments.magnitude_ratio)
+    pruned: Network  = pruner.Prune(network, MnistDataloader(arguments.train_data, useCache=arguments.cache, dtype=network.GetDtype()))
+
+    print(f"Layer sizes: {[layer.GetOutputSize() for layer in network._layers]} -> {[layer.GetOutputSize() for layer in pruned._layers]}")
+
+    if arguments.fine_tune_epochs > 0:
+        trainingDataloader: MnistDataloader = MnistDataloader(arguments.train_data, arguments.batch_size, shuffle=True, useCache=arguments.cache, dtype=network.GetDtype())
+
+        for (epoch, cost) in enumerate(Pruner.FineTune(pruned, trainingDataloader, arguments.fine_tune_epochs)):
+            print(f"Fine tuning epoch {epoch + 1} cost: {cost}")
+
+    for (name, evaluated) in (("Original", network), ("Pruned", pruned)):
+        dataloader: MnistDataloader = MnistDataloader(arguments.test_data, useCache=arguments.cache, dtype=network.GetDtype())
+        print(f"{name} accuracy: {evaluated.Evaluate(dataloader, EVALUATION_CHUNK_SIZE)}")
+
+    if arguments.output is not None:
+        Memory().SaveNetwork(pruned, arguments.output)
+        print(f"Pruned network saved to {arguments.output}!")
+
+def Serve(arguments: argparse.Namespace) -> None:
+    """
+        Serves a saved network over HTTP, batching the requests together.
+    """
+    from server.inference_server import InferenceServer
+
+    from mnist.preprocessor import Preprocessor
+
+    server: InferenceServer = InferenceServer(_loadNetwork(arguments.model), arguments.host, arguments.port, arguments.unix_socket,
+                                              arguments.max_batch_size, arguments.max_wait_ms / 1000,
+                                              Preprocessor() if arguments.preprocess else None)
+
+    print(f"Serving {arguments.model} on {server.GetAddress()}, press Ctrl+C to stop.")
+
+    try:
+        server.ServeForever()
+    except KeyboardInterrupt:
+        pass
+
+def _createOptimizer(name: str, learningRate: float | None):
+    """
+        :return: The optimizer with the given name, with its default learning rate if None is given.
+        :rtype: nn.Optimizer
+    """
+    from nn.optimizers.adam import Adam
+    from nn.optimizers.nesterov import Nesterov
+    from nn.optimizers.sgd import Sgd
+
+    if name == "adam":
+        return Adam(learningRate if learningRate is not None else 0.001)
+    if name == "sgd":
+        return Sgd(learningRate if learningRate is not None else 0.1)
+    if name == "momentum":
+        return Sgd(learningRate if learningRate is not None else 0.01, momentum=0.9)
+
+    return Nesterov(learningRate if learningRate is not None else 0.01)
+
+def _createShuffle(name: str | None, seed: int | None):
+    """
+        :return: The shuffle with the given name (see mnist.Shuffle), False if None is given.
+        :rtype: mnist.Shuffle | bool
+    """
+    if name is None:
+        return False
+
+    from mnist.shuffles.block_shuffle import BlockShuffle
+    from mnist.shuffles.buffer_shuffle import BufferShuffle
+    from mnist.shuffles.permuted_index_shuffle import PermutedIndexShuffle
+
+    if name in ("auto", "index"):
+        return PermutedIndexShuffle(seed)
+    if name == "block":
+        return BlockShuffle(seed=seed)
+
+    return BufferShuffle(seed=seed)
+
+def _loadNetwork(path: Path):
+    """
+        Loads a network for inference. Model files are memory-mapped, so this is almost free.
+
+        :rtype: nn.Network
+    """
+    from nn.memory import Memory
+
+    return Memory().LoadNetwork(path, memoryMap=True)
+
+def _runApp(network, preprocess: bool = True) -> None:
+    from gui.app import App
+
+    App(network, preprocess).Run()
+
+def CreateParser() -> argparse.ArgumentParser:
+    """
+        :return: The parser of the command line arguments.
+        :rtype: argparse.ArgumentParser
+    """
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description="Train and try out digit classifying networks. Runs the gui if no command is given.")
+    commands = parser.add_subparsers(dest="command")
+
+    train: argparse.ArgumentParser = commands.add_parser("train", help="Train a new network.")
+    train.add_argument("--epochs", type=int, default=10)
+    train.add_argument("--batch-size", type=int, default=10)
+    train.add_argument("--hidden", type=int, default=16, help="The width of the hidden layer.")
+    train.add_argument("--optimizer", choices=OPTIMIZERS, default="adam")
+    train.add_argument("--learning-rate", type=float, default=None, help="Defaults to the usual rate of the optimizer.")
+    train.add_argument("--dtype", choices=("float32", "float64"), default="float32")
+    train.add_argument("--shuffle", nargs="?", const="auto", default=None, choices=("auto", "index", "block", "buffer"),
+                       help="Shuffle every epoch. auto is index, a full shuffle. block reads whole blocks, buffer reads the csv file in order.")
+    train.add_argument("--shuffle-seed", type=int, default=None, help="Makes the shuffled order of every epoch the same between runs.")
+    train.add_argument("--cache", action="store_true", help="Read the csv files through their binary cache.")
+    train.add_argument("--train-data", type=Path, default=TRAINING_DATA_PATH)
+    train.add_argument("--test-data", type=Path, default=EVALUATION_DATA_PATH)
+    train.add_argument("--save", type=Path, default=None, help="Save the network here without asking.")
+    train.add_argument("--then-gui", action="store_true", help="Open the drawing gui with the trained network.")
+    train.set_defaults(function=Train)
+
+    evaluate: argparse.ArgumentParser = commands.add_parser("eval", help="Evaluate a saved network.")
+    evaluate.add_argument("--model", type=Path, default=DEFAULT_MODEL_PATH)
+    evaluate.add_argument("--data", type=Path, default=EVALUATION_DATA_PATH)
+    evaluate.add_argument("--chunk-size", type=int, default=EVALUATION_CHUNK_SIZE)
+    evaluate.add_argument("--cache", action="store_true", help="Read the csv file through its binary cache.")
+    evaluate.set_defaults(function=Evaluate)
+
+    gui: argparse.ArgumentParser = commands.add_parser("gui", help="Draw digits and see what a saved network predicts.")
+    gui.add_argument("--model", type=Path, default=DEFAULT_MODEL_PATH)
+    gui.add_argument("--raw", action="store_true", help="Predict the drawing as it is, without scaling and centering it like the mnist digits.")
+    gui.set_defaults(function=Gui)
+
+    mnistGui: argparse.ArgumentParser = commands.add_parser("mnist-gui", help="Step through a dataset and see what a saved network predicts.")
+    mnistGui.add_argument("--model", type=Path, default=DEFAULT_MODEL_PATH)
+    mnistGui.add_argument("--data", type=Path, default=TRAINING_DATA_PATH)
+    mnistGui.add_argument("--cache", action="store_true", help="Read the csv file through its binary cache.")
+    mnistGui.set_defaults(function=MnistGuiApp)
+
+    predict: argparse.ArgumentParser = commands.add_parser("predict", help="Print the predicted digits of images in a csv file.")
+    predict.add_argument("images", type=Path, help="The csv file, or - for stdin.")
+    predict.add_argument("--model", type=Path, default=DEFAULT_MODEL_PATH)
+    predict.add_argument("--preprocess", action="store_true", help="Scale and center the digits like the mnist ones first, for digits that weren't.")
+    predict.set_defaults(function=Predict)
+
+    quantize: argparse.ArgumentParser = commands.add_parser("quantize", help="Quantize a saved network to int8 and report the accuracy drop.")
+    quantize.add_argument("--model", type=Path, default=DEFAULT_MODEL_PATH)
+    quantize.add_argument("--output", type=Path, default=None, help="Save the quantized network here.")
+    quantize.add_argument("--calibration-data", type=Path, default=TRAINING_DATA_PATH)
+    quantize.add_argument("--calibration-size", type=int, default=1000, help="The amount of images the input scales are calibrated on.")
+    quantize.add_argument("--test-data", type=Path, default=EVALUATION_DATA_PATH)
+    quantize.add_argument("--accumulate", choices=("float", "float-cached", "int32"), default="float",
+                          help="How the integer products are summed up. float only keeps the int8 weights, float-cached keeps a float copy (faster for small layers, but no less memory traffic than float32).")
+    quantize.add_argument("--cache", action="store_true", help="Read the csv files through their binary cache.")
+    quantize.set_defaults(function=Quantize)
+
+    prune: argparse.ArgumentParser = commands.add_parser("prune", help="Remove dead or weak hidden units of a saved network.")
+    prune.add_argument("--model", type=Path, default=DEFAULT_MODEL_PATH)
+    prune.add_argument("--output", type=Path, default=None, help="Save the pruned network here.")
+    prune.add_argument("--activation-threshold", type=float, default=0.0, help="Remove units active for this fraction of the images or less.")
+    prune.add_argument("--magnitude-ratio", type=float, default=0.0, help="Remove units contributing less than this fraction of the layer's strongest unit.")
+    prune.add_argument("--fine-tune-epochs", type=int, default=0)
+    prune.add_argument("--batch-size", type=int, default=10, help="The batch size when fine tuning.")
+    prune.add_argument("--train-data", type=Path, default=TRAINING_DATA_PATH, help="The units are measured and fine tuned on this data.")
+    prune.add_argument("--test-data", type=Path, default=EVALUATION_DATA_PATH)
+    prune.add_argument("--cache", action="store_true", help="Read the csv files through their binary cache.")
+    prune.set_defaults(function=Prune)
+
+    serve: argparse.ArgumentParser = commands.add_parser("serve", help="Serve a saved network over HTTP, with batching.")
+    serve.add_argument("--model", type=Path, default=DEFAULT_MODEL_PATH)
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8000)
+    serve.add_argument("--unix-socket", type=Path, default=None, help="Listen on this Unix socket instead of a TCP port.")
+    serve.add_argument("--max-batch-size", type=int, default=32)
+    serve.add_argument("--max-wait-ms", type=float, default=2.0, help="The longest a request waits for others to join its batch.")
+    serve.add_argument("--preprocess", action="store_true", help="Scale and center the digits like the mnist ones first, for digits that weren't.")
+    serve.set_defaults(function=Serve)
+
+    return parser
+
+def Main(argv: list[str] | None = None) -> None:
     """
         The Main entrypoint of the python program.
     """
-    if mode == Mode.TRAIN:
-        Train()
-    elif mode == Mode.GUI:
-        Gui()
-    elif mode == Mode.TRAIN_THEN_GUI:
-        network: Network = Train()
-        Gui(network)
-    elif mode == Mode.MNIST_GUI:
-        MnistGuiApp()
+    parser: argparse.ArgumentParser = CreateParser()
+    arguments: argparse.Namespace   = parser.parse_args(argv)
+
+    if arguments.command is None:
+        arguments = parser.parse_args(["gui"]) # The default, like it always was.
 
-    return
+    arguments.function(arguments)
 
-Main()
\ No newline at end of file
+if __name__ == "__main__":
+    Main()
@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import BinaryIO
+import numpy as np
+import os
+import struct
+
+class CsvIndex():
+    """
+        The byte offset of every line of a csv file, so that any row (or range of rows) can be read with one seek
+        instead of reading the file from the start. The index is built by Build in one pass over the bytes of the
+        file, without parsing any values, and stored next to the csv file, so it's only built again when the csv
+        file changes. Loading it memory-maps the offsets.
+
+        Empty lines aren't rows. Lines that aren't images (the wrong amount of values) still are, the dataloader
+        skips them when decoding like it does when reading in order.
+
+        File layout (little endian):
+            [0:8]   magic bytes b"MNISTIDX".
+            [8:12]  uint32 format version.
+            [12:16] zero padding.
+            [16:24] uint64 amount of rows.
+            [24:32] uint64 size of the csv file in bytes.
+            [32:40] uint64 modification time of the csv file, in nanoseconds.
+            [40:64] zero padding.
+            [64:]   uint64 offsets, where every row starts and then the size of the csv file.
+    """
+
+    MAGIC: bytes        = b"MNISTIDX"
+    VERSION: int        = 1
+    HEADER_SIZE: int    = 64
+    INDEX_SUFFIX: str   = ".index"
+    _HEADER_FORMAT: str = "<8sI4xQQQ"
+    _CHUNK_SIZE: int    = 1 << 24 # Bytes scanned at once when building.
+
+    def __init__(self: "CsvIndex", pathToIndex: str) -> None:
+        """
+            Opens (memory-maps) an existing index file.
+
+            :param pathToIndex: The path to the index file.
+            :type pathToIndex: str
+
+            :raises FileNotFoundError: If the index file does not exist.
+            :raises TypeError: If the file is not an index file of a supported version.
+        """
+        absPath: Path = Path(pathToIndex).resolve()
+
+        if not absPath.exists():
+            raise FileNotFoundError(f"The index file does not exist: {absPath}")
+
+        (count, _, _) = CsvIndex._readHeader(absPath)
+
+        self._path: Path          = absPath
+        self._offsets: np.ndarray = np.memmap(absPath, dtype="<u8", mode="r", offset=CsvIndex.HEADER_SIZE, shape=(count + 1,))
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def GetOffsets(self) -> np.ndarray:
+        """
+            :return: The read-only offsets: where every row starts, and then the size of the csv file. Shape (rows + 1,).
+            :rtype: numpy.ndarray
+        """
+        return self._offsets
+
+    def ReadRange(self, csvFile: BinaryIO, start: int, stop: int) -> list[list[str]]:
+        """
+            Reads the rows from start up to stop with one seek and one read.
+
+            :param csvFile: The csv file, opened in binary mode.
+            :type csvFile: BinaryIO
+
+            :param start: The first row.
+            :type start: int
+
+            :param stop: The row after the last one.
+            :type stop: int
+
+            :return: The values of every row as strings, like csv.reader gives them.
+            :rtype: list[list[str]]
+        """
+        start = max(0, start)
+        stop  = min(stop, len(self))
+
+        if stop <= start:
+            return []
+
+        csvFile.seek(int(self._offsets[start]))
+        text: str = csvFile.read(int(self._offsets[stop] - self._offsets[start])).decode()
+
+        return [line.split(",") for line in text.splitlines() if line != ""]
+
+    def ReadRows(self, csvFile: BinaryIO, rows: np.ndarray) -> list[list[str]]:
+        """
+            Reads the given rows, one seek each, in the given order.
+
+            :param csvFile: The csv file, opened in binary mode.
+            :type csvFile: BinaryIO
+
+            :param rows: The rows to read.
+            :type rows: numpy.ndarray
+
+            :return: The values of every row as strings, like csv.reader gives them.
+            :rtype: list[list[str]]
+        """
+        lines: list[list[str]] = []
+
+        for row in np.asarray(rows, dtype=np.int64).tolist():
+            lines += self.ReadRange(csvFile, row, row + 1)
+
+        return lines
+
+    @staticmethod
+    def GetIndexPath(pathToDataset: str) -> Path:
+        """
+            :param pathToDataset: The path to the csv dataset.
+            :type pathToDataset: str
+
+            :return: Where the index of the given csv file is stored, next to the csv file.
+            :rtype: pathlib.Path
+        """
+        return Path(pathToDataset).resolve().with_suffix(CsvIndex.INDEX_SUFFIX)
+
+    @staticmethod
+    def IsUpToDate(pathToDataset: str, pathToIndex: str) -> bool:
+        """
+            :return: True if the index exists, is of the current version and was built from the csv file as it is now.
+            :rtype: bool
+        """
+        csvPath: Path   = Path(pathToDataset).resolve()
+        indexPath: Path = Path(pathToIndex).resolve()
+
+        if not indexPath.exists():
+            return False
+
+        try:
+            (_, size, modified) = CsvIndex._readHeader(indexPath)
+        except TypeError:
+            return False
+
+        stat: os.stat_result = csvPath.stat()
+
+        return size == stat.st_size and modified == stat.st_mtime_ns
+
+    @staticmethod
+    def Build(pathToDataset: str, pathToIndex: str | None = None) -> Path:
+        """
+            Finds where every line of the csv file starts and writes the index. The file is written to a temporary
+            path first and then renamed, so a half written index is never used.
+
+            :param pathToDataset: The path to the csv dataset.
+            :type pathToDataset: str
+
+            :param pathToIndex: Where to write the index. Defaults to GetIndexPath(pathToDataset).
+            :type pathToIndex: str | None
+
+            :return: The path of the written index file.
+            :rtype: pathlib.Path
+
+            :raises FileNotFoundError: If the csv file does not exist.
+        """
+        csvPath: Path = Path(pathToDataset).resolve()
+
+        if not csvPath.exists():
+            raise FileNotFoundError(f"The dataset file does not exist: {csvPath}")
+
+        indexPath: Path = CsvIndex.GetIndexPath(csvPath) if pathToIndex is None else Path(pathToIndex).resolve()
+        tempPath: Path  = indexPath.with_name(indexPath.name + ".tmp")
+        stat: os.stat_result = csvPath.stat()
+
+        starts: list[np.ndarray] = []
+        ends: list[np.ndarray]   = []
+        position: int            = 0
+
+        with open(csvPath, "rb") as csvFile:
+            while True:
+                chunk: bytes = csvFile.read(CsvIndex._CHUNK_SIZE)
+
+                if len(chunk) <= 0:
+                    break
+
+                # Every newline ends a line, and the next line starts right after it.
+                newlines: np.ndarray = np.flatnonzero(np.frombuffer(chunk, dtype=np.uint8) == ord("\n")) + position
+                ends.append(newlines)
+                starts.append(newlines + 1)
+                position += len(chunk)
+
+        lineEnds: np.ndarray   = np.concatenate([*ends, [position]]).astype(np.int64)
+        lineStarts: np.ndarray = np.concatenate([[0], *starts]).astype(np.int64)
+
+        # A line of only "\r" (from "\r\n" line endings) is empty as well.
+        lengths: np.ndarray = lineEnds - lineStarts
+        rows: np.ndarray    = lineStarts[lengths > 0]
+
+        if len(rows) > 0 and np.any(lengths == 1):
+            carriageReturns: np.ndarray = lineStarts[lengths == 1]
+            rows = np.setdiff1d(rows, CsvIndex._findCarriageReturns(csvPath, carriageReturns))
+
+        try:
+            with open(tempPath, "wb") as f:
+                header: bytes = struct.pack(CsvIndex._HEADER_FORMAT, CsvIndex.MAGIC, CsvIndex.VERSION, len(rows), stat.st_size, stat.st_mtime_ns)
+                f.write(header.ljust(CsvIndex.HEADER_SIZE, b"\0"))
+                f.write(np.concatenate([rows, [position]]).astype("<u8").tobytes())
+
+            os.replace(tempPath, indexPath)
+        finally:
+            tempPath.unlink(missing_ok=True)
+
+        return indexPath
+
+    @staticmethod
+    def _findCarriageReturns(csvPath: Path, offsets: np.ndarray) -> np.ndarray:
+        """
+            :return: The offsets (of lines of one byte) where that byte is "\\r".
+            :rtype: numpy.ndarray
+        """
+        data: np.ndarray = np.memmap(csvPath, dtype=np.uint8, mode="r")
+
+        return offsets[data[offsets] == ord("\r")]
+
+    @staticmethod
+    def _readHeader(path: Path) -> tuple[int, int, int]:
+        """
+            :return: The amount of rows, the size and the modification time of the csv file stored in the header.
+            :rtype: tuple[int, int, int]
+
+            :raises TypeError: If the file isn't an index file of a supported version.
+        """
+        headerSize: int = struct.calcsize(CsvIndex._HEADER_FORMAT)
+
+        with open(path, "rb") as f:
+            header: bytes = f.read(headerSize)
+
+        if len(header) != headerSize:
+            raise TypeError(f"The file is too small to be a csv index: {path}")
+
+        (magic, version, count, size, modified) = struct.unpack(CsvIndex._HEADER_FORMAT, header)
+
+        if magic != CsvIndex.MAGIC:
+            raise TypeError(f"The file is not a csv index: {path}")
+
+        if version != CsvIndex.VERSION:
+            raise TypeError(f"Unsupported csv index version {version}, expected {CsvIndex.VERSION}: {path}")
+
+        return (count, size, modified)
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from mnist.mnist_image import MnistImage
+import numpy as np
+
+class MnistBatch():
+    """
+        A batch of images as two arrays: the labels and the uint8 pixels of shape (images, 28 * 28), one contiguous
+        row per image. Networks take the arrays as they are, so training never creates a python object per image.
+
+        It still behaves like the list of data pairs the dataloader used to return: iterating, indexing and len
+        work as before, handing out (label, MnistImage) pairs whose pixels are views of the batch's rows.
+    """
+
+    __slots__ = ("_labels", "_pixels", "_dtype")
+
+    def __init__(self: "MnistBatch", labels: np.ndarray, pixels: np.ndarray, dtype: np.typing.DTypeLike = np.float64) -> None:
+        """
+            :param labels: The label of every image, shape (images,).
+            :type labels: numpy.ndarray
+
+            :param pixels: The pixels of every image from 0 to 255, shape (images, 28 * 28). Converted to contiguous uint8 if they aren't.
+            :type pixels: numpy.ndarray
+
+            :param dtype: The floating point type of the normalized pixels.
+            :type dtype: numpy.typing.DTypeLike
+
+            :raises TypeError: If the shapes don't match.
+        """
+        labels = np.asarray(labels, dtype=np.int64)
+        pixels = np.asarray(pixels)
+
+        if pixels.ndim != 2 or pixels.shape[1] != 28 * 28 or len(pixels) != len(labels):
+            raise TypeError(f"Expected {len(labels)} images of 28*28 pixels, got the shape {pixels.shape}!")
+
+        if pixels.dtype != np.uint8:
+            pixels = np.clip(pixels, 0, 255).astype(np.uint8)
+
+        self._labels: np.ndarray = labels
+        self._pixels: np.ndarray = np.ascontiguousarray(pixels)
+        self._dtype: np.dtype    = np.dtype(dtype)
+
+    @staticmethod
+    def FromPairs(pairs: list[tuple[int, MnistImage]], dtype: np.typing.DTypeLike = np.float64) -> "MnistBatch":
+        """
+            :param pairs: Data pairs of labels and images.
+            :type pairs: list[tuple[int, mnist.MnistImage]]
+
+            :return: A batch of the pairs.
+            :rtype: mnist.MnistBatch
+        """
+        labels: np.ndarray = np.array([label for (label, _) in pairs], dtype=np.int64)
+        pixels: np.ndarray = np.array([image.GetPixels() for (_, image) in pairs], dtype=np.uint8).reshape(-1, 28 * 28)
+
+        return MnistBatch(labels, pixels, dtype)
+
+    def GetLabels(self) -> np.ndarray:
+        """
+            :return: The label of every image, shape (images,).
+            :rtype: numpy.ndarray
+        """
+        return self._labels
+
+    def GetPixels(self) -> np.ndarray:
+        """
+            :return: The uint8 pixels, shape (images, 28 * 28).
+            :rtype: numpy.ndarray
+        """
+        return self._pixels
+
+    def GetNormalizedPixels(self, out: np.ndarray | None = None) -> np.ndarray:
+        """
+            :param out: Where to write the normalized pixels, ex: a reused buffer of shape (images, 28 * 28). A new array if None.
+            :type out: numpy.ndarray | None
+
+            :return: The pixels from 0 to 1 in the batch's floating point type (or out's), shape (images, 28 * 28).
+            :rtype: numpy.ndarray
+        """
+        if out is None:
+            return self._pixels.astype(self._dtype) / 255
+
+        # Divided in out's type, so the result is the same as converting first like above.
+        return np.divide(self._pixels, 255, out=out, dtype=out.dtype)
+
+    def GetDtype(self) -> np.dtype:
+        return self._dtype
+
+    def __len__(self) -> int:
+        return len(self._labels)
+
+    def __iter__(self) -> Iterator[tuple[int, MnistImage]]:
+        for index in range(len(self._labels)):
+            yield self[index]
+
+    def __getitem__(self, index: int | slice) -> tuple[int, MnistImage] | "MnistBatch":
+        """
+            :return: The data pair at the index, or a batch of the images in the slice.
+            :rtype: tuple[int, mnist.MnistImage] | mnist.MnistBatch
+        """
+        if isinstance(index, slice):
+            return MnistBatch(self._labels[index], self._pixels[index], self._dtype)
+
+        return (int(self._labels[index]), MnistImage(self._pixels[index], self._dtype))
+
+    def __add__(self, other: "MnistBatch") -> "MnistBatch":
+        """
+            :return: A batch of the images of both batches, like adding two lists of data pairs.
+            :rtype: mnist.MnistBatch
+        """
+        if not isinstance(other, MnistBatch):
+            return NotImplemented
+
+        return MnistBatch(np.concatenate([self._labels, other._labels]), np.concatenate([self._pixels, other._pixels]), self._dtype)
+
+    def __repr__(self) -> str:
+        return f"MnistBatch(images={len(self)}, dtype={self._dtype.name})"
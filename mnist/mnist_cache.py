@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+from pathlib import Path
+import itertools
+import numpy as np
+import os
+import struct
+
+class MnistCache():
+    """
+        A pre-decoded binary copy of a mnist csv file. The csv file is parsed once by Convert
+        and every later load just memory-maps the result, so no text has to be parsed again.
+
+        File layout (little endian):
+            [0:8]   magic bytes b"MNISTBIN".
+            [8:12]  uint32 format version.
+            [12:16] uint32 amount of images.
+            [16:20] uint32 image rows (28).
+            [20:24] uint32 image columns (28).
+            [24:64] zero padding.
+            [64:]   uint8 labels, one per image, then zero padding up to the next 64 byte boundary,
+                    then uint8 pixels, rows * columns per image.
+    """
+
+    MAGIC: bytes        = b"MNISTBIN"
+    VERSION: int        = 1
+    HEADER_SIZE: int    = 64
+    ALIGNMENT: int      = 64
+    IMAGE_ROWS: int     = 28
+    IMAGE_COLUMNS: int  = 28
+    CACHE_SUFFIX: str   = ".cache"
+    _HEADER_FORMAT: str = "<8sIIII"
+    _CHUNK_ROWS: int    = 4096 # Rows parsed at once when converting.
+
+    def __init__(self: "MnistCache", pathToCache: str) -> None:
+        """
+            Opens (memory-maps) an existing cache file. Only the header is read, the images are
+            paged in by the operating system when they are used.
+
+            :param pathToCache: The path to the cache file.
+            :type pathToCache: str
+
+            :raises FileNotFoundError: If the cache file does not exist.
+            :raises TypeError: If the file is not a cache file of a supported version.
+        """
+        absPath: Path = Path(pathToCache).resolve()
+
+        if not absPath.exists():
+            raise FileNotFoundError(f"The cache file does not exist: {absPath}")
+
+        (count, rows, columns) = MnistCache._readHeader(absPath)
+
+        self._path: Path = absPath
+
+        imageSize: int     = rows * columns
+        pixelsOffset: int  = MnistCache._align(MnistCache.HEADER_SIZE + count)
+
+        self._labels: np.ndarray = np.memmap(absPath, dtype=np.uint8, mode="r", offset=MnistCache.HEADER_SIZE, shape=(count,)) if count > 0 else np.zeros(0, dtype=np.uint8)
+        self._pixels: np.ndarray = np.memmap(absPath, dtype=np.uint8, mode="r", offset=pixelsOffset, shape=(count, imageSize)) if count > 0 else np.zeros((0, imageSize), dtype=np.uint8)
+
+    def __len__(self) -> int:
+        return len(self._labels)
+
+    def GetLabels(self) -> np.ndarray:
+        """
+            :return: The read-only labels of all images, shape (images,).
+            :rtype: numpy.ndarray
+        """
+        return self._labels
+
+    def GetPixels(self) -> np.ndarray:
+        """
+            :return: The read-only pixels of all images with values from 0 to 255, shape (images, 28 * 28).
+            :rtype: numpy.ndarray
+        """
+        return self._pixels
+
+    @staticmethod
+    def GetCachePath(pathToDataset: str) -> Path:
+        """
+            :param pathToDataset: The path to the csv dataset.
+            :type pathToDataset: str
+
+            :return: Where the cache of the given csv file is stored, next to the csv file.
+            :rtype: pathlib.Path
+        """
+        return Path(pathToDataset).resolve().with_suffix(MnistCache.CACHE_SUFFIX)
+
+    @staticmethod
+    def IsCacheFile(path: str) -> bool:
+        """
+            :param path: The file to check.
+            :type path: str
+
+            :return: True if the file starts with the magic bytes of a cache file.
+            :rtype: bool
+        """
+        try:
+            with open(path, "rb") as f:
+                return f.read(len(MnistCache.MAGIC)) == MnistCache.MAGIC
+        except OSError:
+            return False
+
+    @staticmethod
+    def IsUpToDate(pathToDataset: str, pathToCache: str) -> bool:
+        """
+            :return: True if the cache exists, is of the current version and is newer than the csv file.
+            :rtype: bool
+        """
+        csvPath: Path   = Path(pathToDataset).resolve()
+        cachePath: Path = Path(pathToCache).resolve()
+
+        if not cachePath.exists() or cachePath.stat().st_mtime < csvPath.stat().st_mtime:
+            return False
+
+        try:
+            MnistCache._readHeader(cachePath)
+        except TypeError:
+            return False
+
+        return True
+
+    @staticmethod
+    def Convert(pathToDataset: str, pathToCache: str | None = None) -> Path:
+        """
+            Parses a mnist csv file once and writes it as a cache file. Rows that don't have
+            exactly 1 + 28 * 28 values are skipped, just like the dataloader does. The file is
+            written to a temporary path first and then renamed, so a half written cache is never used.
+
+            :param pathToDataset: The path to the csv dataset.
+            :type pathToDataset: str
+
+            :param pathToCache: Where to write the cache. Defaults to GetCachePath(pathToDataset).
+            :type pathToCache: str | None
+
+            :return: The path of the written cache file.
+            :rtype: pathlib.Path
+
+            :raises FileNotFoundError: If the csv file does not exist.
+        """
+        csvPath: Path = Path(pathToDataset).resolve()
+
+        if not csvPath.exists():
+            raise FileNotFoundError(f"The dataset file does not exist: {csvPath}")
+
+        cachePath: Path = MnistCache.GetCachePath(csvPath) if pathToCache is None else Path(pathToCache).resolve()
+        tempPath: Path  = cachePath.with_name(cachePath.name + ".tmp")
+        imageSize: int  = MnistCache.IMAGE_ROWS * MnistCache.IMAGE_COLUMNS
+
+        # The pixels are streamed to a temporary file while the labels (one byte per image) are kept,
+        # since the labels have to be written before the pixels.
+        labels: list[np.ndarray] = []
+        pixelsPath: Path         = cachePath.with_name(cachePath.name + ".pixels.tmp")
+
+        try:
+            with open(csvPath, "r") as csvFile, open(pixelsPath, "wb") as pixelsFile:
+                while True:
+                    lines: list[str] = list(itertools.islice(csvFile, MnistCache._CHUNK_ROWS))
+
+                    if len(lines) <= 0:
+                        break
+
+                    values: np.ndarray = MnistCache._parseLines(lines, 1 + imageSize)
+
+                    labels.append(values[:, 0].astype(np.uint8))
+                    pixelsFile.write(np.clip(values[:, 1:], 0, 255).astype(np.uint8).tobytes())
+
+            allLabels: np.ndarray = np.concatenate(labels) if len(labels) > 0 else np.zeros(0, dtype=np.uint8)
+            count: int            = len(allLabels)
+
+            with open(tempPath, "wb") as f:
+                header: bytes = struct.pack(MnistCache._HEADER_FORMAT, MnistCache.MAGIC, MnistCache.VERSION, count, MnistCache.IMAGE_ROWS, MnistCache.IMAGE_COLUMNS)
+                f.write(header.ljust(MnistCache.HEADER_SIZE, b"\0"))
+                f.write(allLabels.tobytes())
+                f.write(b"\0" * (MnistCache._align(MnistCache.HEADER_SIZE + count) - (MnistCache.HEADER_SIZE + count)))
+
+                with open(pixelsPath, "rb") as pixelsFile:
+                    while True:
+                        chunk: bytes = pixelsFile.read(1 << 20)
+
+                        if len(chunk) <= 0:
+                            break
+
+                        f.write(chunk)
+
+            os.replace(tempPath, cachePath)
+        finally:
+            pixelsPath.unlink(missing_ok=True)
+            tempPath.unlink(missing_ok=True)
+
+        return cachePath
+
+    @staticmethod
+    def _parseLines(lines: list[str], valuesPerLine: int) -> np.ndarray:
+        """
+            Parses csv lines into an integer matrix, skipping lines of the wrong length.
+
+            :return: The parsed values, shape (validLines, valuesPerLine).
+            :rtype: numpy.ndarray
+        """
+        try:
+            values: np.ndarray = np.loadtxt(lines, delimiter=",", dtype=np.int64, ndmin=2)
+
+            if values.shape[1] == valuesPerLine:
+                return values
+        except ValueError:
+            pass
+
+        # Some line doesn't match the format, parse them one by one and only keep the valid ones.
+        rows: list[list[int]] = []
+
+        for line in lines:
+            try:
+                row: list[int] = [int(val) for val in line.split(",")]
+            except ValueError:
+                continue
+
+            if len(row) == valuesPerLine:
+                rows.append(row)
+
+        return np.array(rows, dtype=np.int64).reshape(-1, valuesPerLine)
+
+    @staticmethod
+    def _readHeader(path: Path) -> tuple[int, int, int]:
+        """
+            :return: The amount of images, image rows and image columns stored in the header.
+            :rtype: tuple[int, int, int]
+
+            :raises TypeError: If the file isn't a cache file of a supported version.
+        """
+        headerSize: int = struct.calcsize(MnistCache._HEADER_FORMAT)
+
+        with open(path, "rb") as f:
+            header: bytes = f.read(headerSize)
+
+        if len(header) != headerSize:
+            raise TypeError(f"The file is too small to be a mnist cache: {path}")
+
+        (magic, version, count, rows, columns) = struct.unpack(MnistCache._HEADER_FORMAT, header)
+
+        if magic != MnistCache.MAGIC:
+            raise TypeError(f"The file is not a mnist cache: {path}")
+
+        if version != MnistCache.VERSION:
+            raise TypeError(f"Unsupported mnist cache version {version}, expected {MnistCache.VERSION}: {path}")
+
+        return (count, rows, columns)
+
+    @staticmethod
+    def _align(offset: int) -> int:
+        return (offset + MnistCache.ALIGNMENT - 1) // MnistCache.ALIGNMENT * MnistCache.ALIGNMENT
@@ -1,30 +1,49 @@
 from __future__ import annotations
 
-from io import TextIOWrapper
+from collections.abc import Iterator
+from io import BufferedReader, TextIOWrapper
 from pathlib import Path
+from mnist.csv_index import CsvIndex
+from mnist.mnist_batch import MnistBatch
+from mnist.mnist_cache import MnistCache
 from mnist.mnist_image import MnistImage
+from mnist.shuffle import Shuffle
+from mnist.shuffles.permuted_index_shuffle import PermutedIndexShuffle
 import csv
-import random
+import itertools
+import numpy as np
 
 class MnistDataloader():
     """
         Loads data from the mnist dataset.
+
+        Besides reading batches in order, the images can be read at any position with len(dataloader) and
+        dataloader[index] or dataloader[start:stop]. For a csv file this builds (once, see mnist.CsvIndex)
+        an index of where every line starts, so a row is read with one seek instead of from the start of the file.
     """
 
     # Class types.
     Label    = int
     DataPair = tuple["MnistDataloader.Label", MnistImage]
 
-    def __init__(self, pathToDataset: str, batchSize: int = 10, shuffle: bool = False) -> None:
+    def __init__(self, pathToDataset: str, batchSize: int = 10, shuffle: bool | Shuffle = False, useCache: bool = False, dtype: np.typing.DTypeLike = np.float64) -> None:
         """
-            :param pathToDataset: The path to the dataset (nmist).
+            :param pathToDataset: The path to the dataset (nmist). Either a csv file or a cache file written by mnist.MnistCache.
             :type pathToDataset: str
 
             :param batchSize: The amount of images to read each read.
             :type batchSize: int
 
-            :param shuffle: To shuffle the batch or not.
-            :type shuffle: bool
+            :param shuffle: How to shuffle the images, see mnist.Shuffle. True picks a PermutedIndexShuffle. Index shuffles
+            read a csv file through its line index (see mnist.CsvIndex). Every Reset starts the next epoch's order.
+            :type shuffle: bool | mnist.Shuffle
+
+            :param useCache: Read a csv dataset through its binary cache (see mnist.MnistCache) instead of parsing
+            the text every epoch. The cache is written next to the csv file the first time, or if the csv file changed.
+            :type useCache: bool
+
+            :param dtype: The floating point type of the normalized pixels (ex: numpy.float32 for a float32 network).
+            :type dtype: numpy.typing.DTypeLike
 
             :raises TypeError: If the batchSize is negative or zero.
             :raises FileNotFoundError: If the pathToDataset does not exist.
@@ -37,71 +56,258 @@ class MnistDataloader():
         
         self._path: Path = absPath
 
+        if (batchSize >= 1):
+            self._batchSize: int = batchSize
+        else:
+            raise TypeError("Batch size can't be lower than 1!")
+
+        self._dtype: np.dtype         = np.dtype(dtype)
+        self._index: int              = 0 # Track where we are.
+        self._epoch: int              = 0 # Counts the resets, every epoch has its own shuffled order.
+        self._shuffle: Shuffle | None = None
+
+        # The cache is used if asked for, or if the given file already is a cache file.
+        self._cache: MnistCache | None     = None
+        self._indexStream: Iterator | None = None # The shuffled indices when a stream shuffle reads from the cache.
+
+        # The line index of a csv file and the file it's read through, only opened once random access is needed.
+        self._csvIndex: CsvIndex | None      = None
+        self._rowFile: BufferedReader | None = None
+
+        if shuffle is True:
+            self._shuffle = PermutedIndexShuffle()
+        elif isinstance(shuffle, Shuffle):
+            self._shuffle = shuffle
+
+        if useCache or MnistCache.IsCacheFile(self._path):
+            self._openCache(useCache)
+            return
+
         self._file: TextIOWrapper = open(self._path, "r")
+        self._openLines()
+
+        if self._shuffle is not None and self._shuffle.NeedsRandomAccess():
+            self._openCsvIndex()
 
+    def _openLines(self) -> None:
+        """
+            Starts reading the csv file's lines from the current position, shuffled if a stream shuffle was given.
+            Index shuffles read the lines through the csv index instead, see _readRawBatch.
+        """
         self._csvFile = csv.reader(self._file)
+        self._lines: Iterator[list[str]] = self._csvFile
 
-        if (batchSize >= 1):
-            self._batchSize: int = batchSize
+        if self._shuffle is not None and not self._shuffle.NeedsRandomAccess():
+            self._lines = self._shuffle.Stream(self._csvFile, self._epoch)
+
+    def _openCache(self, convertIfNeeded: bool) -> None:
+        """
+            Memory-maps the cache of the dataset, converting the csv file first if needed.
+
+            :param convertIfNeeded: Convert the csv file if the cache is missing or out of date.
+            :type convertIfNeeded: bool
+        """
+        if MnistCache.IsCacheFile(self._path):
+            cachePath: Path = self._path
         else:
-            raise TypeError("Batch size can't be lower than 1!")
-        
-        self._shuffle: bool                = shuffle
-        self._rows: list[list[str]] | None = None
-        self._index: int                   = 0  # Track where we are.
-
-        if shuffle:
-            # Load all rows into memory for shuffling.
-            self._rows = list(self._csvFile)
-            random.shuffle(self._rows)
+            cachePath: Path = MnistCache.GetCachePath(self._path)
+
+            if convertIfNeeded and not MnistCache.IsUpToDate(self._path, cachePath):
+                MnistCache.Convert(self._path, cachePath)
+
+        self._cache = MnistCache(cachePath)
+        self._openIndexStream()
+
+    def _openCsvIndex(self) -> CsvIndex:
+        """
+            Memory-maps the line index of the csv file, building it first if it's missing or out of date.
+
+            :return: The index.
+            :rtype: mnist.CsvIndex
+        """
+        if self._csvIndex is None:
+            indexPath: Path = CsvIndex.GetIndexPath(self._path)
+
+            if not CsvIndex.IsUpToDate(self._path, indexPath):
+                CsvIndex.Build(self._path, indexPath)
+
+            self._csvIndex = CsvIndex(indexPath)
+            self._rowFile  = open(self._path, "rb")
+
+        return self._csvIndex
+
+    def _openIndexStream(self) -> None:
+        """
+            A stream shuffle reads the cache's indices in order, index shuffles don't need a stream.
+        """
+        if self._shuffle is not None and not self._shuffle.NeedsRandomAccess():
+            self._indexStream = self._shuffle.Stream(range(len(self._cache)), self._epoch)
     
-    def ReadOneBatch(self) -> list["MnistDataloader.DataPair"]:
+    def ReadOneBatch(self) -> MnistBatch:
         """
             Reads one batch of data pairs from the dataset.
         
-            :return: List of successfully read data pairs.
-            :rtype: list[MnistDataloader.DataPair]
+            :return: The successfully read images, iterating over it gives the data pairs.
+            :rtype: mnist.MnistBatch
         """
 
-        pairs: list[MnistDataloader.DataPair] = []
-        readCount: int = 0 # Successfully count of read pairs from the csv file.
+        return self._decodeRawBatch(self._readRawBatch())
 
-        for _ in range(self._batchSize):
-            pair: MnistDataloader.DataPair | None = self._readOneDataPair()
+    def ReadArrays(self, count: int | None = None) -> tuple[np.ndarray, np.ndarray]:
+        """
+            Reads the next images as arrays instead of data pairs, so no python object is created per image.
+            Useful for evaluating a whole chunk of the dataset with one matrix multiplication per layer.
 
-            if (isinstance(pair, tuple) and len(pair) == 2 and isinstance(pair[0], MnistDataloader.Label) and isinstance(pair[1], MnistImage)):
-                readCount += 1 # Increment counter.
+            :param count: The amount of images to read. Defaults to the batch size.
+            :type count: int | None
 
-                pairs.append(pair)
+            :return: The labels of shape (images,) and the normalized pixels (0 to 1) of shape (images, 28 * 28), in the dtype of the dataloader.
+            Both are empty when there is nothing more to read.
+            :rtype: tuple[numpy.ndarray, numpy.ndarray]
 
-        return pairs
-    
-    def _readOneDataPair(self) -> "MnistDataloader.DataPair" | None:
+            :raises TypeError: If count is lower than 1.
         """
-            Reads one data pair from the mnist csv file.
-            
-            :return: A data pair.
-            :rtype: MnistDataloader.DataPair | None
+        if count is not None and count < 1:
+            raise TypeError("Can't read less than 1 image at a time!")
+
+        (labels, pixels) = self._decodeArrays(self._readRawBatch(count))
+
+        return (labels, pixels.astype(self._dtype) / 255)
+
+    def _readRawBatch(self, count: int | None = None) -> list[list[str]] | np.ndarray:
         """
+            Reads the raw, not yet decoded, data of the next batch. This is the part that has to happen
+            in order. Decoding is done by _decodeRawBatch and can happen on another thread (see mnist.PrefetchDataloader).
 
-        nextLine: list[str] | None = self._readNextLine()
+            :param count: The amount of images to read. Defaults to the batch size.
+            :type count: int | None
 
-        if (nextLine is None): 
-            return None
+            :return: The csv rows of the batch, or the indices of the images in the cache when reading from a cache.
+            Empty if there was nothing left to read.
+            :rtype: list[list[str]] | numpy.ndarray
+        """
+        if count is None:
+            count = self._batchSize
 
-        convertedLine: list[int] = [int(val) for val in nextLine]
+        if self._cache is not None:
+            start: int = self._index
+            stop: int  = min(start + count, len(self._cache))
 
-        # 1 is for the label. 28 * 28 is for the image size.
-        if (len(convertedLine) != 1 + (28 * 28)):
-            # Format doesn't match expected, return None!
-            return None
-        
-        label: MnistDataloader.Label = convertedLine[0] # The first item is the label.
+            self._index = stop
+
+            # Only the order is shuffled, the images stay where they are in the file.
+            if self._shuffle is None:
+                return np.arange(start, stop)
+            if self._indexStream is not None:
+                return np.fromiter(itertools.islice(self._indexStream, stop - start), dtype=np.int64)
+
+            return self._shuffle.GetIndices(len(self._cache), start, stop, self._epoch)
+
+        if self._shuffle is not None and self._shuffle.NeedsRandomAccess():
+            start: int = self._index
+            stop: int  = min(start + count, len(self._csvIndex))
+
+            self._index = stop
+
+            return self._csvIndex.ReadRows(self._rowFile, self._shuffle.GetIndices(len(self._csvIndex), start, stop, self._epoch))
+
+        lines: list[list[str]] = []
+
+        for _ in range(count):
+            nextLine: list[str] | None = self._readNextLine()
+
+            if (nextLine is None):
+                break
+
+            lines.append(nextLine)
+
+        return lines
+
+    def _decodeRawBatch(self, rawBatch: list[list[str]] | np.ndarray) -> MnistBatch:
+        """
+            Decodes a raw batch read by _readRawBatch into a batch. Doesn't touch the read position,
+            so it's safe to call from another thread while the next batch is being read.
+
+            :param rawBatch: The raw batch.
+            :type rawBatch: list[list[str]] | numpy.ndarray
+
+            :return: The successfully decoded images.
+            :rtype: mnist.MnistBatch
+        """
+        (labels, pixels) = self._decodeArrays(rawBatch)
+
+        return MnistBatch(labels, pixels, self._dtype)
+
+    def _decodeArrays(self, rawBatch: list[list[str]] | np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+            :param rawBatch: The raw batch, see _readRawBatch.
+            :type rawBatch: list[list[str]] | numpy.ndarray
+
+            :return: The labels of shape (images,) and the uint8 pixels of shape (images, 28 * 28).
+            :rtype: tuple[numpy.ndarray, numpy.ndarray]
+        """
+        if self._cache is not None:
+            # No text is parsed, the pixels are gathered straight out of the memory-mapped file.
+            labels: np.ndarray = self._cache.GetLabels()[rawBatch].astype(np.int64)
+            pixels: np.ndarray = self._cache.GetPixels()[rawBatch]
+
+            return (labels, pixels)
+
+        # 1 is for the label. 28 * 28 is for the image size. Lines of another format are skipped.
+        values: np.ndarray = np.array([line for line in rawBatch if len(line) == 1 + (28 * 28)], dtype=np.int64).reshape(-1, 1 + (28 * 28))
+
+        return (values[:, 0], np.clip(values[:, 1:], 0, 255).astype(np.uint8))
+
+    def __len__(self) -> int:
+        """
+            :return: The amount of rows in the dataset. Rows of a csv file that aren't images are counted as well.
+            :rtype: int
+        """
+        if self._cache is not None:
+            return len(self._cache)
+
+        return len(self._openCsvIndex())
+
+    def __getitem__(self, index: int | slice) -> "MnistDataloader.DataPair | MnistBatch":
+        """
+            Reads images at any position, without moving the position ReadOneBatch reads from.
+
+            :param index: The row, or a slice of rows. A slice with a step of 1 is read from a csv file with one read.
+            :type index: int | slice
+
+            :return: The data pair of the row, or a batch of the rows of the slice (without the ones that aren't images).
+            :rtype: MnistDataloader.DataPair | mnist.MnistBatch
+
+            :raises IndexError: If the row is out of range.
+            :raises TypeError: If the row of a csv file isn't an image, or the index isn't an int or a slice.
+        """
+        length: int = len(self)
+
+        if isinstance(index, slice):
+            (start, stop, step) = index.indices(length)
+
+            if self._cache is not None:
+                return self._decodeRawBatch(np.arange(start, stop, step))
+            if step == 1:
+                return self._decodeRawBatch(self._csvIndex.ReadRange(self._rowFile, start, stop))
+
+            return self._decodeRawBatch(self._csvIndex.ReadRows(self._rowFile, np.arange(start, stop, step)))
+
+        if not isinstance(index, (int, np.integer)):
+            raise TypeError(f"Can't index a dataloader with {type(index).__name__}, use an int or a slice!")
+
+        row: int = int(index) + length if index < 0 else int(index)
+
+        if row < 0 or row >= length:
+            raise IndexError(f"Row {index} is out of range for a dataset of {length} rows!")
+
+        batch: MnistBatch = self[row:row + 1]
+
+        if len(batch) <= 0:
+            raise TypeError(f"Row {index} isn't an image of 1 + 28 * 28 values!")
+
+        return batch[0]
 
-        imagePixels: list[int] = convertedLine[1:] # Take everything except for the first element.
-        
-        return (label, MnistImage(imagePixels))
-    
     def _readNextLine(self) -> list[str] | None:
         """
             Tries to read the next line in the csv file.
@@ -110,32 +316,42 @@ class MnistDataloader():
             :rtype: list[str] | None
         """
 
-        if self._shuffle:
-            if self._rows is None or self._index >= len(self._rows):
-                return None
-            
-            line         = self._rows[self._index]
-            self._index += 1
-
-            return line
-
-        try:
-            return next(self._csvFile)
-        except StopIteration:
-            return None
+        return next(self._lines, None)
         
     def Reset(self) -> None:
         """
-            Resets the dataloader so reading starts from the beginning again.
+            Resets the dataloader so reading starts from the beginning again, in the next epoch's order if shuffling.
         """
-        if not self._shuffle:
-            self._file.seek(0)
-            self._csvFile = csv.reader(self._file)
+        self._epoch += 1
+        self._index  = 0
+
+        if self._cache is not None:
+            self._openIndexStream()
             return
-        
-        random.shuffle(self._rows)
-        self._index = 0
-        
+
+        self._file.seek(0)
+        self._openLines()
+
+    def GetEpoch(self) -> int:
+        """
+            :return: The number of the current epoch, 0 until the first Reset.
+            :rtype: int
+        """
+        return self._epoch
+
+    def SetEpoch(self, epoch: int) -> None:
+        """
+            Starts reading the given epoch from the beginning, ex: to repeat an epoch's shuffled order when resuming training.
+
+            :param epoch: The number of the epoch.
+            :type epoch: int
+        """
+        self._epoch = epoch - 1
+        self.Reset()
+
     def __del__(self):
         if hasattr(self, "_file") and self._file:
-            self._file.close()
\ No newline at end of file
+            self._file.close()
+
+        if getattr(self, "_rowFile", None) is not None:
+            self._rowFile.close()
\ No newline at end of file
@@ -1,43 +1,55 @@
+from __future__ import annotations
+
 import numpy
 
 class MnistImage():
     """
-        An image that reflects the data in the mnist dataset.
+        An image that reflects the data in the mnist dataset. The pixels are stored as uint8 (784 bytes per
+        image) and only normalized when asked for, so holding on to many images is cheap.
     """
-    
-    def __init__(self: "MnistImage", pixels: list[int]) -> None:
+
+    __slots__ = ("_pixels", "_dtype")
+
+    def __init__(self: "MnistImage", pixels: list[int] | numpy.ndarray, dtype: numpy.typing.DTypeLike = numpy.float64) -> None:
         """
-            :param pixels: The values for each pixel. Length should be 28*28!
-            :type pixels: list[int]
+            :param pixels: The values for each pixel. Length should be 28*28! A uint8 array is used as it is, without
+            copying, so an image can be a view of a row in a batch (see mnist.MnistBatch).
+            :type pixels: list[int] | numpy.ndarray
+
+            :param dtype: The floating point type of the normalized pixels.
+            :type dtype: numpy.typing.DTypeLike
         """
 
         if (len(pixels) != 28 * 28):
             raise TypeError("Pixels was not of length 28*28!")
-        
-        # Clip the pixels so that each pixel value is between 0 and 255.
-        self._pixels: list[int] = numpy.clip(pixels, 0, 255)
 
-        # Normalize the pixel values to be between 0 and 1.
-        self._normalizedPixels: list[float] = [float(val) / 255.0 for val in self._pixels]
+        if isinstance(pixels, numpy.ndarray) and pixels.dtype == numpy.uint8:
+            self._pixels: numpy.ndarray = pixels
+        else:
+            # Clip the pixels so that each pixel value is between 0 and 255.
+            self._pixels: numpy.ndarray = numpy.clip(pixels, 0, 255).astype(numpy.uint8)
+
+        self._dtype: numpy.dtype = numpy.dtype(dtype)
 
         return
     
-    def GetPixels(self) -> list[int]:
+    def GetPixels(self) -> numpy.ndarray:
         """
             Get pixels of image.
             
-            :return: A list of pixels with their value from 0 to 255.
-            :rtype: list[int]
+            :return: An array of pixels with their value from 0 to 255, as uint8.
+            :rtype: numpy.ndarray
         """
         
         return self._pixels
     
-    def GetNormalizedPixels(self) -> list[float]:
+    def GetNormalizedPixels(self) -> numpy.ndarray:
         """
-            Get normalized pixels of image.
+            Get normalized pixels of image. They are computed on every call, done on the whole array at
+            once instead of pixel by pixel in python.
             
-            :return: A list of pixels with their value from 0 to 1.
-            :rtype: list[int]
+            :return: An array of pixels with their value from 0 to 1.
+            :rtype: numpy.ndarray
         """
 
-        return self._normalizedPixels
\ No newline at end of file
+        return self._pixels.astype(self._dtype) / 255
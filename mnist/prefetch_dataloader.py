@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+from mnist.mnist_batch import MnistBatch
+from mnist.mnist_dataloader import MnistDataloader
+import threading
+import time
+
+class PrefetchStats():
+    """
+        Counters describing how well a PrefetchDataloader keeps up with its consumer. If the
+        consumer often stalls while the queue is empty, training is input-bound. If the workers
+        mostly wait for a free slot, the queue is full and training is compute-bound.
+    """
+
+    def __init__(self: "PrefetchStats", depth: int) -> None:
+        """
+            :param depth: The maximum amount of batches prefetched ahead.
+            :type depth: int
+        """
+        self.depth: int                 = depth
+        self.batchesServed: int         = 0   # Batches handed out by ReadOneBatch.
+        self.stalls: int                = 0   # Times ReadOneBatch had to wait for the next batch.
+        self.stallSeconds: float        = 0.0 # Total time ReadOneBatch spent waiting.
+        self.producerWaitSeconds: float = 0.0 # Total time workers spent waiting for a free slot in the queue.
+        self.occupancySum: int          = 0   # Sum of the ready batches in the queue, sampled at each ReadOneBatch.
+
+    def GetAverageOccupancy(self) -> float:
+        """
+            :return: The average amount of ready batches in the queue when a batch was requested, from 0 to depth.
+            :rtype: float
+        """
+        return self.occupancySum / self.batchesServed if self.batchesServed > 0 else 0.0
+
+    def GetStallRatio(self) -> float:
+        """
+            :return: The fraction of requested batches that weren't ready yet, from 0 to 1.
+            :rtype: float
+        """
+        return self.stalls / self.batchesServed if self.batchesServed > 0 else 0.0
+
+    def __repr__(self) -> str:
+        return (f"PrefetchStats(depth={self.depth}, batchesServed={self.batchesServed}, stalls={self.stalls}, "
+                f"stallSeconds={self.stallSeconds:.3f}, producerWaitSeconds={self.producerWaitSeconds:.3f}, "
+                f"averageOccupancy={self.GetAverageOccupancy():.2f})")
+
+class PrefetchDataloader():
+    """
+        Wraps a MnistDataloader and reads the next batches on background threads while the
+        current batch is used, so the network doesn't have to wait for the file to be parsed.
+        It has the same ReadOneBatch / Reset interface as the dataloader, so it can be passed
+        straight to Network.TrainOneEpoch and Network.Evaluate.
+
+        The batches are always handed out in the same order as the wrapped dataloader would
+        hand them out, even with more than one worker.
+    """
+
+    def __init__(self: "PrefetchDataloader", dataloader: MnistDataloader, depth: int = 4, workers: int = 1) -> None:
+        """
+            :param dataloader: The dataloader to read batches from. Shouldn't be read from by anyone else while wrapped.
+            :type dataloader: mnist.MnistDataloader
+
+            :param depth: The maximum amount of batches read ahead (the size of the queue).
+            :type depth: int
+
+            :param workers: The amount of threads decoding batches. Reading the file happens one at a time,
+            decoding the read rows into images happens in parallel.
+            :type workers: int
+
+            :raises TypeError: If depth or workers is lower than 1.
+        """
+        if depth < 1:
+            raise TypeError("Prefetch depth can't be lower than 1!")
+
+        if workers < 1:
+            raise TypeError("The amount of prefetch workers can't be lower than 1!")
+
+        self._dataloader: MnistDataloader = dataloader
+        self._depth: int                  = depth
+        self._workerCount: int            = workers
+        self._stats: PrefetchStats        = PrefetchStats(depth)
+
+        self._readLock: threading.Lock       = threading.Lock()      # Only one worker reads from the dataloader at a time.
+        self._condition: threading.Condition = threading.Condition() # Guards the ready batches.
+        self._workers: list[threading.Thread] = []
+
+        self._start()
+
+    def _start(self) -> None:
+        """
+            Starts the workers from the current position of the wrapped dataloader.
+        """
+        self._slots: threading.Semaphore = threading.Semaphore(self._depth) # Free places in the queue.
+        self._ready: dict[int, MnistBatch] = {}                              # Decoded batches by their sequence number.
+        self._nextToRead: int         = 0     # Sequence number of the next batch read from the dataloader.
+        self._nextToServe: int        = 0     # Sequence number of the next batch handed out.
+        self._exhausted: bool         = False # True when the dataloader had nothing more to read.
+        self._stop: bool              = False
+        self._error: BaseException | None = None
+
+        self._workers = [threading.Thread(target=self._work, name=f"PrefetchWorker-{i}", daemon=True) for i in range(self._workerCount)]
+
+        for worker in self._workers:
+            worker.start()
+
+    def _work(self) -> None:
+        """
+            The loop of a worker thread. Reserves a place in the queue, reads the next raw batch
+            and decodes it. Stops when the dataloader is exhausted or when stopped.
+        """
+        while True:
+            waitStart: float = time.perf_counter()
+            self._slots.acquire()
+            waited: float = time.perf_counter() - waitStart
+
+            with self._readLock:
+                if self._stop or self._exhausted:
+                    self._slots.release() # Let the other workers wake up and stop as well.
+                    return
+
+                try:
+                    rawBatch = self._dataloader._readRawBatch()
+                except BaseException as error:
+                    self._fail(error)
+                    return
+
+                sequence: int      = self._nextToRead
+                self._nextToRead  += 1
+                self._exhausted    = len(rawBatch) <= 0
+
+            try:
+                batch: MnistBatch = self._dataloader._decodeRawBatch(rawBatch)
+            except BaseException as error:
+                self._fail(error)
+                return
+
+            with self._condition:
+                self._stats.producerWaitSeconds += waited
+                self._ready[sequence] = batch
+                self._condition.notify_all()
+
+    def _fail(self, error: BaseException) -> None:
+        """
+            Stores an error raised on a worker so that it's raised again by ReadOneBatch.
+        """
+        with self._condition:
+            self._error = error
+            self._condition.notify_all()
+
+    def ReadOneBatch(self) -> MnistBatch:
+        """
+            Hands out the next batch, waiting for it if it isn't decoded yet.
+
+            :return: The batch, empty when there is nothing more to read.
+            :rtype: mnist.MnistBatch
+
+            :raises RuntimeError: If the prefetcher has been closed or a worker failed.
+        """
+        if self._stop:
+            raise RuntimeError("Can't read from a closed prefetch dataloader!")
+
+        with self._condition:
+            if self._nextToServe not in self._ready and self._error is None:
+                waitStart: float = time.perf_counter()
+                self._condition.wait_for(lambda: self._nextToServe in self._ready or self._error is not None)
+                self._stats.stalls       += 1
+                self._stats.stallSeconds += time.perf_counter() - waitStart
+
+            if self._error is not None:
+                raise RuntimeError("A prefetch worker failed to read a batch!") from self._error
+
+            self._stats.occupancySum += len(self._ready) - 1 # The requested batch itself doesn't count as read ahead.
+
+            batch: MnistBatch = self._ready[self._nextToServe]
+
+            if len(batch) <= 0:
+                # Keep the end marker, so reading after the end keeps returning empty batches.
+                return batch
+
+            del self._ready[self._nextToServe]
+            self._nextToServe += 1
+            self._stats.batchesServed += 1
+
+        self._slots.release()
+
+        return batch
+
+    def Reset(self) -> None:
+        """
+            Stops the workers, resets the wrapped dataloader and starts prefetching from the beginning again.
+            Batches that were read ahead are thrown away.
+        """
+        self._shutdown()
+        self._dataloader.Reset()
+        self._start()
+
+    def GetStats(self) -> PrefetchStats:
+        """
+            :return: A copy of the counters since this prefetcher was created.
+            :rtype: mnist.PrefetchStats
+        """
+        with self._condition:
+            stats: PrefetchStats = PrefetchStats(self._depth)
+            stats.__dict__.update(self._stats.__dict__)
+
+        return stats
+
+    def Close(self) -> None:
+        """
+            Stops and joins the worker threads. The prefetcher can't be read from afterwards.
+        """
+        self._shutdown()
+
+    def _shutdown(self) -> None:
+        """
+            Stops the workers and waits for them to finish the batch they were working on.
+        """
+        with self._readLock:
+            self._stop = True
+
+        # Every worker blocked on a full queue needs a free slot to wake up and see the stop flag.
+        for _ in self._workers:
+            self._slots.release()
+
+        for worker in self._workers:
+            worker.join()
+
+        self._workers = []
+
+    def __enter__(self) -> "PrefetchDataloader":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.Close()
+
+    def __del__(self):
+        if hasattr(self, "_workers") and self._workers:
+            self._shutdown()
@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import numpy as np
+
+class Preprocessor():
+    """
+        Makes images look like the mnist digits before they are predicted. The mnist digits were scaled (keeping
+        their aspect ratio) to fit a 20 * 20 box, anti aliased, and put in the 28 * 28 image so that their center of
+        mass is in the middle. A digit drawn in the gui, or sent to the server, is wherever and however large it was
+        drawn, which the network was never trained on. The same steps are done here:
+
+            1. Blur: a 3 * 3 stencil that softens the edges of drawn cells, like the anti aliasing of mnist.
+            2. Crop to the bounding box of the pixels above the threshold.
+            3. Resize the box to fit 20 * 20, keeping the aspect ratio (bilinear).
+            4. Shift into 28 * 28 so that the center of mass is in the middle.
+
+        Every step works on a whole batch at once with numpy, no step loops over images or pixels in python.
+        The pixels are expected from 0 to 1, images without any pixels above the threshold stay empty.
+    """
+
+    IMAGE_SIZE: int = 28 # The size of the images (x * x).
+    BOX_SIZE: int   = 20 # The size of the box the digit is scaled to fit (x * x).
+
+    # The weights of a pixel and its 4 neighbours when blurring.
+    BLUR_CENTER: float    = 4.0 / 8.0
+    BLUR_NEIGHBOUR: float = 1.0 / 8.0
+
+    def __init__(self: "Preprocessor", blur: bool = True, threshold: float = 0.0) -> None:
+        """
+            :param blur: Tells if the images are blurred first. Turn it off for images that are smooth already.
+            :type blur: bool
+
+            :param threshold: Pixels at or below this value don't count towards the bounding box.
+            :type threshold: float
+        """
+        if not 0.0 <= threshold < 1.0:
+            raise TypeError("The threshold has to be from 0 up to (not including) 1!")
+
+        self._blur: bool       = blur
+        self._threshold: float = threshold
+
+    def Process(self, images: np.ndarray) -> np.ndarray:
+        """
+            Runs every step on one image or a batch.
+
+            :param images: One image of shape (784,) or (28, 28), or a batch of shape (batch, 784) or (batch, 28, 28). From 0 to 1.
+            :type images: numpy.ndarray
+
+            :return: The processed images, flat: (784,) for one image, (batch, 784) for a batch. Floating point images
+            keep their type, others become float64.
+            :rtype: numpy.ndarray
+        """
+        (batch, single) = Preprocessor._toBatch(images)
+
+        if self._blur:
+            batch = Preprocessor.Blur(batch)
+
+        boxes: np.ndarray = Preprocessor.GetBoundingBoxes(batch, self._threshold)
+        batch             = Preprocessor.CenterByMass(Preprocessor.CropAndResize(batch, boxes))
+
+        batch = batch.reshape(len(batch), -1)
+
+        return batch[0] if single else batch
+
+    @staticmethod
+    def _toBatch(images: np.ndarray) -> tuple[np.ndarray, bool]:
+        """
+            :return: The images as a floating point batch of shape (batch, 28, 28), and if it was a single image.
+            :rtype: tuple[numpy.ndarray, bool]
+        """
+        images = np.asarray(images)
+
+        if not np.issubdtype(images.dtype, np.floating):
+            images = images.astype(np.float64)
+
+        (size, pixels) = (Preprocessor.IMAGE_SIZE, Preprocessor.IMAGE_SIZE * Preprocessor.IMAGE_SIZE)
+
+        if images.shape in ((pixels,), (size, size)):
+            return (images.reshape(1, size, size), True)
+
+        if images.shape[1:] in ((pixels,), (size, size)):
+            return (images.reshape(-1, size, size), False)
+
+        raise TypeError(f"Expected one image or a batch of images of {pixels} pixels, got the shape {images.shape}!")
+
+    @staticmethod
+    def Blur(images: np.ndarray) -> np.ndarray:
+        """
+            Blurs with the stencil [[0, 1, 0], [1, 4, 1], [0, 1, 0]] / 8, pixels outside the image count as 0.
+
+            :param images: A batch of shape (batch, height, width).
+            :type images: numpy.ndarray
+
+            :return: The blurred images, clipped to 0 to 1.
+            :rtype: numpy.ndarray
+        """
+        blurred: np.ndarray = images * Preprocessor.BLUR_CENTER
+
+        # Every neighbour is added by shifting the whole batch by one pixel.
+        blurred[:, 1:, :]  += images[:, :-1, :] * Preprocessor.BLUR_NEIGHBOUR
+        blurred[:, :-1, :] += images[:, 1:, :] * Preprocessor.BLUR_NEIGHBOUR
+        blurred[:, :, 1:]  += images[:, :, :-1] * Preprocessor.BLUR_NEIGHBOUR
+        blurred[:, :, :-1] += images[:, :, 1:] * Preprocessor.BLUR_NEIGHBOUR
+
+        return np.clip(blurred, 0.0, 1.0, out=blurred)
+
+    @staticmethod
+    def GetBoundingBoxes(images: np.ndarray, threshold: float = 0.0) -> np.ndarray:
+        """
+            :param images: A batch of shape (batch, height, width).
+            :type images: numpy.ndarray
+
+            :param threshold: Pixels at or below this value don't count.
+            :type threshold: float
+
+            :return: The box of every image as (top, bottom, left, right), bottom and right included. Shape (batch, 4).
+            Images without pixels above the threshold get the whole image.
+            :rtype: numpy.ndarray
+        """
+        (_, height, width) = images.shape
+        above: np.ndarray  = images > threshold
+
+        rows: np.ndarray    = np.any(above, axis=2)
+        columns: np.ndarray = np.any(above, axis=1)
+        empty: np.ndarray   = ~np.any(rows, axis=1)
+
+        # argmax finds the first True, on the reversed axis it finds the last one.
+        boxes: np.ndarray = np.stack([
+            np.argmax(rows, axis=1),
+            height - 1 - np.argmax(rows[:, ::-1], axis=1),
+            np.argmax(columns, axis=1),
+            width - 1 - np.argmax(columns[:, ::-1], axis=1)
+        ], axis=1)
+        boxes[empty] = (0, height - 1, 0, width - 1)
+
+        return boxes
+
+    @staticmethod
+    def CropAndResize(images: np.ndarray, boxes: np.ndarray, size: int = BOX_SIZE) -> np.ndarray:
+        """
+            Scales the box of every image so its longest side becomes size pixels, and centers it in a size * size
+            image. The pixels are sampled bilinearly.
+
+            :param images: A batch of shape (batch, height, width).
+            :type images: numpy.ndarray
+
+            :param boxes: The box of every image, see GetBoundingBoxes.
+            :type boxes: numpy.ndarray
+
+            :param size: The size of the resized images (x * x).
+            :type size: int
+
+            :return: The resized images, of shape (batch, size, size).
+            :rtype: numpy.ndarray
+        """
+        (top, bottom, left, right) = np.transpose(boxes).astype(np.float64)
+
+        # How many source pixels one resized pixel covers, the same for both axes to keep the aspect ratio.
+        scales: np.ndarray = np.maximum(bottom - top + 1, right - left + 1) / size
+
+        # The centers of the resized pixels, in source pixel coordinates. The shorter side is padded evenly.
+        steps: np.ndarray   = np.arange(size) + 0.5 - size / 2
+        rows: np.ndarray    = ((top + bottom + 1) / 2)[:, np.newaxis] + steps * scales[:, np.newaxis] - 0.5
+        columns: np.ndarray = ((left + right + 1) / 2)[:, np.newaxis] + steps * scales[:, np.newaxis] - 0.5
+
+        return Preprocessor._sampleBilinear(images, rows, columns)
+
+    @staticmethod
+    def _sampleBilinear(images: np.ndarray, rows: np.ndarray, columns: np.ndarray) -> np.ndarray:
+        """
+            :param images: A batch of shape (batch, height, width). Outside the images, the pixels are 0.
+            :type images: numpy.ndarray
+
+            :param rows: The (fractional) rows to sample of every image, shape (batch, outHeight).
+            :type rows: numpy.ndarray
+
+            :param columns: The (fractional) columns to sample of every image, shape (batch, outWidth).
+            :type columns: numpy.ndarray
+
+            :return: The sampled images, of shape (batch, outHeight, outWidth).
+            :rtype: numpy.ndarray
+        """
+        (batch, height, width) = images.shape
+
+        # One row and column of zeros before the images and two after, so that every neighbour of a coordinate
+        # clipped to -1 up to the size can be read without checking the bounds.
+        padded: np.ndarray = np.pad(images, ((0, 0), (1, 2), (1, 2)))
+
+        rows    = np.clip(rows, -1, height)
+        columns = np.clip(columns, -1, width)
+
+        rows0: np.ndarray    = np.floor(rows)
+        columns0: np.ndarray = np.floor(columns)
+
+        rowWeights: np.ndarray    = (rows - rows0).astype(images.dtype)[:, :, np.newaxis]
+        columnWeights: np.ndarray = (columns - columns0).astype(images.dtype)[:, np.newaxis, :]
+
+        # Indices into the padded images.
+        indices: np.ndarray = np.arange(batch)[:, np.newaxis, np.newaxis]
+        y: np.ndarray       = rows0.astype(np.intp)[:, :, np.newaxis] + 1
+        x: np.ndarray       = columns0.astype(np.intp)[:, np.newaxis, :] + 1
+
+        top: np.ndarray    = padded[indices, y, x] * (1 - columnWeights) + padded[indices, y, x + 1] * columnWeights
+        bottom: np.ndarray = padded[indices, y + 1, x] * (1 - columnWeights) + padded[indices, y + 1, x + 1] * columnWeights
+
+        return top * (1 - rowWeights) + bottom * rowWeights
+
+    @staticmethod
+    def CenterByMass(images: np.ndarray, size: int = IMAGE_SIZE) -> np.ndarray:
+        """
+            Puts every image in a size * size one, shifted (by whole pixels) so that its center of mass is as close
+            to the middle as possible without cutting anything off.
+
+            :param images: A batch of shape (batch, height, width), at most size * size.
+            :type images: numpy.ndarray
+
+            :param size: The size of the new images (x * x).
+            :type size: int
+
+            :return: The centered images, of shape (batch, size, size).
+            :rtype: numpy.ndarray
+        """
+        (batch, height, width) = images.shape
+
+        mass: np.ndarray          = np.sum(images, axis=(1, 2))
+        nonEmpty: np.ndarray      = mass > 0
+        safeMass: np.ndarray      = np.where(nonEmpty, mass, 1)
+        centerRows: np.ndarray    = np.where(nonEmpty, np.sum(images, axis=2) @ np.arange(height) / safeMass, (height - 1) / 2)
+        centerColumns: np.ndarray = np.where(nonEmpty, np.sum(images, axis=1) @ np.arange(width) / safeMass, (width - 1) / 2)
+
+        # Where the top left corner goes, the middle of the new image is at (size - 1) / 2.
+        rowOffsets: np.ndarray    = np.clip(np.rint((size - 1) / 2 - centerRows), 0, size - height).astype(np.intp)
+        columnOffsets: np.ndarray = np.clip(np.rint((size - 1) / 2 - centerColumns), 0, size - width).astype(np.intp)
+
+        centered: np.ndarray = np.zeros((batch, size, size), dtype=images.dtype)
+        centered[
+            np.arange(batch)[:, np.newaxis, np.newaxis],
+            (rowOffsets[:, np.newaxis] + np.arange(height))[:, :, np.newaxis],
+            (columnOffsets[:, np.newaxis] + np.arange(width))[:, np.newaxis, :]
+        ] = images
+
+        return centered
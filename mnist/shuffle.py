@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+import numpy as np
+
+class Shuffle():
+    """
+        The base class of the ways a dataloader can shuffle its images. None of them read the whole dataset
+        into memory: the memory they use depends on their settings, not on the size of the dataset.
+
+        Every shuffle is seeded, and the order of an epoch only depends on the seed and the epoch's number,
+        so an epoch can be repeated exactly (ex: to resume training or to compare two runs).
+
+        There are two kinds of shuffles:
+
+        * Index shuffles (GetIndices) tell which images to read for positions of the epoch. They need a dataset
+          that can be read at any position, like a cache file (see mnist.MnistCache).
+        * Stream shuffles (Stream) shuffle the images while they are read in order, for data that can only be
+          read from the start (ex: a csv file).
+    """
+
+    def __init__(self: "Shuffle", seed: int | None = None) -> None:
+        """
+            :param seed: The seed of every epoch's order. A random one is picked if None.
+            :type seed: int | None
+        """
+        self._seed: int = int(np.random.SeedSequence().entropy) if seed is None else int(seed)
+
+    def GetSeed(self) -> int:
+        return self._seed
+
+    def NeedsRandomAccess(self) -> bool:
+        """
+            :return: True for index shuffles, which use GetIndices. False for stream shuffles, which use Stream.
+            :rtype: bool
+        """
+        raise NotImplementedError("Can't use the Shuffle class own NeedsRandomAccess!")
+
+    def GetIndices(self, length: int, start: int, stop: int, epoch: int) -> np.ndarray:
+        """
+            Should be implemented by index shuffles.
+
+            :param length: The amount of images in the dataset.
+            :type length: int
+
+            :param start: The first position of the epoch's order to get.
+            :type start: int
+
+            :param stop: The position after the last one to get.
+            :type stop: int
+
+            :param epoch: The number of the epoch.
+            :type epoch: int
+
+            :return: The indices of the images at the positions start up to stop of the epoch's order.
+            :rtype: numpy.ndarray
+        """
+        raise NotImplementedError(f"{type(self).__name__} can only shuffle a stream, see Stream!")
+
+    def Stream(self, items: Iterable, epoch: int) -> Iterator:
+        """
+            Should be implemented by stream shuffles.
+
+            :param items: The items in the order they are read.
+            :type items: Iterable
+
+            :param epoch: The number of the epoch.
+            :type epoch: int
+
+            :return: The same items, shuffled.
+            :rtype: Iterator
+        """
+        raise NotImplementedError(f"{type(self).__name__} needs random access to the data, see GetIndices!")
+
+    def _createGenerator(self, *keys: int) -> np.random.Generator:
+        """
+            :return: A random generator that only depends on the seed and the given keys (ex: the epoch).
+            :rtype: numpy.random.Generator
+        """
+        return np.random.default_rng(np.random.SeedSequence([self._seed, *keys]))
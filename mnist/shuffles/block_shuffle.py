@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from mnist.shuffle import Shuffle
+from mnist.shuffles.permuted_index_shuffle import PermutedIndexShuffle
+import numpy as np
+
+class BlockShuffle(Shuffle):
+    """
+        A shuffle that reads the dataset in shards: blocks of blockSize images that are next to each other in the
+        file. The order of the blocks is shuffled (with a PermutedIndexShuffle over the blocks), then blocksPerGroup
+        blocks at a time are put together and the images within them are shuffled. So every read is of whole
+        blocks, which is what slow storage (a spinning disk, a network file system, a memory-mapped file that
+        doesn't fit in memory) is good at, and only one group of indices is kept in memory.
+
+        Images in the same block always end up in the same group, so the order is less random than a full
+        shuffle. More blocks per group mixes better, smaller blocks do as well but make the reads more random.
+        The last block, if it isn't full, always goes in the last group.
+    """
+
+    def __init__(self: "BlockShuffle", blockSize: int = 1000, blocksPerGroup: int = 8, seed: int | None = None) -> None:
+        """
+            :param blockSize: The amount of images in a block.
+            :type blockSize: int
+
+            :param blocksPerGroup: The amount of blocks shuffled together.
+            :type blocksPerGroup: int
+
+            :param seed: The seed of every epoch's order. A random one is picked if None.
+            :type seed: int | None
+
+            :raises TypeError: If the block size or the blocks per group are lower than 1.
+        """
+        if blockSize < 1 or blocksPerGroup < 1:
+            raise TypeError("The block size and the blocks per group can't be lower than 1!")
+
+        super().__init__(seed)
+
+        self._blockSize: int                                 = blockSize
+        self._blocksPerGroup: int                            = blocksPerGroup
+        self._blockOrder: PermutedIndexShuffle               = PermutedIndexShuffle(self._seed)
+        self._group: tuple[int, int, int, np.ndarray] | None = None # The length, epoch, group and indices of the last group.
+
+    def NeedsRandomAccess(self) -> bool:
+        return True
+
+    def GetIndices(self, length: int, start: int, stop: int, epoch: int) -> np.ndarray:
+        """
+            See mnist.Shuffle.GetIndices.
+        """
+        start = max(0, start)
+        stop  = min(stop, length)
+
+        if stop <= start:
+            return np.zeros(0, dtype=np.int64)
+
+        groupSize: int           = self._blockSize * self._blocksPerGroup
+        groups: list[np.ndarray] = []
+
+        for group in range(start // groupSize, (stop - 1) // groupSize + 1):
+            groupStart: int = group * groupSize
+            groups.append(self._getGroup(length, group, epoch)[max(0, start - groupStart):stop - groupStart])
+
+        return groups[0].copy() if len(groups) == 1 else np.concatenate(groups)
+
+    def _getGroup(self, length: int, group: int, epoch: int) -> np.ndarray:
+        """
+            :return: The shuffled indices of the images of the group's blocks, kept until another group is needed.
+            :rtype: numpy.ndarray
+        """
+        if self._group is not None and self._group[:3] == (length, epoch, group):
+            return self._group[3]
+
+        fullBlocks: int = length // self._blockSize
+
+        # Only the full blocks are shuffled, so that every group but the last has the same size.
+        blockStart: int    = group * self._blocksPerGroup
+        blockStop: int     = min(blockStart + self._blocksPerGroup, fullBlocks)
+        blocks: np.ndarray = self._blockOrder.GetIndices(fullBlocks, blockStart, blockStop, epoch)
+
+        indices: np.ndarray = (blocks[:, np.newaxis] * self._blockSize + np.arange(self._blockSize)).reshape(-1)
+
+        if group == (length - 1) // (self._blockSize * self._blocksPerGroup):
+            indices = np.concatenate([indices, np.arange(fullBlocks * self._blockSize, length)]) # The last, partial, block.
+
+        self._createGenerator(epoch, group).shuffle(indices)
+        self._group = (length, epoch, group, indices)
+
+        return indices
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+from mnist.shuffle import Shuffle
+import numpy as np
+
+class BufferShuffle(Shuffle):
+    """
+        Shuffles a stream that can only be read in order, like a csv file. The first bufferSize items are read
+        into a buffer, then every next item replaces a random item of the buffer, which is handed out. When the
+        stream ends the rest of the buffer is handed out in a random order.
+
+        Only bufferSize items are held at a time. An item can move at most bufferSize places forward, but any
+        amount of places back, so the larger the buffer compared to the dataset the closer it is to a full shuffle.
+    """
+
+    DRAWS: int = 1024 # Random numbers drawn at once, drawing them one at a time is slow.
+
+    def __init__(self: "BufferShuffle", bufferSize: int = 10000, seed: int | None = None) -> None:
+        """
+            :param bufferSize: The amount of items held at a time.
+            :type bufferSize: int
+
+            :param seed: The seed of every epoch's order. A random one is picked if None.
+            :type seed: int | None
+
+            :raises TypeError: If the buffer size is lower than 1.
+        """
+        if bufferSize < 1:
+            raise TypeError("The buffer size can't be lower than 1!")
+
+        super().__init__(seed)
+
+        self._bufferSize: int = bufferSize
+
+    def NeedsRandomAccess(self) -> bool:
+        return False
+
+    def Stream(self, items: Iterable, epoch: int) -> Iterator:
+        """
+            See mnist.Shuffle.Stream.
+        """
+        generator: np.random.Generator = self._createGenerator(epoch)
+        buffer: list                   = []
+        draws: list[float]             = []
+
+        for item in items:
+            if len(buffer) < self._bufferSize:
+                buffer.append(item)
+                continue
+
+            if len(draws) <= 0:
+                draws = generator.random(BufferShuffle.DRAWS).tolist()
+
+            slot: int    = int(draws.pop() * self._bufferSize)
+            handedOut    = buffer[slot]
+            buffer[slot] = item
+
+            yield handedOut
+
+        generator.shuffle(buffer)
+
+        yield from buffer
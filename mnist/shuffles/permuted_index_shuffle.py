@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from mnist.shuffle import Shuffle
+import numpy as np
+
+class PermutedIndexShuffle(Shuffle):
+    """
+        A full shuffle of a dataset with random access, without storing the order. The position in the epoch
+        is mapped to an image by a random bijection: a Feistel network over the next power of 4, where positions
+        that land outside the dataset are put through the network again (cycle walking) until they land inside.
+        Every image is read exactly once per epoch and any range of positions is computed on its own, so only a
+        page of PAGE_SIZE indices is kept, where numpy.random.permutation needs 8 bytes per image.
+
+        The order is as well mixed as a shuffle needs, it's not meant to be cryptographically random.
+    """
+
+    ROUNDS: int    = 4
+    PAGE_SIZE: int = 4096 # Positions are computed this many at a time, so small batches share the cost of a numpy call.
+
+    def __init__(self: "PermutedIndexShuffle", seed: int | None = None) -> None:
+        """
+            :param seed: The seed of every epoch's order. A random one is picked if None.
+            :type seed: int | None
+        """
+        super().__init__(seed)
+
+        self._keys: tuple[int, np.ndarray] | None           = None # The epoch and the round keys of the last epoch used.
+        self._page: tuple[int, int, int, np.ndarray] | None = None # The length, epoch, first position and indices of the last page.
+
+    def NeedsRandomAccess(self) -> bool:
+        return True
+
+    def GetIndices(self, length: int, start: int, stop: int, epoch: int) -> np.ndarray:
+        """
+            See mnist.Shuffle.GetIndices.
+        """
+        start = max(0, start)
+        stop  = min(stop, length)
+
+        if stop <= start:
+            return np.zeros(0, dtype=np.int64)
+
+        pages: list[np.ndarray] = []
+
+        for page in range(start // PermutedIndexShuffle.PAGE_SIZE, (stop - 1) // PermutedIndexShuffle.PAGE_SIZE + 1):
+            pageStart: int      = page * PermutedIndexShuffle.PAGE_SIZE
+            indices: np.ndarray = self._getPage(length, pageStart, epoch)
+
+            pages.append(indices[max(0, start - pageStart):stop - pageStart])
+
+        return pages[0].copy() if len(pages) == 1 else np.concatenate(pages)
+
+    def _getPage(self, length: int, pageStart: int, epoch: int) -> np.ndarray:
+        """
+            :return: The indices of the page of positions starting at pageStart, kept until another page is needed.
+            :rtype: numpy.ndarray
+        """
+        if self._page is not None and self._page[:3] == (length, epoch, pageStart):
+            return self._page[3]
+
+        # The positions are split in two halves of halfBits each, so the domain of the network is at most 4 * length.
+        halfBits: int    = max(1, (int(length - 1).bit_length() + 1) // 2)
+        keys: np.ndarray = self._getKeys(epoch)
+
+        positions: np.ndarray = np.arange(pageStart, min(pageStart + PermutedIndexShuffle.PAGE_SIZE, length), dtype=np.uint64)
+        indices: np.ndarray   = PermutedIndexShuffle._permute(positions, halfBits, keys)
+        outside: np.ndarray   = indices >= length
+
+        while np.any(outside):
+            indices[outside] = PermutedIndexShuffle._permute(indices[outside], halfBits, keys)
+            outside          = indices >= length
+
+        self._page = (length, epoch, pageStart, indices.astype(np.int64))
+
+        return self._page[3]
+
+    def _getKeys(self, epoch: int) -> np.ndarray:
+        """
+            :return: The round keys of the epoch, kept since every batch of the epoch needs them.
+            :rtype: numpy.ndarray
+        """
+        if self._keys is None or self._keys[0] != epoch:
+            self._keys = (epoch, self._createGenerator(epoch).integers(0, 2 ** 63, size=PermutedIndexShuffle.ROUNDS, dtype=np.uint64))
+
+        return self._keys[1]
+
+    @staticmethod
+    def _permute(values: np.ndarray, halfBits: int, keys: np.ndarray) -> np.ndarray:
+        """
+            :return: The values put through the Feistel network, a bijection on 0 up to 4 ** halfBits.
+            :rtype: numpy.ndarray
+        """
+        mask: np.uint64   = np.uint64((1 << halfBits) - 1)
+        left: np.ndarray  = values >> np.uint64(halfBits)
+        right: np.ndarray = values & mask
+
+        for key in keys:
+            (left, right) = (right, left ^ (PermutedIndexShuffle._mix(right ^ key) & mask))
+
+        return (left << np.uint64(halfBits)) | right
+
+    @staticmethod
+    def _mix(values: np.ndarray) -> np.ndarray:
+        """
+            :return: The values scrambled by the splitmix64 finalizer. The multiplications wrap around on purpose.
+            :rtype: numpy.ndarray
+        """
+        values = (values ^ (values >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        values = (values ^ (values >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+
+        return values ^ (values >> np.uint64(31))
@@ -0,0 +1,125 @@
+from mnist.csv_index import CsvIndex
+from mnist.mnist_batch import MnistBatch
+from mnist.mnist_dataloader import MnistDataloader
+from pathlib import Path
+import numpy as np
+import os
+import tempfile
+import unittest
+
+class TestCsvIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        self._directory = tempfile.TemporaryDirectory()
+        self._csvPath: Path = Path(self._directory.name) / "mnist_small.csv"
+
+        self._labels: np.ndarray = np.random.randint(0, 10, size=25)
+        self._pixels: np.ndarray = np.random.randint(0, 256, size=(25, 28 * 28))
+
+        with open(self._csvPath, "w") as f:
+            for (label, pixels) in zip(self._labels, self._pixels):
+                f.write(",".join(str(val) for val in [label, *pixels]) + "\n")
+
+    def tearDown(self) -> None:
+        self._directory.cleanup()
+
+    def test_build_finds_every_row(self) -> None:
+        # Arrange:
+        with open(self._csvPath, "rb") as f:
+            lines: list[bytes] = f.read().splitlines(keepends=True)
+
+        # Act:
+        indexPath: Path = CsvIndex.Build(self._csvPath)
+        index: CsvIndex = CsvIndex(indexPath)
+
+        # Assert:
+        self.assertEqual(indexPath, CsvIndex.GetIndexPath(self._csvPath))
+        self.assertTrue(CsvIndex.IsUpToDate(self._csvPath, indexPath))
+        self.assertEqual(len(index), 25)
+        np.testing.assert_array_equal(index.GetOffsets(), np.cumsum([0, *(len(line) for line in lines)]))
+
+    def test_skips_empty_lines(self) -> None:
+        # Arrange:
+        with open(self._csvPath, "rb") as f:
+            lines: list[bytes] = f.read().splitlines()
+
+        with open(self._csvPath, "wb") as f:
+            f.write(b"\r\n\n" + b"\r\n\r\n".join(lines[:3]) + b"\n\n" + lines[3])
+
+        # Act:
+        index: CsvIndex = CsvIndex(CsvIndex.Build(self._csvPath))
+
+        with open(self._csvPath, "rb") as f:
+            rows: list[list[str]] = index.ReadRange(f, 0, len(index))
+
+        # Assert:
+        self.assertEqual(len(index), 4)
+        self.assertEqual(rows, [line.decode().split(",") for line in lines[:4]])
+
+    def test_out_of_date_when_the_csv_changes(self) -> None:
+        # Arrange:
+        indexPath: Path = CsvIndex.Build(self._csvPath)
+
+        # Act:
+        with open(self._csvPath, "a") as f:
+            f.write("1,2,3\n")
+
+        # Assert:
+        self.assertFalse(CsvIndex.IsUpToDate(self._csvPath, indexPath))
+        self.assertFalse(CsvIndex.IsUpToDate(self._csvPath, Path(self._directory.name) / "missing.index"))
+        self.assertRaises(TypeError, CsvIndex, self._csvPath)
+
+    def test_dataloader_random_access(self) -> None:
+        # Arrange:
+        loader: MnistDataloader = MnistDataloader(self._csvPath, 10)
+
+        # Act:
+        (label, image) = loader[-3]
+        contiguous: MnistBatch = loader[5:17]
+        stepped: MnistBatch    = loader[20:2:-4]
+
+        # Assert:
+        self.assertEqual(len(loader), 25)
+        self.assertTrue(CsvIndex.GetIndexPath(self._csvPath).exists())
+        self.assertEqual(label, self._labels[22])
+        np.testing.assert_array_equal(image.GetPixels(), self._pixels[22])
+        np.testing.assert_array_equal(contiguous.GetLabels(), self._labels[5:17])
+        np.testing.assert_array_equal(contiguous.GetPixels(), self._pixels[5:17])
+        np.testing.assert_array_equal(stepped.GetPixels(), self._pixels[20:2:-4])
+        self.assertRaises(IndexError, loader.__getitem__, 25)
+
+    def test_random_access_does_not_move_the_reading_position(self) -> None:
+        # Arrange:
+        loader: MnistDataloader = MnistDataloader(self._csvPath, 10)
+        loader.ReadOneBatch()
+
+        # Act:
+        loader[0:20]
+        batch: MnistBatch = loader.ReadOneBatch()
+
+        # Assert:
+        np.testing.assert_array_equal(batch.GetLabels(), self._labels[10:20])
+
+    def test_malformed_rows_are_counted_but_not_decoded(self) -> None:
+        # Arrange:
+        with open(self._csvPath, "a") as f:
+            f.write("1,2,3\n")
+
+        loader: MnistDataloader = MnistDataloader(self._csvPath, 10)
+
+        # Assert:
+        self.assertEqual(len(loader), 26)
+        self.assertEqual(len(loader[20:]), 5)
+        self.assertRaises(TypeError, loader.__getitem__, 25)
+
+    def test_cache_random_access_matches_csv(self) -> None:
+        # Arrange:
+        csvLoader: MnistDataloader   = MnistDataloader(self._csvPath)
+        cacheLoader: MnistDataloader = MnistDataloader(self._csvPath, useCache=True)
+
+        # Assert:
+        self.assertEqual(len(cacheLoader), len(csvLoader))
+        np.testing.assert_array_equal(cacheLoader[3:25:7].GetPixels(), csvLoader[3:25:7].GetPixels())
+        np.testing.assert_array_equal(cacheLoader[4][1].GetPixels(), csvLoader[4][1].GetPixels())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+from mnist.mnist_batch import MnistBatch
+from mnist.mnist_image import MnistImage
+import numpy as np
+import unittest
+
+def _createBatch(images: int, dtype: np.typing.DTypeLike = np.float64) -> MnistBatch:
+    rng: np.random.Generator = np.random.default_rng(images)
+
+    return MnistBatch(rng.integers(0, 10, size=images), rng.integers(0, 256, size=(images, 28 * 28), dtype=np.uint8), dtype)
+
+class TestMnistBatch(unittest.TestCase):
+    def test_iterates_as_data_pairs(self) -> None:
+        # Arrange:
+        batch: MnistBatch = _createBatch(5)
+
+        # Act:
+        pairs: list[tuple[int, MnistImage]] = list(batch)
+
+        # Assert:
+        self.assertEqual(len(pairs), len(batch))
+        for (row, (label, image)) in enumerate(pairs):
+            self.assertIsInstance(label, int)
+            self.assertEqual(label, batch.GetLabels()[row])
+            self.assertTrue(np.shares_memory(image.GetPixels(), batch.GetPixels())) # A view, not a copy.
+            np.testing.assert_array_equal(image.GetNormalizedPixels(), batch.GetNormalizedPixels()[row])
+
+    def test_normalized_pixels(self) -> None:
+        # Arrange:
+        batch: MnistBatch = _createBatch(4, np.float32)
+        out: np.ndarray   = np.empty((4, 28 * 28), dtype=np.float32)
+
+        # Act:
+        normalized: np.ndarray = batch.GetNormalizedPixels()
+        written: np.ndarray    = batch.GetNormalizedPixels(out=out)
+
+        # Assert:
+        self.assertEqual(normalized.dtype, np.float32)
+        self.assertIs(written, out)
+        np.testing.assert_array_equal(written, normalized)
+        np.testing.assert_array_equal(normalized, batch.GetPixels().astype(np.float32) / 255)
+
+    def test_slices_and_concatenation(self) -> None:
+        # Arrange:
+        batch: MnistBatch = _createBatch(10)
+
+        # Act:
+        joined: MnistBatch = batch[:4] + batch[4:]
+
+        # Assert:
+        self.assertIsInstance(batch[2:5], MnistBatch)
+        self.assertEqual(len(batch[2:5]), 3)
+        np.testing.assert_array_equal(joined.GetLabels(), batch.GetLabels())
+        np.testing.assert_array_equal(joined.GetPixels(), batch.GetPixels())
+
+    def test_from_pairs_and_empty(self) -> None:
+        # Arrange:
+        pairs: list[tuple[int, MnistImage]] = [(3, MnistImage([300] * (28 * 28))), (7, MnistImage([5] * (28 * 28)))]
+
+        # Act:
+        batch: MnistBatch = MnistBatch.FromPairs(pairs)
+        empty: MnistBatch = MnistBatch.FromPairs([])
+
+        # Assert:
+        np.testing.assert_array_equal(batch.GetLabels(), [3, 7])
+        self.assertEqual(batch.GetPixels().dtype, np.uint8)
+        self.assertEqual(int(batch.GetPixels()[0, 0]), 255)
+        self.assertEqual(len(empty), 0)
+        self.assertFalse(empty)
+
+    def test_wrong_shape(self) -> None:
+        # Assert:
+        self.assertRaises(TypeError, MnistBatch, np.zeros(2), np.zeros((3, 28 * 28)))
+        self.assertRaises(TypeError, MnistBatch, np.zeros(2), np.zeros((2, 100)))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+from mnist.mnist_cache import MnistCache
+from mnist.mnist_dataloader import MnistDataloader
+from pathlib import Path
+import numpy as np
+import tempfile
+import unittest
+
+class TestCacheConversion(unittest.TestCase):
+    def setUp(self) -> None:
+        self._directory = tempfile.TemporaryDirectory()
+        self._csvPath: Path = Path(self._directory.name) / "mnist_small.csv"
+
+        self._labels: np.ndarray = np.random.randint(0, 10, size=25)
+        self._pixels: np.ndarray = np.random.randint(0, 256, size=(25, 28 * 28))
+
+        with open(self._csvPath, "w") as f:
+            for (label, pixels) in zip(self._labels, self._pixels):
+                f.write(",".join(str(val) for val in [label, *pixels]) + "\n")
+
+    def tearDown(self) -> None:
+        self._directory.cleanup()
+
+    def test_convert_round_trip(self) -> None:
+        # Act:
+        cachePath: Path   = MnistCache.Convert(self._csvPath)
+        cache: MnistCache = MnistCache(cachePath)
+
+        # Assert:
+        self.assertTrue(MnistCache.IsCacheFile(cachePath))
+        self.assertTrue(MnistCache.IsUpToDate(self._csvPath, cachePath))
+        self.assertEqual(len(cache), 25)
+        np.testing.assert_array_equal(cache.GetLabels(), self._labels)
+        np.testing.assert_array_equal(cache.GetPixels(), self._pixels)
+
+    def test_skips_malformed_rows(self) -> None:
+        # Arrange:
+        with open(self._csvPath, "a") as f:
+            f.write("1,2,3\n")
+
+        # Act:
+        cache: MnistCache = MnistCache(MnistCache.Convert(self._csvPath))
+
+        # Assert:
+        self.assertEqual(len(cache), 25)
+
+    def test_not_a_cache_file(self) -> None:
+        # Assert:
+        self.assertFalse(MnistCache.IsCacheFile(self._csvPath))
+        self.assertRaises(TypeError, MnistCache, self._csvPath)
+
+    def test_dataloader_reads_same_images_from_cache(self) -> None:
+        # Arrange:
+        csvLoader: MnistDataloader   = MnistDataloader(self._csvPath, 10)
+        cacheLoader: MnistDataloader = MnistDataloader(self._csvPath, 10, useCache=True)
+
+        # Act:
+        csvPairs: list[MnistDataloader.DataPair]   = csvLoader.ReadOneBatch() + csvLoader.ReadOneBatch() + csvLoader.ReadOneBatch()
+        cachePairs: list[MnistDataloader.DataPair] = cacheLoader.ReadOneBatch() + cacheLoader.ReadOneBatch() + cacheLoader.ReadOneBatch()
+
+        # Assert:
+        self.assertEqual(len(cachePairs), 25)
+        self.assertEqual(len(cacheLoader.ReadOneBatch()), 0)
+        for ((csvLabel, csvImage), (cacheLabel, cacheImage)) in zip(csvPairs, cachePairs):
+            self.assertEqual(csvLabel, cacheLabel)
+            np.testing.assert_array_equal(csvImage.GetNormalizedPixels(), cacheImage.GetNormalizedPixels())
+
+    def test_read_arrays_from_csv_and_cache(self) -> None:
+        for useCache in (False, True):
+            # Arrange:
+            loader: MnistDataloader = MnistDataloader(self._csvPath, 10, useCache=useCache)
+
+            # Act:
+            (labels, pixels) = loader.ReadArrays(20)
+            (restLabels, _)  = loader.ReadArrays(20)
+            (endLabels, _)   = loader.ReadArrays(20)
+
+            # Assert:
+            np.testing.assert_array_equal(labels, self._labels[:20])
+            np.testing.assert_allclose(pixels, self._pixels[:20] / 255.0)
+            self.assertEqual(len(restLabels), 5)
+            self.assertEqual(len(endLabels), 0)
+
+    def test_shuffled_cache_reads_every_image_each_epoch(self) -> None:
+        # Arrange:
+        loader: MnistDataloader = MnistDataloader(self._csvPath, 7, shuffle=True, useCache=True)
+
+        for _ in range(2):
+            # Act:
+            labels: list[int] = []
+            while True:
+                batch: list[MnistDataloader.DataPair] = loader.ReadOneBatch()
+
+                if len(batch) <= 0:
+                    break
+
+                labels += [label for (label, _) in batch]
+
+            loader.Reset()
+
+            # Assert:
+            self.assertEqual(sorted(labels), sorted(self._labels.tolist()))
+
+if __name__ == "__main__":
+    unittest.main()
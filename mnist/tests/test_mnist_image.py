@@ -1,5 +1,6 @@
 from mnist.mnist_image import MnistImage
 import unittest
+import numpy
 import random
 
 class TestImageInitialization(unittest.TestCase):
@@ -23,5 +24,17 @@ class TestImageFunctionality(unittest.TestCase):
         # Assert:
         self.assertTrue(all(0 <= x <= 1 for x in image.GetNormalizedPixels()), msg="Not all values were normalized!")
 
+    def test_pixels_are_stored_as_uint8(self) -> None:
+        # Arrange:
+        imageData: list[int] = [random.randint(-50, 300) for x in range(28 * 28)]
+
+        # Act:
+        image: MnistImage = MnistImage(imageData)
+
+        # Assert:
+        self.assertEqual(image.GetPixels().dtype, numpy.uint8)
+        numpy.testing.assert_array_equal(image.GetPixels(), numpy.clip(imageData, 0, 255))
+        self.assertFalse(hasattr(image, "__dict__"), msg="Images should only have their slots!")
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,80 @@
+from mnist.mnist_dataloader import MnistDataloader
+from mnist.prefetch_dataloader import PrefetchDataloader, PrefetchStats
+from pathlib import Path
+import numpy as np
+import tempfile
+import unittest
+
+class TestPrefetchDataloader(unittest.TestCase):
+    def setUp(self) -> None:
+        self._directory = tempfile.TemporaryDirectory()
+        self._csvPath: Path = Path(self._directory.name) / "mnist_small.csv"
+
+        with open(self._csvPath, "w") as f:
+            for label in range(53):
+                pixels: np.ndarray = np.random.randint(0, 256, size=28 * 28)
+                f.write(",".join(str(val) for val in [label % 10, *pixels]) + "\n")
+
+    def tearDown(self) -> None:
+        self._directory.cleanup()
+
+    def _readAll(self, loader) -> list[list[MnistDataloader.DataPair]]:
+        batches: list[list[MnistDataloader.DataPair]] = []
+
+        while True:
+            batch: list[MnistDataloader.DataPair] = loader.ReadOneBatch()
+
+            if len(batch) <= 0:
+                return batches
+
+            batches.append(batch)
+
+    def _assertSameBatches(self, expected: list, actual: list) -> None:
+        self.assertEqual(len(expected), len(actual))
+
+        for (expectedBatch, actualBatch) in zip(expected, actual):
+            self.assertEqual([label for (label, _) in expectedBatch], [label for (label, _) in actualBatch])
+
+            for ((_, expectedImage), (_, actualImage)) in zip(expectedBatch, actualBatch):
+                np.testing.assert_array_equal(expectedImage.GetPixels(), actualImage.GetPixels())
+
+    def test_same_batches_in_same_order(self) -> None:
+        for workers in (1, 3):
+            # Arrange:
+            expected: list = self._readAll(MnistDataloader(self._csvPath, 5))
+
+            # Act:
+            with PrefetchDataloader(MnistDataloader(self._csvPath, 5), depth=2, workers=workers) as prefetcher:
+                actual: list = self._readAll(prefetcher)
+                afterEnd: list[MnistDataloader.DataPair] = prefetcher.ReadOneBatch()
+
+            # Assert:
+            self._assertSameBatches(expected, actual)
+            self.assertEqual(len(afterEnd), 0)
+
+    def test_reset_starts_over(self) -> None:
+        # Arrange:
+        prefetcher: PrefetchDataloader = PrefetchDataloader(MnistDataloader(self._csvPath, 5, useCache=True), depth=3, workers=2)
+
+        # Act:
+        first: list = self._readAll(prefetcher)
+        prefetcher.Reset()
+        prefetcher.ReadOneBatch() # Stop part way into the data.
+        prefetcher.Reset()
+        second: list = self._readAll(prefetcher)
+        stats: PrefetchStats = prefetcher.GetStats()
+        prefetcher.Close()
+
+        # Assert:
+        self._assertSameBatches(first, second)
+        self.assertEqual(stats.batchesServed, 2 * len(first) + 1)
+        self.assertLessEqual(stats.GetAverageOccupancy(), 3)
+        self.assertRaises(RuntimeError, prefetcher.ReadOneBatch)
+
+    def test_wrong_arguments(self) -> None:
+        # Assert:
+        self.assertRaises(TypeError, PrefetchDataloader, MnistDataloader(self._csvPath, 5), 0)
+        self.assertRaises(TypeError, PrefetchDataloader, MnistDataloader(self._csvPath, 5), 2, 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+from mnist.preprocessor import Preprocessor
+import numpy as np
+import unittest
+
+def _drawStroke(top: int, left: int, height: int, width: int) -> np.ndarray:
+    image: np.ndarray = np.zeros((28, 28))
+    image[top:top + height, left:left + width] = 1.0
+
+    return image
+
+def _centerOfMass(image: np.ndarray) -> tuple[float, float]:
+    image = image.reshape(28, 28)
+    mass: float = np.sum(image)
+
+    return (float(np.sum(image, axis=1) @ np.arange(28) / mass), float(np.sum(image, axis=0) @ np.arange(28) / mass))
+
+class TestPreprocessorSteps(unittest.TestCase):
+    def test_blur_matches_the_stencil(self) -> None:
+        # Arrange:
+        images: np.ndarray = np.zeros((1, 5, 5))
+        images[0, 2, 2]    = 0.8
+
+        # Act:
+        blurred: np.ndarray = Preprocessor.Blur(images)[0]
+
+        # Assert:
+        expected: np.ndarray = np.zeros((5, 5))
+        expected[2, 2]       = 0.4
+        expected[1, 2] = expected[3, 2] = expected[2, 1] = expected[2, 3] = 0.1
+        np.testing.assert_allclose(blurred, expected)
+
+    def test_bounding_boxes(self) -> None:
+        # Arrange:
+        images: np.ndarray = np.stack([_drawStroke(3, 5, 10, 2), np.zeros((28, 28))])
+
+        # Act:
+        boxes: np.ndarray = Preprocessor.GetBoundingBoxes(images)
+
+        # Assert:
+        np.testing.assert_array_equal(boxes, [[3, 12, 5, 6], [0, 27, 0, 27]])
+
+    def test_resize_keeps_the_aspect_ratio(self) -> None:
+        # Arrange:
+        images: np.ndarray = _drawStroke(0, 0, 10, 5)[np.newaxis]
+
+        # Act:
+        resized: np.ndarray = Preprocessor.CropAndResize(images, Preprocessor.GetBoundingBoxes(images))[0]
+
+        # Assert:
+        self.assertEqual(resized.shape, (20, 20))
+        np.testing.assert_allclose(resized[1:19, 6:14], 1.0) # The longest side fills the box, the other half of it. Only the edges are blended.
+        np.testing.assert_allclose(resized[:, :4], 0.0)
+        np.testing.assert_allclose(resized[:, 16:], 0.0)
+
+class TestPreprocessorProcess(unittest.TestCase):
+    def test_digit_is_scaled_and_centered(self) -> None:
+        # Arrange:
+        image: np.ndarray = _drawStroke(1, 2, 6, 3) # Small and in the top left corner.
+
+        # Act:
+        processed: np.ndarray = Preprocessor().Process(image.reshape(-1))
+
+        # Assert:
+        boxes: np.ndarray = Preprocessor.GetBoundingBoxes(processed.reshape(1, 28, 28), 0.05)[0]
+        self.assertEqual(processed.shape, (28 * 28,))
+        self.assertEqual(boxes[1] - boxes[0] + 1, 20)
+        np.testing.assert_allclose(_centerOfMass(processed), (13.5, 13.5), atol=0.5)
+
+    def test_shifted_digits_give_the_same_image(self) -> None:
+        # Arrange:
+        images: np.ndarray = np.stack([_drawStroke(2, 3, 12, 4), _drawStroke(14, 20, 12, 4)])
+
+        # Act:
+        processed: np.ndarray = Preprocessor().Process(images)
+
+        # Assert:
+        self.assertEqual(processed.shape, (2, 28 * 28))
+        np.testing.assert_allclose(processed[0], processed[1])
+
+    def test_batch_matches_single_images(self) -> None:
+        # Arrange:
+        rng: np.random.Generator = np.random.default_rng(3)
+        images: np.ndarray       = (rng.random((8, 28 * 28)) * (rng.random((8, 28 * 28)) > 0.9)).astype(np.float32)
+        preprocessor: Preprocessor = Preprocessor()
+
+        # Act:
+        batch: np.ndarray = preprocessor.Process(images)
+
+        # Assert:
+        self.assertEqual(batch.dtype, np.float32)
+        for (image, processed) in zip(images, batch):
+            np.testing.assert_allclose(preprocessor.Process(image), processed)
+
+    def test_empty_image_stays_empty(self) -> None:
+        # Act:
+        processed: np.ndarray = Preprocessor().Process(np.zeros((28, 28), dtype=np.uint8))
+
+        # Assert:
+        self.assertEqual(processed.dtype, np.float64)
+        self.assertFalse(np.any(processed))
+
+    def test_wrong_shape_raises(self) -> None:
+        # Assert:
+        self.assertRaises(TypeError, Preprocessor().Process, np.zeros(100))
+        self.assertRaises(TypeError, Preprocessor().Process, np.zeros((2, 100)))
+        self.assertRaises(TypeError, Preprocessor, threshold=1.0)
+
+if __name__ == "__main__":
+    unittest.main()
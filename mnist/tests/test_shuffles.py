@@ -0,0 +1,133 @@
+from mnist.mnist_dataloader import MnistDataloader
+from mnist.shuffle import Shuffle
+from mnist.shuffles.block_shuffle import BlockShuffle
+from mnist.shuffles.buffer_shuffle import BufferShuffle
+from mnist.shuffles.permuted_index_shuffle import PermutedIndexShuffle
+from pathlib import Path
+import numpy as np
+import tempfile
+import unittest
+
+class TestIndexShuffles(unittest.TestCase):
+    def _shuffles(self) -> list[Shuffle]:
+        return [PermutedIndexShuffle(seed=1), BlockShuffle(blockSize=10, blocksPerGroup=3, seed=1)]
+
+    def test_every_index_once(self) -> None:
+        for shuffle in self._shuffles():
+            for length in (1, 2, 29, 30, 31, 1000, 4097):
+                # Act:
+                indices: np.ndarray = shuffle.GetIndices(length, 0, length, 0)
+
+                # Assert:
+                np.testing.assert_array_equal(np.sort(indices), np.arange(length), err_msg=f"{type(shuffle).__name__} of {length}")
+
+    def test_ranges_match_the_whole_epoch(self) -> None:
+        for shuffle in self._shuffles():
+            # Arrange:
+            epoch: np.ndarray = shuffle.GetIndices(5000, 0, 5000, 3)
+
+            # Act:
+            batches: np.ndarray = np.concatenate([shuffle.GetIndices(5000, start, start + 7, 3) for start in range(0, 5000, 7)])
+
+            # Assert:
+            np.testing.assert_array_equal(batches, epoch)
+
+    def test_reproducible_per_epoch(self) -> None:
+        for (shuffle, same) in zip(self._shuffles(), [PermutedIndexShuffle(seed=1), BlockShuffle(blockSize=10, blocksPerGroup=3, seed=1)]):
+            # Act:
+            first: np.ndarray  = shuffle.GetIndices(1000, 0, 1000, 0)
+            second: np.ndarray = shuffle.GetIndices(1000, 0, 1000, 1)
+
+            # Assert:
+            np.testing.assert_array_equal(first, same.GetIndices(1000, 0, 1000, 0))
+            self.assertFalse(np.array_equal(first, second))
+            self.assertFalse(np.array_equal(first, np.arange(1000)))
+
+    def test_block_shuffle_keeps_blocks_in_their_group(self) -> None:
+        # Arrange:
+        shuffle: BlockShuffle = BlockShuffle(blockSize=10, blocksPerGroup=2, seed=5)
+
+        # Act:
+        indices: np.ndarray = shuffle.GetIndices(100, 0, 100, 0)
+
+        # Assert:
+        for group in range(5):
+            blocks: np.ndarray = np.unique(indices[group * 20:(group + 1) * 20] // 10)
+            self.assertEqual(len(blocks), 2)
+
+    def test_index_shuffles_cant_stream(self) -> None:
+        # Assert:
+        self.assertRaises(NotImplementedError, lambda: list(PermutedIndexShuffle().Stream(range(10), 0)))
+
+class TestBufferShuffle(unittest.TestCase):
+    def test_every_item_once_and_reproducible(self) -> None:
+        # Arrange:
+        shuffle: BufferShuffle = BufferShuffle(bufferSize=16, seed=2)
+
+        # Act:
+        first: list[int]  = list(shuffle.Stream(range(500), 0))
+        again: list[int]  = list(BufferShuffle(bufferSize=16, seed=2).Stream(range(500), 0))
+        second: list[int] = list(shuffle.Stream(range(500), 1))
+
+        # Assert:
+        self.assertEqual(sorted(first), list(range(500)))
+        self.assertEqual(first, again)
+        self.assertNotEqual(first, second)
+        self.assertNotEqual(first, list(range(500)))
+
+    def test_stream_shorter_than_the_buffer(self) -> None:
+        # Act:
+        items: list[int] = list(BufferShuffle(bufferSize=100, seed=0).Stream(range(10), 0))
+
+        # Assert:
+        self.assertEqual(sorted(items), list(range(10)))
+
+    def test_buffer_shuffle_cant_index(self) -> None:
+        # Assert:
+        self.assertRaises(NotImplementedError, BufferShuffle().GetIndices, 10, 0, 10, 0)
+        self.assertRaises(TypeError, BufferShuffle, 0)
+
+class TestShuffledDataloader(unittest.TestCase):
+    def setUp(self) -> None:
+        self._directory = tempfile.TemporaryDirectory()
+        self._csvPath: Path = Path(self._directory.name) / "mnist_small.csv"
+
+        # Every image's pixels are its row number, so the order can be read back from the pixels.
+        with open(self._csvPath, "w") as f:
+            for row in range(50):
+                f.write(",".join(str(val) for val in [row % 10, *([row] * (28 * 28))]) + "\n")
+
+    def tearDown(self) -> None:
+        self._directory.cleanup()
+
+    def _readEpoch(self, loader: MnistDataloader) -> list[int]:
+        rows: list[int] = []
+
+        while len(batch := loader.ReadOneBatch()) > 0:
+            rows += batch.GetPixels()[:, 0].tolist()
+
+        loader.Reset()
+
+        return rows
+
+    def test_shuffles_csv_and_cache(self) -> None:
+        for (shuffle, useCache) in ((BufferShuffle(bufferSize=8, seed=4), False), (PermutedIndexShuffle(seed=4), True),
+                                    (BlockShuffle(blockSize=5, blocksPerGroup=2, seed=4), True), (BufferShuffle(bufferSize=8, seed=4), True),
+                                    (PermutedIndexShuffle(seed=4), False), (BlockShuffle(blockSize=5, blocksPerGroup=2, seed=4), False)):
+            # Arrange:
+            loader: MnistDataloader = MnistDataloader(self._csvPath, 7, shuffle=shuffle, useCache=useCache)
+
+            # Act:
+            first: list[int]  = self._readEpoch(loader)
+            second: list[int] = self._readEpoch(loader)
+            loader.SetEpoch(0)
+            repeated: list[int] = self._readEpoch(loader)
+
+            # Assert:
+            self.assertEqual(sorted(first), list(range(50)))
+            self.assertEqual(sorted(second), list(range(50)))
+            self.assertNotEqual(first, second)
+            self.assertEqual(first, repeated)
+
+if __name__ == "__main__":
+    unittest.main()
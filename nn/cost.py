@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+from nn.layer import Layer
+from nn.workspace import Workspace
 import numpy as np
 
-class Cost:
+class Cost(Workspace):
     """
         The cost class is a base class for all cost functions. It's purpose is to
-        evaluate how bad the model did for a specific test subject.
+        evaluate how bad the model did for a specific test subject. Like layers, the derivatives
+        returned for a batch are buffers owned by the cost function which the next batch overwrites.
     """
 
     def __init__(self: "Cost"):
@@ -14,7 +17,7 @@ class Cost:
         """
         self._size: int | None = None
 
-    def ComputeCost(self, inputs: np.ndarray, expected: np.ndarray, learningRate: float) -> tuple[np.ndarray, float]:
+    def ComputeCost(self, inputs: np.ndarray, expected: np.ndarray) -> tuple[np.ndarray, float]:
         """
             Should be implemented by another class and should compute the total cost
             as well as the derivative.
@@ -26,11 +29,49 @@ class Cost:
             :param expected: The expected input.
             :type expected: numpy.ndarray
 
-            :param learningRate: The scalar of the cost.
-            :type learningRate: float
-
             :return: The local derivatives in terms of the input together with the total cost: (derivatives, cost).
             :rtype: tuple[numpy.ndarray, float]
         """
 
-        raise NotImplementedError("Can't use the Cost class own ComputeCost!")
\ No newline at end of file
+        raise NotImplementedError("Can't use the Cost class own ComputeCost!")
+
+    def GetConfig(self) -> dict:
+        """
+            Gets the arguments the cost function was created with, so that it can be created again when
+            loading a saved network (see nn.ModelFile).
+
+            :return: The keyword arguments of the constructor. Only json values.
+            :rtype: dict
+        """
+        return {"inputs": self._size}
+
+    def FusesWith(self, layer: Layer) -> bool:
+        """
+            Tells if this cost function can be fused with the given last layer of a network. When fused, the
+            network computes the derivatives in terms of the last layer's inputs with ComputeFusedCost and
+            skips that layer's backward pass.
+
+            :param layer: The last layer of the network.
+            :type layer: nn.Layer
+
+            :return: True if the cost and the layer can be fused.
+            :rtype: bool
+        """
+        return False
+
+    def ComputeFusedCost(self, inputs: np.ndarray, expected: np.ndarray) -> tuple[np.ndarray, float]:
+        """
+            Like ComputeCost, but the returned derivatives are in terms of the inputs of the last layer that
+            this cost was fused with (see FusesWith), instead of in terms of the outputs.
+
+            :param inputs: The output of the fused last layer, to be evaluated against the expected.
+            :type inputs: numpy.ndarray
+
+            :param expected: The expected input.
+            :type expected: numpy.ndarray
+
+            :return: The derivatives in terms of the last layer's inputs together with the total cost: (derivatives, cost).
+            :rtype: tuple[numpy.ndarray, float]
+        """
+
+        raise NotImplementedError("This cost function can't be fused with a layer!")
\ No newline at end of file
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import numpy as np
+from nn.cost import Cost
+from nn.layer import Layer
+from nn.layers.softmax import Softmax
+
+class CrossEntropy(Cost):
+    """
+        The cross entropy class evaluates a model that outputs probabilities, by looking at how
+        much probability it gave to the expected class. It's meant to be used after a softmax layer,
+        since the two together have a very simple derivative (see ComputeFusedCost).
+    """
+
+    # Smallest probability used when taking the logarithm, so that log(0) never happens.
+    EPSILON: float = 1e-12
+
+    def __init__(self: "CrossEntropy", inputs: int):
+        """
+            :param inputs: Total amount of inputs going into this cost function.
+        """
+        self._size: int = inputs
+
+    def ComputeCost(self, inputs: np.ndarray, expected: np.ndarray) -> tuple[np.ndarray, float]:
+        """
+            The cross entropy function: ce(inputs, expected) = -sum(expected * log(inputs)). Since expected is one hot
+            encoded, it's just -log(probability of the expected class).
+
+            The inputs and expected can also be batches of shape (batch, inputs). The derivatives are then computed
+            per row and the returned cost is the sum of every row's cost.
+
+            :param inputs: The probabilities of which to be evaluated against the expected probabilities.
+            :type inputs: numpy.ndarray
+
+            :param expected: The expected probabilities.
+            :type expected: numpy.ndarray
+
+            :return: The derivatives and the cost as a tuple: (derivatives, cost).
+            :rtype: tuple[numpy.ndarray, float]
+        """
+        self._checkSizes(inputs, expected)
+
+        if np.ndim(inputs) == 1:
+            clipped: np.ndarray = np.clip(inputs, CrossEntropy.EPSILON, 1.0)
+
+            # dce / dinput = -expected / input.
+            derivatives: np.ndarray = -expected / clipped
+        else:
+            # The same for a batch, computed inside the cost function's buffer.
+            derivatives: np.ndarray = self._buffer("derivatives", np.shape(inputs), np.result_type(inputs, expected, np.float16))
+
+            np.clip(inputs, CrossEntropy.EPSILON, 1.0, out=derivatives)
+            np.divide(expected, derivatives, out=derivatives)
+            np.negative(derivatives, out=derivatives)
+
+        return (derivatives, self._crossEntropy(inputs, expected))
+
+    def FusesWith(self, layer: Layer) -> bool:
+        """
+            :return: True if the layer is a softmax layer.
+            :rtype: bool
+        """
+        return isinstance(layer, Softmax)
+
+    def ComputeFusedCost(self, inputs: np.ndarray, expected: np.ndarray) -> tuple[np.ndarray, float]:
+        """
+            Computes the cross entropy of the softmax outputs, but returns the derivatives in terms of the softmax
+            inputs (the logits). Taking the softmax jacobian times -expected / probabilities and simplifying, using
+            that the expected values sum up to 1, everything cancels out except for: probabilities - expected.
+            So neither the jacobian nor the division is needed.
+
+            :param inputs: The probabilities computed by the softmax layer.
+            :type inputs: numpy.ndarray
+
+            :param expected: The expected probabilities.
+            :type expected: numpy.ndarray
+
+            :return: The derivatives in terms of the softmax inputs and the cost as a tuple: (derivatives, cost).
+            :rtype: tuple[numpy.ndarray, float]
+        """
+        self._checkSizes(inputs, expected)
+
+        if np.ndim(inputs) == 1:
+            derivatives: np.ndarray = inputs - expected
+        else:
+            derivatives: np.ndarray = np.subtract(inputs, expected, out=self._buffer("fusedDerivatives", np.shape(inputs), np.result_type(inputs, expected, np.float16)))
+
+        return (derivatives, self._crossEntropy(inputs, expected))
+
+    def _crossEntropy(self, probabilities: np.ndarray, expected: np.ndarray) -> float:
+        """
+            :return: The cross entropy, summed over all rows if it's a batch.
+            :rtype: float
+        """
+        if np.ndim(probabilities) == 1:
+            return float(-np.sum(expected * np.log(np.clip(probabilities, CrossEntropy.EPSILON, 1.0))))
+
+        logarithms: np.ndarray = self._buffer("logarithms", np.shape(probabilities), np.result_type(probabilities, np.float16))
+
+        np.clip(probabilities, CrossEntropy.EPSILON, 1.0, out=logarithms)
+        np.log(logarithms, out=logarithms)
+
+        return float(-np.vdot(expected, logarithms))
+
+    def _checkSizes(self, inputs: np.ndarray, expected: np.ndarray) -> None:
+        if np.shape(inputs)[-1] != self._size:
+            raise RuntimeError("The inputs for computing the cost using cross entropy is not of the correct size!")
+
+        if np.shape(expected) != np.shape(inputs):
+            raise RuntimeError("The expected for computing the cost using cross entropy is not of the correct size!")
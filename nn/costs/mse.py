@@ -14,36 +14,45 @@ class Mse(Cost):
         """
         self._size: int = inputs
 
-    def ComputeCost(self, inputs: np.ndarray, expected: np.ndarray, learningRate: float) -> tuple[np.ndarray, float]:
+    def ComputeCost(self, inputs: np.ndarray, expected: np.ndarray) -> tuple[np.ndarray, float]:
         """
             The mean square error function: mse(inputs, expected) = (1 / len(inputs)) * sum((inputs - expected) ** 2).
 
+            The inputs and expected can also be batches of shape (batch, inputs). The derivatives are then computed
+            per row and the returned cost is the sum of every row's cost.
+
             :param inputs: The inputs of which to be evaluated against the expected inputs.
             :type inputs: numpy.ndarray
 
             :param expected: The expected inputs.
             :type expected: numpy.ndarray
 
-            :param learningRate: The scalar for the cost.
-            :type learningRate: float
-
             :return: The derivatives and the cost as a tuple: (derivatives, cost).
             :rtype: tuple[numpy.ndarray, float]
         """
-        if len(inputs) != self._size:
+        if np.shape(inputs)[-1] != self._size:
             raise RuntimeError("The inputs for computing the cost using MSE is not of the correct size!")
         
-        if len(expected) != self._size:
+        if np.shape(expected) != np.shape(inputs):
             raise RuntimeError("The expected for computing the cost using MSE is not of the correct size!")
         
-        if learningRate <= 0:
-            raise RuntimeError("Learning rate has to be bigger than 0!")
-        
-        inputCount: int = len(inputs)
+        inputCount: int = self._size
+
+        if np.ndim(inputs) == 1:
+            meanSquareError: float = (1 / inputCount) * np.sum(np.pow((inputs - expected), 2))
+
+            # This is derived by taking dMSE(input) / dinput!
+            derivatives: np.ndarray = 2 * (inputs - expected) / inputCount
+
+            return (derivatives, meanSquareError)
+
+        # For a batch, the same is computed inside the cost function's buffers.
+        dtype: np.dtype = np.result_type(inputs, expected, np.float16)
+        difference: np.ndarray = np.subtract(inputs, expected, out=self._buffer("difference", np.shape(inputs), dtype))
 
-        meanSquareError: float = (1 / inputCount) * np.sum(np.pow((inputs - expected), 2))
+        # Summed over all rows, since each row's mean square error is added up.
+        meanSquareError: float = (1 / inputCount) * float(np.vdot(difference, difference))
 
-        # This is derived by taking dMSE(input) / dinput!
-        derivatives: np.ndarray = 2 * (inputs - expected) / inputCount
+        derivatives: np.ndarray = np.multiply(difference, 2 / inputCount, out=self._buffer("derivatives", np.shape(inputs), dtype))
 
-        return (derivatives, meanSquareError * learningRate)
\ No newline at end of file
+        return (derivatives, meanSquareError)
\ No newline at end of file
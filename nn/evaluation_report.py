@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+class EvaluationReport():
+    """
+        The result of evaluating a network on a dataset (see Network.EvaluateReport).
+    """
+
+    def __init__(self: "EvaluationReport", correct: int, total: int, seconds: float) -> None:
+        """
+            :param correct: The amount of correctly classified images.
+            :type correct: int
+
+            :param total: The amount of evaluated images.
+            :type total: int
+
+            :param seconds: The wall time the evaluation took, in seconds.
+            :type seconds: float
+        """
+        self.correct: int   = correct
+        self.total: int     = total
+        self.seconds: float = seconds
+
+    def GetAccuracy(self) -> float:
+        """
+            :return: The accuracy, from 0 to 1.
+            :rtype: float
+        """
+        return self.correct / self.total if self.total > 0 else 0.0
+
+    def GetThroughput(self) -> float:
+        """
+            :return: The amount of images evaluated per second.
+            :rtype: float
+        """
+        return self.total / self.seconds if self.seconds > 0 else 0.0
+
+    def __repr__(self) -> str:
+        return (f"EvaluationReport(accuracy={self.GetAccuracy():.4f}, correct={self.correct}, total={self.total}, "
+                f"seconds={self.seconds:.3f}, imagesPerSecond={self.GetThroughput():.1f})")
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+from nn.layer import Layer
+from nn.layers.dense import Dense
+from nn.layers.relu import Relu
+from nn.layers.softmax import Softmax
+import numpy as np
+
+class FrozenNetwork():
+    """
+        A trained network compiled for inference only (see nn.Network.Freeze). The layers are turned into a
+        short list of steps when freezing, instead of being walked through every call:
+
+        * A Dense layer followed by a Relu becomes one step, where the bias is added and the ReLU applied in
+          place on the matrix multiplication's output, so no array is created for them.
+        * The weights are stored transposed and contiguous, of shape (input, output), so a batch of rows is
+          multiplied without numpy having to handle a transposed view first.
+        * Nothing is remembered for a backward pass, and the weights are copies that can't be written to.
+        * Predict skips a final Softmax, since it doesn't change which output is the largest.
+
+        Layers that can't be folded are computed with their own Infer. A frozen network can't be changed or
+        trained, freeze the network again after training it more. Like nn.Network.Compute, it can be used
+        from several threads at once.
+    """
+
+    # What a step does, see _createSteps.
+    _DENSE: str   = "dense"
+    _RELU: str    = "relu"
+    _SOFTMAX: str = "softmax"
+    _LAYER: str   = "layer"
+
+    def __init__(self: "FrozenNetwork", layers: list[Layer]) -> None:
+        """
+            :param layers: The layers of the trained network, in order. Their weights are copied.
+            :type layers: list[nn.Layer]
+        """
+        if len(layers) <= 0:
+            raise RuntimeError("A network can't have 0 layers!")
+
+        object.__setattr__(self, "_size", (layers[0].GetInputSize(), layers[-1].GetOutputSize()))
+        object.__setattr__(self, "_dtype", layers[0].GetDtype())
+        object.__setattr__(self, "_steps", FrozenNetwork._createSteps(layers))
+
+        # The final softmax is kept apart, so that Predict can leave it out.
+        endsWithSoftmax: bool = len(self._steps) > 1 and self._steps[-1][0] == FrozenNetwork._SOFTMAX
+        object.__setattr__(self, "_predictSteps", self._steps[:-1] if endsWithSoftmax else self._steps)
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise RuntimeError("A frozen network can't be changed, freeze the network again instead!")
+
+    @staticmethod
+    def _createSteps(layers: list[Layer]) -> tuple[tuple, ...]:
+        """
+            Folds the layers into steps: (dense, weights, bias, relu), (relu,), (softmax,) or (layer, layer).
+
+            :return: The steps, in order.
+            :rtype: tuple[tuple, ...]
+        """
+        steps: list[tuple] = []
+
+        for layer in layers:
+            previous: tuple | None = steps[-1] if len(steps) > 0 else None
+
+            if type(layer) is Dense:
+                weights: dict[str, np.ndarray] = layer.GetWeights()
+
+                transposed: np.ndarray    = FrozenNetwork._readOnly(np.transpose(weights["weights"]))
+                bias: np.ndarray | None   = FrozenNetwork._readOnly(weights["bias"]) if "bias" in weights else None
+                steps.append((FrozenNetwork._DENSE, transposed, bias, False))
+            elif type(layer) is Relu and previous is not None and previous[0] == FrozenNetwork._DENSE:
+                steps[-1] = (*previous[:3], True) # Applied in place on the dense output. A second ReLU changes nothing.
+            elif type(layer) is Relu and previous is not None and previous[0] == FrozenNetwork._RELU:
+                pass # ReLU of a ReLU changes nothing.
+            elif type(layer) is Relu:
+                steps.append((FrozenNetwork._RELU,))
+            elif type(layer) is Softmax:
+                steps.append((FrozenNetwork._SOFTMAX,))
+            else:
+                steps.append((FrozenNetwork._LAYER, layer))
+
+        return tuple(steps)
+
+    @staticmethod
+    def _readOnly(array: np.ndarray) -> np.ndarray:
+        copy: np.ndarray = np.ascontiguousarray(array).copy()
+        copy.flags.writeable = False
+
+        return copy
+
+    def Compute(self, inputs: np.ndarray) -> np.ndarray:
+        """
+            Computes the outputs, the same as nn.Network.Compute of the network it was frozen from.
+
+            :param inputs: The inputs to evaluate. Either one vector or a batch matrix of shape (batch, inputs).
+            :type inputs: numpy.ndarray
+
+            :return: The output of the model, one row per sample if a batch was given.
+            :rtype: numpy.ndarray
+        """
+        return self._run(self._steps, inputs)
+
+    def Predict(self, inputs: np.ndarray) -> int | np.ndarray:
+        """
+            Computes which output is the largest (ex: the digit), without the final softmax.
+
+            :param inputs: The inputs to evaluate. Either one vector or a batch matrix of shape (batch, inputs).
+            :type inputs: numpy.ndarray
+
+            :return: The index of the largest output, or an array of them for a batch.
+            :rtype: int | numpy.ndarray
+        """
+        outputs: np.ndarray = self._run(self._predictSteps, inputs)
+
+        return int(np.argmax(outputs)) if np.ndim(outputs) == 1 else np.argmax(outputs, axis=1)
+
+    def _run(self, steps: tuple[tuple, ...], inputs: np.ndarray) -> np.ndarray:
+        if np.shape(inputs)[-1] != self._size[0]:
+            raise RuntimeError("The input size was not as defined by the network!")
+
+        outputs: np.ndarray = inputs
+
+        for step in steps:
+            if step[0] == FrozenNetwork._DENSE:
+                (_, weights, bias, relu) = step
+
+                outputs = np.asarray(outputs, dtype=weights.dtype) @ weights
+
+                # The matrix multiplication's output is new, so the rest is done in place.
+                if bias is not None:
+                    outputs += bias
+                if relu:
+                    np.maximum(outputs, 0, out=outputs)
+            elif step[0] == FrozenNetwork._RELU:
+                outputs = np.maximum(outputs, 0)
+            elif step[0] == FrozenNetwork._SOFTMAX:
+                outputs = np.subtract(outputs, np.max(outputs, axis=-1, keepdims=True), dtype=np.result_type(outputs, np.float16))
+                np.exp(outputs, out=outputs)
+                outputs /= np.sum(outputs, axis=-1, keepdims=True)
+            else:
+                outputs = step[1].Infer(outputs)
+
+        return outputs
+
+    def GetDtype(self) -> np.dtype:
+        """
+            :return: The floating point type the network takes its inputs in.
+            :rtype: numpy.dtype
+        """
+        return self._dtype
+
+    def GetInputSize(self) -> int:
+        return self._size[0]
+
+    def GetOutputSize(self) -> int:
+        return self._size[1]
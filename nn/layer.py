@@ -1,14 +1,32 @@
 from __future__ import annotations
 
+from nn.optimizer import Optimizer
+from nn.workspace import Workspace
 import numpy as np
 
-class Layer():
+class Layer(Workspace):
     """
         A base class for defining specific layers for neural networks.
         Inputs flow through the system and compute the output depending on
         some function defined by the class that implements this class.
+
+        Forward and Backward accept either a single vector of shape (features,) or a
+        batch matrix of shape (batch, features) where every row is one sample. For a batch,
+        the returned arrays are buffers owned by the layer (see nn.Workspace) which are
+        overwritten by the next batch, so that training doesn't allocate new arrays every step.
+
+        Infer computes the same outputs as Forward without remembering anything for a backward pass.
+        It doesn't change the layer at all, so one layer can be inferred by many threads at once.
     """
 
+    # The floating point type the layer computes in. Set on the class so that layers saved before
+    # the type was configurable still load as float64.
+    _dtype: np.dtype = np.dtype(np.float64)
+
+    # The optimizer state (ex: momentum) of every parameter, in the same order as GetParameters.
+    # Set on the class so that layers saved before optimizers existed still load.
+    _optimizerStates: list[dict] | None = None
+
     def __init__(self: "Layer") -> None:
         self._size: tuple[int, int] | None = None # Size of the input and output array as a tuple.
 
@@ -24,6 +42,19 @@ class Layer():
         """
         raise NotImplementedError("Forward has not been implemented by the class yet!")
 
+    def Infer(self, inputs: np.ndarray) -> np.ndarray:
+        """
+            Computes the output based on inputs, like Forward, but without storing anything in the layer
+            and always returning a new array. Safe to call from several threads at once.
+
+            :param inputs: Input neurons for this layer.
+            :type inputs: numpy.ndarray
+
+            :return: The computed output.
+            :rtype: numpy.ndarray
+        """
+        raise NotImplementedError("Infer has not been implemented by the class yet!")
+
     def Backward(self, derivatives: np.ndarray) -> np.ndarray:
         """
             Computes the local derivative and pushes the derivative back in the chain.
@@ -36,15 +67,113 @@ class Layer():
         """
         raise NotImplementedError("Backward has not been implemented by the class yet!")
     
-    def Update(self, batchSize: int) -> None:
+    def Update(self, batchSize: int, optimizer: Optimizer | None = None) -> None:
         """
-            Updates the layer's parameters depending on if it's implemented or not.
+            Updates the layer's parameters (see GetParameters) with the accumulated gradients and resets
+            the gradients. Layers without parameters don't do anything.
 
             :param batchSize: The size of the batch.
             :type batchSize: int
+
+            :param optimizer: The optimizer that updates the parameters. If None, the parameters take a plain
+            step against the average gradient: parameter -= gradient / batchSize.
+            :type optimizer: nn.Optimizer | None
         """
-        pass # Just pass if it wasn't implemented.
+        parameters: list[tuple[np.ndarray, np.ndarray]] = self.GetParameters()
+
+        if self._optimizerStates is None or len(self._optimizerStates) != len(parameters):
+            self._optimizerStates = [{} for _ in parameters]
+
+        for ((parameter, gradient), state) in zip(parameters, self._optimizerStates):
+            if optimizer is None:
+                # The gradient is scaled in place since it's reset afterwards anyway, that way no temporary array is needed.
+                gradient *= 1.0 / batchSize
+                parameter -= gradient
+            else:
+                optimizer.Step(parameter, gradient, state, batchSize)
+
+            gradient.fill(0.0) # Reset!
     
+    def GetParameters(self) -> list[tuple[np.ndarray, np.ndarray]]:
+        """
+            Gets the trainable parameters of the layer together with their gradient buffers. The arrays
+            are the layer's own, so changing them in place changes the layer.
+
+            :return: A list of (parameter, gradient) pairs, empty if the layer has no parameters.
+            :rtype: list[tuple[numpy.ndarray, numpy.ndarray]]
+        """
+        return [] # No parameters if it wasn't implemented.
+
+    def GetConfig(self) -> dict:
+        """
+            Gets the arguments the layer was created with, so that it can be created again when loading
+            a saved network (see nn.ModelFile). Layers with other constructor arguments override this.
+
+            :return: The keyword arguments of the constructor. Only json values.
+            :rtype: dict
+        """
+        return {"inputs": self.GetInputSize()}
+
+    @classmethod
+    def FromWeights(cls, config: dict, weights: dict[str, np.ndarray]) -> "Layer":
+        """
+            Creates a layer with the given weights, ex: when loading a saved network (see nn.ModelFile). Layers that
+            initialize weights in their constructor override this to skip that, since the weights are replaced anyway.
+
+            :param config: The keyword arguments of the constructor, as returned by GetConfig.
+            :type config: dict
+
+            :param weights: The named weights, as returned by GetWeights. Used without copying.
+            :type weights: dict[str, numpy.ndarray]
+
+            :return: The layer.
+            :rtype: nn.Layer
+
+            :raises TypeError: If the weights don't match the layer.
+        """
+        layer: Layer = cls(**config)
+        layer.SetWeights(weights)
+
+        return layer
+
+    def GetWeights(self) -> dict[str, np.ndarray]:
+        """
+            Gets the arrays that make up the trained layer, by name. Unlike GetParameters, no gradients.
+
+            :return: The named weights, empty if the layer has no weights.
+            :rtype: dict[str, numpy.ndarray]
+        """
+        return {}
+
+    def SetWeights(self, weights: dict[str, np.ndarray]) -> None:
+        """
+            Replaces the layer's weights with the given arrays (as returned by GetWeights). The arrays are used
+            as they are, without copying, so they can be memory-mapped from a file.
+
+            :param weights: The named weights.
+            :type weights: dict[str, numpy.ndarray]
+
+            :raises TypeError: If the weights don't match the layer.
+        """
+        if len(weights) > 0:
+            raise TypeError(f"{type(self).__name__} doesn't have any weights!")
+
+    def GetDtype(self) -> np.dtype:
+        """
+            :return: The floating point type this layer computes in.
+            :rtype: numpy.dtype
+        """
+        return self._dtype
+
+    def SetDtype(self, dtype: np.typing.DTypeLike) -> None:
+        """
+            Sets the floating point type this layer computes in. Layers with parameters convert them as well.
+
+            :param dtype: The new floating point type (ex: numpy.float32).
+            :type dtype: numpy.typing.DTypeLike
+        """
+        self._dtype = np.dtype(dtype)
+
     def GetSize(self) -> tuple[int, int]:
         if self._size is None:
             raise RuntimeError("Size has not been initialized by a layer!")
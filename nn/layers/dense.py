@@ -13,7 +13,9 @@ class Dense(Layer):
             self: "Dense", 
             input: int, 
             output: int, 
-            useBias: bool = True
+            useBias: bool = True,
+            dtype: np.typing.DTypeLike = np.float64,
+            initialize: bool = True
         ):
         """
             :param input: The amount of inputs.
@@ -24,59 +26,151 @@ class Dense(Layer):
 
             :param useBias: Tells if you want to use bias when calculating the output.
             :type useBias: bool
-        """
 
+            :param dtype: The floating point type of the weights, bias, outputs and gradients (ex: numpy.float32).
+            :type dtype: numpy.typing.DTypeLike
+
+            :param initialize: Creates random weights and zero bias. Without it the layer has no weights until
+            SetWeights is called, which saves creating arrays that are replaced right away (see FromWeights).
+            :type initialize: bool
+        """
         self._size: tuple[int, int] = (input, output)
+        self._dtype: np.dtype       = np.dtype(dtype)
 
         # Initialized to None since no forward pass has happened.
         self._inputs: np.ndarray | None  = None
         self._outputs: np.ndarray | None = None
 
-        # Initialize the bias, if bias are to be used!
-        self._usesBias: bool          = useBias
-        self._bias: np.ndarray | None = None
-        self._dB: np.ndarray | None   = None
-        if useBias:
-            self._bias = np.zeros(shape=output)
-            self._dB = np.zeros(shape=output) # Gradient buffer for bias.
+        # The gradient buffers are only created by the first backward pass or update, see _allocateGradients.
+        # A layer that is only used for inference never has them.
+        self._usesBias: bool             = useBias
+        self._bias: np.ndarray | None    = None
+        self._weights: np.ndarray | None = None
+        self._dB: np.ndarray | None      = None
+        self._dW: np.ndarray | None      = None
+
+        if initialize:
+            # Initialize the bias, if bias are to be used!
+            if useBias:
+                self._bias = np.zeros(shape=output, dtype=self._dtype)
+
+            # Initialize the weights close to 0!
+            self._weights = np.random.normal(loc=0, scale=0.01, size=(output, input)).astype(self._dtype)
+
+    @classmethod
+    def FromWeights(cls, config: dict, weights: dict[str, np.ndarray]) -> "Dense":
+        """
+            See nn.Layer.FromWeights. The layer is created without initializing its weights.
+        """
+        # Model files saved while Dense had a sparse input path still have its threshold in the config.
+        config = {name: value for (name, value) in config.items() if name != "sparseThreshold"}
 
-        # Initialize the weights close to 0!
-        self._weights: np.ndarray = np.random.normal(loc=0, scale=0.01, size=(output, input))
+        layer: Dense = cls(**config, initialize=False)
+        layer.SetWeights(weights)
 
-        self._dW: np.ndarray = np.zeros(shape=(output, input)) # Gradient buffer for weights.
+        return layer
+
+    def _allocateGradients(self) -> None:
+        """
+            Creates the gradient buffers of the weights and bias, if they don't exist yet.
+        """
+        if self._dW is None:
+            self._dW = np.zeros(shape=(self.GetOutputSize(), self.GetInputSize()), dtype=self._dtype)
+
+        if self._usesBias and self._dB is None:
+            self._dB = np.zeros(shape=self.GetOutputSize(), dtype=self._dtype)
+
+    def SetDtype(self, dtype: np.typing.DTypeLike) -> None:
+        """
+            Converts the weights, bias and their gradients to the given floating point type.
+
+            :param dtype: The new floating point type (ex: numpy.float32).
+            :type dtype: numpy.typing.DTypeLike
+        """
+        self._dtype = np.dtype(dtype)
+
+        # A layer created with initialize=False has no weights until SetWeights.
+        if self._weights is not None:
+            self._weights = self._weights.astype(self._dtype)
+
+        if self._dW is not None:
+            self._dW = self._dW.astype(self._dtype)
+
+        if self._bias is not None:
+            self._bias = self._bias.astype(self._dtype)
+
+        if self._dB is not None:
+            self._dB = self._dB.astype(self._dtype)
 
     def Forward(self, inputs: np.ndarray) -> np.ndarray:
         """
             For each output, calculate the inputs scaled by the weight summed up together,
             hence this formula: listOfInputs[] * listOfWeightsIntoOutput[] + bias.
 
+            The inputs can either be a single vector of shape (input,) or a whole batch as a
+            matrix of shape (batch, input), where every row is one sample. A batch is computed
+            with a single matrix multiplication instead of one per sample.
+
             :param inputs: The incoming inputs. Has to be the correct size as defined in the constructor.
             :type inputs: numpy.ndarray
 
-            :return: The output, calculated by the formula explained above.
+            :return: The output, calculated by the formula explained above. Shape (output,) or (batch, output).
             :rtype: numpy.ndarray
         """
-        if len(inputs) != self.GetInputSize():
+        if np.shape(inputs)[-1] != self.GetInputSize():
             raise RuntimeError("The input size was not as defined by the layer when forwarding!")
+
+        # Inputs of another type are converted, so that for example float64 inputs don't turn the whole
+        # computation of a float32 layer into float64. Does nothing if the type already matches.
+        inputs = np.asarray(inputs, dtype=self._dtype)
         
         self._inputs = inputs # Store the input as history.
 
         # Matrix multiplication. Will, for each output, take the dot product between each weight and input.
         # The dot products between a list of weights for a certain output and the input can look like this:
         # input: [a0, a1], weights: [w0, w1], dot product: a0 * w0 + a1 * w1.
-        self._outputs = self._weights @ inputs
+        # Multiplying from the right with the transposed weights works for both a single vector and a batch
+        # of row vectors, since each row then gets its own set of dot products.
+        if np.ndim(inputs) == 1:
+            self._outputs = inputs @ np.transpose(self._weights)
+        else:
+            # Written straight into the layer's output buffer for this batch size instead of a new array.
+            self._outputs = np.matmul(inputs, np.transpose(self._weights), out=self._buffer("outputs", (len(inputs), self.GetOutputSize()), self._dtype))
 
         if self._usesBias:
-            self._outputs += self._bias # Will element wise add the bias if it was enabled.
+            self._outputs += self._bias # Will element wise add the bias (to every row) if it was enabled.
         
         return self._outputs
     
+    def Infer(self, inputs: np.ndarray) -> np.ndarray:
+        """
+            The same formula as Forward, but the inputs aren't stored as history and the output is a new array.
+
+            :param inputs: The incoming inputs, of shape (input,) or (batch, input).
+            :type inputs: numpy.ndarray
+
+            :return: The output of shape (output,) or (batch, output).
+            :rtype: numpy.ndarray
+        """
+        if np.shape(inputs)[-1] != self.GetInputSize():
+            raise RuntimeError("The input size was not as defined by the layer when inferring!")
+
+        outputs: np.ndarray = np.asarray(inputs, dtype=self._dtype) @ np.transpose(self._weights)
+
+        if self._usesBias:
+            outputs += self._bias # The outputs are a new array, so adding in place doesn't touch anything shared.
+
+        return outputs
+
     def Backward(self, derivatives: np.ndarray) -> np.ndarray:
         """
             Recieves derivatives from the front to help in computing the local
             derivative of this layer. This layer is going to calculate the derivatives
             in terms of the local weights and biases and change them accordingly.
 
+            When the forward pass was a batch, the derivatives are a matrix of shape (batch, output) and the
+            gradients of all samples are summed up into the gradient buffers in one go.
+
             :param derivatives: The derivatives from the front layers, has to match the output size.
             :type derivatives: numpy.ndarray
 
@@ -86,21 +180,32 @@ class Dense(Layer):
         if self._outputs is None:
             raise RuntimeError("There hasn't been a forward pass for this dense layer!")
         
-        if len(derivatives) != self.GetOutputSize():
+        if np.shape(derivatives)[-1] != self.GetOutputSize():
             raise RuntimeError("The derivatives doesn't match the output size when running backpropagation!")
+
+        derivatives = np.asarray(derivatives, dtype=self._dtype) # Same as for the inputs, no silent change of type.
+
+        self._allocateGradients()
         
         # Since the output function of this layer is y = input * weight + bias, the local derivative of
         # dy / dweight => input. And since the chain rule is present we'll multiply the forward derivative
         # with dy / dweight to get the local gradient for each weight. This is used to move the weights in a certain direction.
-        weightGradients: np.ndarray = np.outer(derivatives, self._inputs)
-
-        self._dW += weightGradients
+        # For a batch, derivatives.T @ inputs is the sum of the outer products of every sample, done as one matrix multiplication.
+        # For a batch, the results are written into reused scratch buffers instead of new arrays.
+        if np.ndim(derivatives) == 1:
+            self._dW += np.outer(derivatives, self._inputs)
+        else:
+            self._dW += np.matmul(np.transpose(derivatives), self._inputs, out=self._buffer("weightGradients", self._dW.shape, self._dtype))
 
         # Since dy / dbias => 1, it's just going to be derivatives since multiplying with 1 does NOTHING!
         # This is used to move the bias in a certain direction.
-        biasGradients: np.ndarray = derivatives
-
+        # For a batch, the bias gradients of every sample are summed up.
         if self._usesBias:
+            if np.ndim(derivatives) == 1:
+                biasGradients: np.ndarray = derivatives
+            else:
+                biasGradients: np.ndarray = np.sum(derivatives, axis=0, out=self._buffer("biasGradients", self._dB.shape, self._dtype))
+
             self._dB += biasGradients
 
         # The propagation derivative is the sum of the weight derivative for each input.
@@ -109,7 +214,11 @@ class Dense(Layer):
         # propagated backwards. Why it very much looks like the weightGradient, we are here instead calculating
         # dy / dinput, which is why we multiply by the weights instead of the input this time. This is because the input
         # to this system depends on variables calculated in the layers before this, hence why dy / dinput is calculated here.
-        propagationDerivatives: np.ndarray = np.transpose(self._weights) @ derivatives
+        # Multiplying from the right with the weights does the same thing for each row in a batch.
+        if np.ndim(derivatives) == 1:
+            propagationDerivatives: np.ndarray = derivatives @ self._weights
+        else:
+            propagationDerivatives: np.ndarray = np.matmul(derivatives, self._weights, out=self._buffer("propagation", (len(derivatives), self.GetInputSize()), self._dtype))
 
         # Change the weights. Since each row fo the weightGradients contain the gradients for the weights arriving at the output
         # we can just elementwise take a step in the opposite direction. Imagine if the gradient for a weight is positive, that means
@@ -124,16 +233,54 @@ class Dense(Layer):
 
         return propagationDerivatives
     
-    def Update(self, batchSize: int) -> None:
+    def GetConfig(self) -> dict:
+        return {"input": self.GetInputSize(), "output": self.GetOutputSize(), "useBias": self._usesBias, "dtype": self._dtype.name}
+
+    def GetWeights(self) -> dict[str, np.ndarray]:
+        """
+            :return: The weights and, if bias is used, the bias.
+            :rtype: dict[str, numpy.ndarray]
+        """
+        weights: dict[str, np.ndarray] = {"weights": self._weights}
+
+        if self._usesBias:
+            weights["bias"] = self._bias
+
+        return weights
+
+    def SetWeights(self, weights: dict[str, np.ndarray]) -> None:
+        """
+            Replaces the weights and bias. Read-only arrays (ex: memory-mapped) work for inference, but
+            training needs writable ones since the parameters are updated in place.
         """
-            Updates the layer's weights and biases.
+        # Checked against the size instead of the current weights, since a layer created with initialize=False has none.
+        expected: dict[str, tuple[int, ...]] = {"weights": (self.GetOutputSize(), self.GetInputSize())}
+
+        if self._usesBias:
+            expected["bias"] = (self.GetOutputSize(),)
+
+        if weights.keys() != expected.keys():
+            raise TypeError(f"Dense expects the weights {sorted(expected.keys())}, got {sorted(weights.keys())}!")
 
-            :param batchSize: The size of the batch.
-            :type batchSize: int
+        for (name, array) in weights.items():
+            if array.shape != expected[name] or array.dtype != self._dtype:
+                raise TypeError(f"The {name} of the dense layer should be {self._dtype.name} {expected[name]}, got {array.dtype.name} {array.shape}!")
+
+        self._weights = weights["weights"]
+
+        if self._usesBias:
+            self._bias = weights["bias"]
+
+    def GetParameters(self) -> list[tuple[np.ndarray, np.ndarray]]:
         """
-        self._weights -= self._dW / batchSize
-        self._dW.fill(0.0) # Reset!
+            :return: The weights and their gradients, followed by the bias and its gradients if bias is used.
+            :rtype: list[tuple[numpy.ndarray, numpy.ndarray]]
+        """
+        self._allocateGradients()
+
+        parameters: list[tuple[np.ndarray, np.ndarray]] = [(self._weights, self._dW)]
 
         if self._usesBias:
-            self._bias -= self._dB / batchSize
-            self._dB.fill(0.0) # Reset!
\ No newline at end of file
+            parameters.append((self._bias, self._dB))
+
+        return parameters
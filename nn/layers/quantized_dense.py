@@ -0,0 +1,278 @@
+from __future__ import annotations
+
+from nn.layer import Layer
+import numpy as np
+
+class QuantizedDense(Layer):
+    """
+        A dense layer with int8 weights, for inference only (see nn.Quantizer, which creates them from trained
+        dense layers). Every row of weights (one output) has its own scale, weights[row] ~= int8Weights[row] * scales[row],
+        so a row of small weights doesn't lose its precision to a row of large ones. The inputs are quantized to int8 as
+        well, with one scale found when calibrating, and the products are summed up as integers:
+
+            output = (int8Inputs @ int8Weights.T) * inputScale * scales + bias
+
+        Numpy has no fast int8 matrix multiplication, so the integer sums are computed with the floating point one. The
+        sums are still exact, since a float32 holds every integer below 2^24 (and a float64 below 2^53), which is enough
+        for 1040 inputs of 127 * 127 in float32. How the int8 weights get to the matrix multiplication depends on accumulate:
+
+        * "float" (the default): every call converts BLOCK_SIZE weights at a time to float and multiplies with that
+          block, which stays in the cpu cache. Only the int8 weights are kept and read from memory, so a memory-mapped
+          model file is used as it is and shared between processes, and inference moves 4 times less weight memory
+          than a float32 layer. Converting costs time though, it's up to about 2 times slower than "float-cached" for
+          small batches and faster for large layers, where memory is the bottleneck.
+        * "float-cached": a float copy of the weights is made once when they are set. The fastest for small layers,
+          but the copy is private to the process and inference reads as much memory as the float network would.
+        * "int32": numpy's integer matrix multiplication on the int8 weights as they are. No copies, but a lot slower.
+
+        The layer can't be trained, its Backward raises an error.
+    """
+
+    ACCUMULATE: tuple[str, ...] = ("float", "float-cached", "int32")
+    BLOCK_SIZE: int             = 1 << 16 # Weights converted at a time by "float", 256KB as float32.
+
+    # Only made for "float-cached". Set on the class so that it isn't pickled along with the int8 weights.
+    _accumulateWeights: np.ndarray | None = None
+
+    def __init__(
+            self: "QuantizedDense",
+            input: int,
+            output: int,
+            inputScale: float = 1.0 / 127,
+            useBias: bool = True,
+            dtype: np.typing.DTypeLike = np.float32,
+            accumulate: str = "float"
+        ):
+        """
+            :param input: The amount of inputs.
+            :type input: int
+
+            :param output: The amount of outputs.
+            :type output: int
+
+            :param inputScale: The value of one int8 step of the inputs, ex: the largest input seen when calibrating / 127.
+            Larger inputs are clipped.
+            :type inputScale: float
+
+            :param useBias: Tells if the layer adds a bias to the outputs.
+            :type useBias: bool
+
+            :param dtype: The floating point type of the outputs, the scales and the bias.
+            :type dtype: numpy.typing.DTypeLike
+
+            :param accumulate: How the integer sums are computed, "float", "float-cached" or "int32" (see the class).
+            :type accumulate: str
+        """
+        if accumulate not in QuantizedDense.ACCUMULATE:
+            raise TypeError(f"The accumulation has to be one of {QuantizedDense.ACCUMULATE}, got {accumulate}!")
+
+        if inputScale <= 0:
+            raise TypeError("The input scale has to be positive!")
+
+        self._size: tuple[int, int] = (input, output)
+        self._dtype: np.dtype       = np.dtype(dtype)
+        self._inputScale: float     = float(inputScale)
+        self._usesBias: bool        = useBias
+        self._accumulate: str       = accumulate
+
+        self._weights: np.ndarray     = np.zeros(shape=(output, input), dtype=np.int8)
+        self._scales: np.ndarray      = np.ones(shape=output, dtype=self._dtype)
+        self._bias: np.ndarray | None = np.zeros(shape=output, dtype=self._dtype) if useBias else None
+
+        self._updateAccumulateWeights()
+
+    @staticmethod
+    def FromDense(layer: Layer, inputScale: float, accumulate: str = "float") -> "QuantizedDense":
+        """
+            Quantizes the weights of a trained dense layer, with one scale per row.
+
+            :param layer: The dense layer.
+            :type layer: nn.layers.Dense
+
+            :param inputScale: The value of one int8 step of the layer's inputs.
+            :type inputScale: float
+
+            :param accumulate: See the constructor.
+            :type accumulate: str
+
+            :return: The quantized layer.
+            :rtype: nn.layers.QuantizedDense
+        """
+        config: dict                   = layer.GetConfig()
+        weights: dict[str, np.ndarray] = layer.GetWeights()
+
+        # The largest weight of every row becomes 127. Rows of only zeros keep a scale of 1 to not divide by 0.
+        largest: np.ndarray = np.max(np.abs(weights["weights"]), axis=1)
+        scales: np.ndarray  = np.where(largest > 0, largest / 127, 1.0).astype(layer.GetDtype())
+
+        quantized: np.ndarray = np.clip(np.rint(weights["weights"] / scales[:, np.newaxis]), -127, 127).astype(np.int8)
+
+        quantizedLayer: QuantizedDense          = QuantizedDense(config["input"], config["output"], inputScale, config["useBias"], layer.GetDtype(), accumulate)
+        quantizedWeights: dict[str, np.ndarray] = {"weights": quantized, "scales": scales}
+
+        if config["useBias"]:
+            quantizedWeights["bias"] = np.array(weights["bias"], dtype=layer.GetDtype())
+
+        quantizedLayer.SetWeights(quantizedWeights)
+
+        return quantizedLayer
+
+    def _updateAccumulateWeights(self) -> None:
+        """
+            Makes the transposed float copy of the int8 weights for "float-cached". The other ways don't keep a copy.
+        """
+        if self._accumulate != "float-cached":
+            self._accumulateWeights = None
+            return
+
+        self._accumulateWeights = np.ascontiguousarray(np.transpose(self._weights), dtype=self._getAccumulateType())
+
+    def _getAccumulateType(self) -> np.dtype:
+        """
+            :return: The float type the integer sums are computed in. The largest possible sum has to fit in its mantissa to stay exact.
+            :rtype: numpy.dtype
+        """
+        return np.dtype(np.float32 if self.GetInputSize() * 127 * 127 < 2 ** 24 else np.float64)
+
+    def _blockSums(self, steps: np.ndarray) -> np.ndarray:
+        """
+            The integer sums for "float", converting BLOCK_SIZE int8 weights (whole rows) at a time into a float block.
+
+            :param steps: The int8 steps of the inputs, as floating point numbers. Shape (input,) or (batch, input).
+            :type steps: numpy.ndarray
+
+            :return: The sums of shape (output,) or (batch, output).
+            :rtype: numpy.ndarray
+        """
+        floatType: np.dtype = self._getAccumulateType()
+        (outputs, inputs)   = np.shape(self._weights)
+        rows: int           = max(1, QuantizedDense.BLOCK_SIZE // inputs)
+        steps               = np.asarray(steps, dtype=floatType)
+        sums: np.ndarray    = np.empty((*np.shape(steps)[:-1], outputs), dtype=floatType)
+        block: np.ndarray   = np.empty((min(rows, outputs), inputs), dtype=floatType) # Per call, so Infer stays thread safe.
+
+        for start in range(0, outputs, rows):
+            stop: int           = min(start + rows, outputs)
+            weights: np.ndarray = block[:stop - start]
+            weights[...]        = self._weights[start:stop]
+
+            np.matmul(steps, np.transpose(weights), out=sums[..., start:stop])
+
+        return sums
+
+    def QuantizeInputs(self, inputs: np.ndarray) -> np.ndarray:
+        """
+            :param inputs: The inputs, of shape (input,) or (batch, input).
+            :type inputs: numpy.ndarray
+
+            :return: The inputs as int8 steps of the input scale, clipped to -127 to 127.
+            :rtype: numpy.ndarray
+        """
+        return self._quantizeInputSteps(inputs).astype(np.int8)
+
+    def _quantizeInputSteps(self, inputs: np.ndarray) -> np.ndarray:
+        """
+            :return: The int8 steps of the inputs, still as floating point numbers.
+            :rtype: numpy.ndarray
+        """
+        steps: np.ndarray = np.rint(np.multiply(inputs, 1.0 / self._inputScale, dtype=self._dtype))
+        np.clip(steps, -127, 127, out=steps)
+
+        return steps
+
+    def Forward(self, inputs: np.ndarray) -> np.ndarray:
+        """
+            The same as Infer, nothing is stored since the layer can't be trained anyway.
+        """
+        return self.Infer(inputs)
+
+    def Infer(self, inputs: np.ndarray) -> np.ndarray:
+        """
+            Quantizes the inputs, sums up the integer products and scales them back to floating point.
+
+            :param inputs: The incoming inputs, of shape (input,) or (batch, input).
+            :type inputs: numpy.ndarray
+
+            :return: The output of shape (output,) or (batch, output).
+            :rtype: numpy.ndarray
+        """
+        if np.shape(inputs)[-1] != self.GetInputSize():
+            raise RuntimeError("The input size was not as defined by the layer when inferring!")
+
+        if self._accumulate == "int32":
+            sums: np.ndarray = np.matmul(self.QuantizeInputs(inputs), np.transpose(self._weights), dtype=np.int32)
+        elif self._accumulate == "float-cached":
+            # The steps are whole numbers already, so they don't have to go through int8 first.
+            sums: np.ndarray = np.asarray(self._quantizeInputSteps(inputs), dtype=self._accumulateWeights.dtype) @ self._accumulateWeights
+        else:
+            sums: np.ndarray = self._blockSums(self._quantizeInputSteps(inputs))
+
+        outputs: np.ndarray = np.multiply(sums, self._scales * self._inputScale, dtype=self._dtype)
+
+        if self._usesBias:
+            outputs += self._bias
+
+        return outputs
+
+    def Backward(self, derivatives: np.ndarray) -> np.ndarray:
+        raise RuntimeError("A quantized dense layer can't be trained, train the float network and quantize it again!")
+
+    def GetConfig(self) -> dict:
+        return {"input": self.GetInputSize(), "output": self.GetOutputSize(), "inputScale": self._inputScale, "useBias": self._usesBias,
+                "dtype": self._dtype.name, "accumulate": self._accumulate}
+
+    def GetWeights(self) -> dict[str, np.ndarray]:
+        """
+            :return: The int8 weights, the scale of every row and, if bias is used, the bias.
+            :rtype: dict[str, numpy.ndarray]
+        """
+        weights: dict[str, np.ndarray] = {"weights": self._weights, "scales": self._scales}
+
+        if self._usesBias:
+            weights["bias"] = self._bias
+
+        return weights
+
+    def SetWeights(self, weights: dict[str, np.ndarray]) -> None:
+        """
+            Replaces the int8 weights, scales and bias. The arrays are used without copying, so they can be memory-mapped.
+        """
+        expected: dict[str, np.ndarray] = self.GetWeights()
+
+        if weights.keys() != expected.keys():
+            raise TypeError(f"QuantizedDense expects the weights {sorted(expected.keys())}, got {sorted(weights.keys())}!")
+
+        for (name, array) in weights.items():
+            if array.shape != expected[name].shape or array.dtype != expected[name].dtype:
+                raise TypeError(f"The {name} of the quantized dense layer should be {expected[name].dtype.name} {expected[name].shape}, got {array.dtype.name} {array.shape}!")
+
+        self._weights = weights["weights"]
+        self._scales  = weights["scales"]
+
+        if self._usesBias:
+            self._bias = weights["bias"]
+
+        self._updateAccumulateWeights()
+
+    def SetDtype(self, dtype: np.typing.DTypeLike) -> None:
+        """
+            Converts the scales and bias to the given floating point type. The weights stay int8.
+
+            :param dtype: The new floating point type (ex: numpy.float32).
+            :type dtype: numpy.typing.DTypeLike
+        """
+        self._dtype  = np.dtype(dtype)
+        self._scales = self._scales.astype(self._dtype)
+
+        if self._usesBias:
+            self._bias = self._bias.astype(self._dtype)
+
+    def __getstate__(self) -> dict:
+        state: dict = super().__getstate__()
+        state.pop("_accumulateWeights", None) # Made again from the int8 weights.
+
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._updateAccumulateWeights()
@@ -9,6 +9,9 @@ class Relu(Layer):
         activation layer. It's seen as a linear function when x > 0 and flat 0 otherwise.
     """
 
+    # Set on the class so that layers saved before the mask existed still load.
+    _mask: np.ndarray | None = None
+
     def __init__(self: "Relu", inputs: int):
         """
             :param inputs: The amount of inputs.
@@ -17,39 +20,60 @@ class Relu(Layer):
 
         self._size: tuple[int, int] = (inputs, inputs) # The same size since it just applies a function on the input.
 
-        # Initialized to None since no forward pass has happened.
-        self._inputs: np.ndarray | None  = None
-        self._outputs: np.ndarray | None = None
+        # Initialized to None since no forward pass has happened. Only where the inputs were positive is
+        # remembered for the backward pass, which is all it needs, instead of keeping the inputs and outputs.
+        self._mask: np.ndarray | None = None
 
     def Forward(self, inputs: np.ndarray) -> np.ndarray:
         """
             The forward of the ReLU function is just a max(0, input), since it's a y(x) = x function when
-            x > 0 and else 0.
+            x > 0 and else 0. Works the same for a single vector and a batch matrix of shape (batch, inputs)
+            since the function is applied element wise.
         """
-        if len(inputs) != self.GetInputSize():
+        if np.shape(inputs)[-1] != self.GetInputSize():
             raise RuntimeError("ReLU input for forwarding is not of the correct size as defined by the constructor!")
 
-        self._inputs = inputs
+        if np.ndim(inputs) == 1:
+            self._mask = inputs > 0
+
+            # Applies the ReLU function on the input and computes the output.
+            return np.maximum(0, inputs)
 
-        # Applies the ReLU function on the input and computes the output.
-        self._outputs = np.maximum(0, self._inputs)
+        # For a batch, the mask and outputs are written into the layer's buffers for this batch size.
+        shape: tuple[int, int] = np.shape(inputs)
+        self._mask = np.greater(inputs, 0, out=self._buffer("mask", shape, np.bool_))
 
-        return self._outputs
+        return np.maximum(inputs, 0, out=self._buffer("outputs", shape, np.result_type(inputs)))
     
+    def Infer(self, inputs: np.ndarray) -> np.ndarray:
+        """
+            max(0, input) like Forward, without remembering the mask.
+        """
+        if np.shape(inputs)[-1] != self.GetInputSize():
+            raise RuntimeError("ReLU input for inferring is not of the correct size as defined by the constructor!")
+
+        return np.maximum(inputs, 0)
+
     def Backward(self, derivatives: np.ndarray) -> np.ndarray:
         """
             The backward pass on the ReLU function calculates the dactivation / dinput. And since
             the activation function looks like this: activation(input) = input, when input > 0, the
             derivative for input > 0 is going to be 1. And when input <= 0, it will be 0.
         """
-        if self._outputs is None:
+        if self._mask is None:
             raise RuntimeError("ReLU function hasn't yet executed the forward step!")
         
-        if len(derivatives) != self.GetOutputSize():
+        if np.shape(derivatives)[-1] != self.GetOutputSize():
             raise RuntimeError("The derivative size doesn't match the output size of the ReLU function!")
         
         # Since we need to propogate the derivative in relation to the input (since the input is calculated in the layers before),
         # we multiply the derivatives where the input is <= 0 with 0 and else 1. This is done due to the chain rule.
-        toPropagate: np.ndarray = derivatives * (self._inputs > 0)
-        
+        if np.ndim(derivatives) == 1:
+            return derivatives * self._mask
+
+        # Copying where the mask is set, instead of multiplying with it, saves numpy from converting the mask to floats first.
+        toPropagate: np.ndarray = self._buffer("propagation", np.shape(derivatives), np.result_type(derivatives))
+        toPropagate.fill(0.0)
+        np.copyto(toPropagate, derivatives, where=self._mask)
+
         return toPropagate
\ No newline at end of file
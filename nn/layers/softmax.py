@@ -20,8 +20,7 @@ class Softmax(Layer):
 
         self._size: tuple[int, int] = (inputs, inputs) # The same size since it just applies a function on the input.
 
-        # Initialized to None since no forward pass has happened.
-        self._inputs: np.ndarray | None  = None
+        # Initialized to None since no forward pass has happened. Only the outputs are kept, the backward pass doesn't need the inputs.
         self._outputs: np.ndarray | None = None
 
     def Forward(self, inputs: np.ndarray) -> np.ndarray:
@@ -34,38 +33,72 @@ class Softmax(Layer):
             "scores" calculated and dividing each score by that sum. Just like you would when learning about probability when you were small.
             Ex: 5 apples, 5 pears, how many percent apples. Well, you take 5 / (5 + 5) = 0.5.
 
+            For a batch matrix of shape (batch, inputs), every row is turned into its own probabilities.
+
             :param inputs: The logits to be converted into probabilities.
             :type inputs: numpyp.ndarray
 
             :return: The probabilities for each class.
             :rtype: numpyp.ndarray
         """
-        if len(inputs) != self.GetInputSize():
+        if np.shape(inputs)[-1] != self.GetInputSize():
             raise RuntimeError("The inputs size didn't match the softmax's layer size!")
-        
-        # Set the value for history.
-        self._inputs = inputs
-        
-        # Finds the maximum value of the inputs.
-        max: float = np.max(inputs)
 
-        # Elementwise remove max from the original value, hence making it numerically stable.
-        shifted: np.ndarray = inputs - max
+        if np.ndim(inputs) == 1:
+            # Finds the maximum value of the inputs.
+            max: np.ndarray = np.max(inputs, axis=-1, keepdims=True)
+
+            # Elementwise remove max from the original value, hence making it numerically stable.
+            shifted: np.ndarray = inputs - max
+
+            # Elementwise take e^(input).
+            exponentialInputs: np.ndarray = np.exp(shifted)
+
+            # Elementwise take the computed exponential and divide by the sum of all exponentials.
+            self._outputs = exponentialInputs / np.sum(exponentialInputs, axis=-1, keepdims=True)
+
+            return self._outputs
 
-        # Elementwise take e^(input).
-        exponentialInputs: np.ndarray = np.exp(shifted)
+        # The same steps for a batch, one row at a time, but everything is done inside the layer's buffers.
+        (rows, _) = np.shape(inputs)
+        dtype: np.dtype = np.result_type(inputs, np.float16) # Integer logits still give floating point probabilities.
+        rowValues: np.ndarray = self._buffer("rowValues", (rows, 1), dtype)
 
-        # Elementwise take the computed exponential and divide by the sum of all exponentials.
-        self._outputs = exponentialInputs / np.sum(exponentialInputs)
+        self._outputs = self._buffer("outputs", np.shape(inputs), dtype)
+        np.max(inputs, axis=-1, keepdims=True, out=rowValues)
+        np.subtract(inputs, rowValues, out=self._outputs)
+        np.exp(self._outputs, out=self._outputs)
+        np.sum(self._outputs, axis=-1, keepdims=True, out=rowValues)
+        np.divide(self._outputs, rowValues, out=self._outputs)
 
         return self._outputs
     
+    def Infer(self, inputs: np.ndarray) -> np.ndarray:
+        """
+            The same probabilities as Forward, for a single vector or a batch, without storing the inputs or outputs.
+
+            :param inputs: The logits to be converted into probabilities.
+            :type inputs: numpy.ndarray
+
+            :return: The probabilities for each class, as a new array.
+            :rtype: numpy.ndarray
+        """
+        if np.shape(inputs)[-1] != self.GetInputSize():
+            raise RuntimeError("The inputs size didn't match the softmax's layer size!")
+
+        # Every step after the subtraction works in place on the new array.
+        outputs: np.ndarray = np.subtract(inputs, np.max(inputs, axis=-1, keepdims=True), dtype=np.result_type(inputs, np.float16))
+        np.exp(outputs, out=outputs)
+        outputs /= np.sum(outputs, axis=-1, keepdims=True)
+
+        return outputs
+
     def Backward(self, derivatives: np.ndarray) -> np.ndarray:
         """
-            First of, this layer isn't that effective since it has to calculate the jacobian matrix
-            containing all the different gradients since changing input x0 changes all the outputs,
-            hence causing the cost to change. To make it more efficient, make sure to use softmax
-            together with cross entropy to make the backpropogation algorithm faster.
+            First of, changing input x0 changes all the outputs, hence causing the cost to change, which is
+            described by the jacobian matrix containing all the different gradients. To make it more efficient,
+            make sure to use softmax together with cross entropy (nn.costs.CrossEntropy), then the network skips
+            this backward pass completely.
 
             One intuition I gathered from doing this work about the jacobian and it's effect was thinking
             of another example where a vector in the input of a function (more than one variable). Ex:
@@ -84,18 +117,36 @@ class Softmax(Layer):
             So we are going to, for each input, multiply every gradient with the corresponding output derivative like this: dSi/dxj * dC/dSi, and then
             summing them all up.
 
+            The jacobian is never built though. Written out, jacobian @ derivatives for input i becomes
+            Si * dC/dSi - Si * sum(Sj * dC/dSj), so the product can be computed as S * (derivatives - dot(S, derivatives)).
+            That's O(n) instead of the O(n^2) it takes to build and multiply the jacobian. For a batch, the dot product
+            is taken per row (sample).
+
             :param derivatives: The incoming derivatives from the layer in front.
             :type derivatives: numpyp.ndarray
 
             :return: Returns the propogation derivative for use in the layers in the back.
             :rtype: numpyp.ndarray
         """
-        # Convert the outputs to a column vector.
-        outputAsColumn: np.ndarray = self._outputs[:, None]
+        if self._outputs is None:
+            raise RuntimeError("Softmax hasn't yet executed the forward step!")
+
+        if np.ndim(derivatives) == 1:
+            # The dot product between the outputs and the derivatives.
+            weightedSum: np.ndarray = np.sum(self._outputs * derivatives, axis=-1, keepdims=True)
+
+            toProp: np.ndarray = self._outputs * (derivatives - weightedSum)
+
+            return toProp
 
-        # Faster way to calculate the jacobian.
-        jacobian: np.ndarray = np.diagflat(self._outputs) - outputAsColumn @ np.transpose(outputAsColumn)
+        # The same for a batch, with one dot product per row, computed inside the layer's buffers.
+        dtype: np.dtype = np.result_type(self._outputs, derivatives)
+        toProp: np.ndarray = self._buffer("propagation", np.shape(derivatives), dtype)
+        weightedSum: np.ndarray = self._buffer("weightedSum", (len(derivatives), 1), dtype)
 
-        toProp: np.ndarray = jacobian @ derivatives
+        np.multiply(self._outputs, derivatives, out=toProp)
+        np.sum(toProp, axis=-1, keepdims=True, out=weightedSum)
+        np.subtract(derivatives, weightedSum, out=toProp)
+        np.multiply(toProp, self._outputs, out=toProp)
 
-        return toProp
\ No newline at end of file
+        return toProp
@@ -1,14 +1,20 @@
 from __future__ import annotations
 from pathlib import Path
 import pickle
+import sys
 
+from nn.model_file import ModelFile
 from nn.network import Network
 
 class Memory():
     """
         The Memory class takes care of saving and loading the models.
+
+        Networks are saved as model files (see nn.ModelFile), which don't use pickle and can be
+        memory-mapped. Pickled networks saved by older versions can still be loaded, and converted
+        with ConvertNetwork or from the command line: python -m nn.memory 95percent.pkl
     """
-    
+
     def __init__(self: "Memory") -> None:
         pass
 
@@ -21,19 +27,61 @@ class Memory():
         # Ensure directory exists!
         file_path.parent.mkdir(parents=True, exist_ok=True)
 
-        with open(file_path, "wb") as f:
-            pickle.dump(network, f, protocol=pickle.HIGHEST_PROTOCOL)
+        ModelFile.Save(network, file_path)
+
+    def LoadNetwork(self, path: str, memoryMap: bool = False) -> Network:
+        """
+            Loads a network from a model file, or from a pickle file saved by an older version.
+
+            :param path: The file to load.
+            :type path: str
 
-    def LoadNetwork(self, path: str) -> Network:
+            :param memoryMap: Memory-map the weights of a model file read-only (see nn.ModelFile.Load). Makes loading
+            almost free and shares the weights between processes, but the network can't be trained.
+            :type memoryMap: bool
+
+            :return: The network.
+            :rtype: nn.Network
+        """
         file_path = Path(path).resolve()
 
         if not file_path.exists():
             raise FileNotFoundError(f"Network file does not exist: {file_path}!")
 
+        if ModelFile.IsModelFile(file_path):
+            return ModelFile.Load(file_path, memoryMap)
+
+        # Only load pickle files from sources you trust, unpickling can run any code.
         with open(file_path, "rb") as f:
             network = pickle.load(f)
 
         if not isinstance(network, Network):
             raise TypeError("Loaded object is not a Network instance!")
 
-        return network
\ No newline at end of file
+        return network
+
+    def ConvertNetwork(self, path: str, outputPath: str | None = None) -> Path:
+        """
+            Converts a pickled network into a model file.
+
+            :param path: The pickle file.
+            :type path: str
+
+            :param outputPath: Where to write the model file. Defaults to the same path with the .model suffix.
+            :type outputPath: str | None
+
+            :return: The path of the model file.
+            :rtype: pathlib.Path
+        """
+        modelPath: Path = Path(path).resolve().with_suffix(ModelFile.SUFFIX) if outputPath is None else Path(outputPath).resolve()
+
+        self.SaveNetwork(self.LoadNetwork(path), modelPath)
+
+        return modelPath
+
+if __name__ == "__main__":
+    if len(sys.argv) not in (2, 3):
+        print("Usage: python -m nn.memory <network.pkl> [network.model]")
+        sys.exit(1)
+
+    print(f"Written {Memory().ConvertNetwork(*sys.argv[1:])}")
@@ -0,0 +1,263 @@
+from __future__ import annotations
+
+from nn.cost import Cost
+from nn.costs.cross_entropy import CrossEntropy
+from nn.costs.mse import Mse
+from nn.layer import Layer
+from nn.layers.dense import Dense
+from nn.layers.quantized_dense import QuantizedDense
+from nn.layers.relu import Relu
+from nn.layers.softmax import Softmax
+from nn.network import Network
+from nn.networks.sequential import Sequential
+from nn.optimizer import Optimizer
+from nn.optimizers.adam import Adam
+from nn.optimizers.nesterov import Nesterov
+from nn.optimizers.sgd import Sgd
+from pathlib import Path
+import json
+import numpy as np
+import os
+import struct
+
+class ModelFile():
+    """
+        A versioned binary file for saved networks that doesn't use pickle. Only the description of the
+        network (which layers, their constructor arguments, the cost function and the optimizer) and the raw
+        weights are stored, nothing else of the objects. Loading creates the objects again from the description,
+        so no code from the file is ever run, and the weights can be memory-mapped read-only so that every
+        process using the same file shares one physical copy of them.
+
+        File layout (little endian):
+            [0:8]   magic bytes b"NNMODEL\\0".
+            [8:12]  uint32 format version.
+            [12:16] uint32 size of the json header in bytes.
+            [16:]   utf-8 json header, then zero padding up to the next 64 byte boundary.
+            [...]   the weights, each one starting on a 64 byte boundary. Their offsets in the header are
+                    relative to the end of the padded header.
+
+        The json header looks like:
+            {"network": "Sequential", "layers": [{"type": "Dense", "config": {...}, "dtype": "float32",
+            "weights": {"weights": {"offset": 128, "shape": [16, 784], "dtype": "<f4"}, ...}}, ...],
+            "cost": {"type": "CrossEntropy", "config": {...}}, "optimizer": {"type": "Adam", "config": {...}}}
+
+        The optimizer's state (ex: momentum) isn't stored, only its settings.
+    """
+
+    MAGIC: bytes        = b"NNMODEL\0"
+    VERSION: int        = 1
+    ALIGNMENT: int      = 64
+    SUFFIX: str         = ".model"
+    _HEADER_FORMAT: str = "<8sII"
+
+    # The types that can be stored, by name. Register new ones with Register.
+    NETWORKS: dict[str, type]   = {"Sequential": Sequential}
+    LAYERS: dict[str, type]     = {"Dense": Dense, "QuantizedDense": QuantizedDense, "Relu": Relu, "Softmax": Softmax}
+    COSTS: dict[str, type]      = {"Mse": Mse, "CrossEntropy": CrossEntropy}
+    OPTIMIZERS: dict[str, type] = {"Sgd": Sgd, "Nesterov": Nesterov, "Adam": Adam}
+
+    @staticmethod
+    def Register(cls: type) -> type:
+        """
+            Makes a layer, cost function or optimizer type storable. Can be used as a class decorator.
+
+            :param cls: The type to register. It has to be created again from the keyword arguments returned by its GetConfig.
+            :type cls: type
+
+            :return: The type.
+            :rtype: type
+        """
+        if issubclass(cls, Layer):
+            ModelFile.LAYERS[cls.__name__] = cls
+        elif issubclass(cls, Cost):
+            ModelFile.COSTS[cls.__name__] = cls
+        elif issubclass(cls, Optimizer):
+            ModelFile.OPTIMIZERS[cls.__name__] = cls
+        else:
+            raise TypeError(f"Only layers, cost functions and optimizers can be registered, got {cls.__name__}!")
+
+        return cls
+
+    @staticmethod
+    def IsModelFile(path: str | Path) -> bool:
+        """
+            :param path: The file to check.
+            :type path: str | pathlib.Path
+
+            :return: True if the file starts with the magic bytes of a model file.
+            :rtype: bool
+        """
+        try:
+            with open(path, "rb") as f:
+                return f.read(len(ModelFile.MAGIC)) == ModelFile.MAGIC
+        except OSError:
+            return False
+
+    @staticmethod
+    def Save(network: Network, path: str | Path) -> Path:
+        """
+            Writes the network to a model file. The file is written to a temporary path first and then
+            renamed, so a half written file is never loaded (and a file that is memory-mapped by another
+            process is replaced instead of changed under its feet).
+
+            :param network: The network to save.
+            :type network: nn.Network
+
+            :param path: Where to write the file.
+            :type path: str | pathlib.Path
+
+            :return: The absolute path of the written file.
+            :rtype: pathlib.Path
+
+            :raises TypeError: If the network contains a type that isn't registered.
+        """
+        header: dict = {
+            "network": ModelFile._getName(network, ModelFile.NETWORKS),
+            "layers": [],
+            "cost": {"type": ModelFile._getName(network._cost, ModelFile.COSTS), "config": network._cost.GetConfig()},
+            "optimizer": None
+        }
+
+        if network._optimizer is not None:
+            header["optimizer"] = {"type": ModelFile._getName(network._optimizer, ModelFile.OPTIMIZERS), "config": network._optimizer.GetConfig()}
+
+        # The offsets are relative to the start of the weights, since the header size isn't known until it's written.
+        blobs: list[np.ndarray] = []
+        offset: int             = 0
+
+        for layer in network._layers:
+            weights: dict = {}
+
+            for (name, array) in layer.GetWeights().items():
+                weights[name] = {"offset": offset, "shape": list(array.shape), "dtype": array.dtype.str}
+                offset        = ModelFile._align(offset + array.nbytes)
+                blobs.append(array)
+
+            header["layers"].append({"type": ModelFile._getName(layer, ModelFile.LAYERS), "config": layer.GetConfig(), "dtype": layer.GetDtype().name, "weights": weights})
+
+        headerBytes: bytes = json.dumps(header, separators=(",", ":")).encode("utf-8")
+
+        filePath: Path = Path(path).resolve()
+        tempPath: Path = filePath.with_name(filePath.name + ".tmp")
+        filePath.parent.mkdir(parents=True, exist_ok=True)
+
+        try:
+            with open(tempPath, "wb") as f:
+                f.write(struct.pack(ModelFile._HEADER_FORMAT, ModelFile.MAGIC, ModelFile.VERSION, len(headerBytes)))
+                f.write(headerBytes)
+
+                for array in blobs:
+                    f.write(b"\0" * (ModelFile._align(f.tell()) - f.tell()))
+                    f.write(np.ascontiguousarray(array).tobytes())
+
+            os.replace(tempPath, filePath)
+        finally:
+            tempPath.unlink(missing_ok=True)
+
+        return filePath
+
+    @staticmethod
+    def Load(path: str | Path, memoryMap: bool = False) -> Network:
+        """
+            Creates the network stored in a model file.
+
+            :param path: The model file.
+            :type path: str | pathlib.Path
+
+            :param memoryMap: Memory-map the weights read-only instead of reading them into memory. Loading then
+            only reads the header, and every process that maps the file shares the weights. The network can only
+            be used for inference though, so it's off by default (like nn.Memory.LoadNetwork).
+            :type memoryMap: bool
+
+            :return: The network.
+            :rtype: nn.Network
+
+            :raises FileNotFoundError: If the file does not exist.
+            :raises TypeError: If the file isn't a model file of a supported version or contains an unknown type.
+        """
+        filePath: Path = Path(path).resolve()
+
+        if not filePath.exists():
+            raise FileNotFoundError(f"The model file does not exist: {filePath}")
+
+        (header, weightsStart) = ModelFile._readHeader(filePath)
+
+        if memoryMap:
+            data: np.ndarray = np.memmap(filePath, dtype=np.uint8, mode="r")
+        else:
+            data: np.ndarray = np.fromfile(filePath, dtype=np.uint8)
+
+        layers: list[Layer] = []
+
+        for entry in header["layers"]:
+            weights: dict[str, np.ndarray] = {}
+            for (name, blob) in entry["weights"].items():
+                dtype: np.dtype = np.dtype(blob["dtype"])
+                start: int      = weightsStart + blob["offset"]
+                size: int       = int(np.prod(blob["shape"])) * dtype.itemsize
+
+                weights[name] = data[start:start + size].view(dtype).reshape(blob["shape"])
+
+            # The layer is created around the stored weights, so none are initialized just to be replaced.
+            layer: Layer = ModelFile._getType(entry["type"], ModelFile.LAYERS).FromWeights(entry["config"], weights)
+
+            if layer.GetDtype() != np.dtype(entry["dtype"]):
+                layer.SetDtype(entry["dtype"])
+
+            layers.append(layer)
+
+        cost: Cost                  = ModelFile._getType(header["cost"]["type"], ModelFile.COSTS)(**header["cost"]["config"])
+        optimizer: Optimizer | None = None
+
+        if header["optimizer"] is not None:
+            optimizer = ModelFile._getType(header["optimizer"]["type"], ModelFile.OPTIMIZERS)(**header["optimizer"]["config"])
+
+        return ModelFile._getType(header["network"], ModelFile.NETWORKS)(layers, cost, optimizer if optimizer is not None else Sgd())
+
+    @staticmethod
+    def _readHeader(path: Path) -> tuple[dict, int]:
+        """
+            :return: The json header and where the weights start in the file.
+            :rtype: tuple[dict, int]
+
+            :raises TypeError: If the file isn't a model file of a supported version.
+        """
+        prefixSize: int = struct.calcsize(ModelFile._HEADER_FORMAT)
+
+        with open(path, "rb") as f:
+            prefix: bytes = f.read(prefixSize)
+
+            if len(prefix) != prefixSize:
+                raise TypeError(f"The file is too small to be a model file: {path}")
+
+            (magic, version, headerSize) = struct.unpack(ModelFile._HEADER_FORMAT, prefix)
+
+            if magic != ModelFile.MAGIC:
+                raise TypeError(f"The file is not a model file: {path}")
+
+            if version != ModelFile.VERSION:
+                raise TypeError(f"Unsupported model file version {version}, expected {ModelFile.VERSION}: {path}")
+
+            header: dict = json.loads(f.read(headerSize).decode("utf-8"))
+
+        return (header, ModelFile._align(prefixSize + headerSize))
+
+    @staticmethod
+    def _getName(value: object, types: dict[str, type]) -> str:
+        name: str = type(value).__name__
+
+        if types.get(name) is not type(value):
+            raise TypeError(f"{name} can't be saved, register it with ModelFile.Register first!")
+
+        return name
+
+    @staticmethod
+    def _getType(name: str, types: dict[str, type]) -> type:
+        if name not in types:
+            raise TypeError(f"Unknown type in model file: {name}!")
+
+        return types[name]
+
+    @staticmethod
+    def _align(offset: int) -> int:
+        return (offset + ModelFile.ALIGNMENT - 1) // ModelFile.ALIGNMENT * ModelFile.ALIGNMENT
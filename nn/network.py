@@ -1,19 +1,53 @@
 from __future__ import annotations
 
+from collections.abc import Callable
 from nn.layer import Layer
 from nn.cost import Cost
+from nn.evaluation_report import EvaluationReport
+from nn.frozen_network import FrozenNetwork
+from nn.optimizer import Optimizer
+from nn.optimizers.sgd import Sgd
+from nn.profiler import Profiler
+from nn.workspace import Workspace
+from mnist.mnist_batch import MnistBatch
 from mnist.mnist_dataloader import MnistDataloader
 import numpy as np
+import time
 
-class Network():
+class Network(Workspace):
     """
         A base class for defining a neural network. Default behaviour is sequential.
+
+        When training, the layers and the cost function reuse their buffers between batches
+        (see nn.Workspace), so after the first batch, training doesn't allocate any new arrays.
+
+        Compute and Evaluate only use the layers' Infer, which doesn't change the layers, so one network can
+        be computed by many threads at once (numpy lets go of the GIL in the matrix multiplications, so the
+        threads really run in parallel). Training the network at the same time isn't safe though.
     """
 
+    # Set on the class so that networks saved before profiling existed still load.
+    _profiler: Profiler | None = None
+
     def __init__(self: "Network") -> None:
-        self._layers: list[Layer] | None = None
-        self._cost: Cost | None          = None
-        self._learningRate: float | None = None
+        self._layers: list[Layer] | None  = None
+        self._cost: Cost | None           = None
+        self._optimizer: Optimizer | None = None
+
+    def __getstate__(self) -> dict:
+        state: dict = super().__getstate__()
+        state.pop("_profiler", None) # The profiler (and its callback) belongs to the run, not the model.
+
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        # Networks saved before optimizers existed only had a learning rate. The learning rate used to only
+        # scale the reported cost, so the gradients were always followed with a step size of 1.
+        if "_learningRate" in state:
+            del state["_learningRate"]
+            state.setdefault("_optimizer", Sgd(1.0))
+
+        self.__dict__.update(state)
 
     def TrainOneEpoch(self, dataloader: MnistDataloader) -> float:
         """
@@ -32,14 +66,17 @@ class Network():
         if self._layers is None or len(self._layers) <= 0:
             raise RuntimeError("The layers are either undefined or there aren't any layers!")
         
-        if self._learningRate is None or self._learningRate < 0:
-            raise RuntimeError("The training rate is not defined or below 0!")
+        if self._optimizer is None:
+            raise RuntimeError("The optimizer has not been defined yet!")
         
         avgCost: float = 0
         batches: int   = 0
 
         while True:
-            batch: list[MnistDataloader.DataPair] = dataloader.ReadOneBatch()
+            if self._profiler is None:
+                batch: MnistBatch = dataloader.ReadOneBatch()
+            else:
+                batch: MnistBatch = self._profiler.Call("network", "read", dataloader.ReadOneBatch)
 
             if len(batch) <= 0: return avgCost / batches if batches > 0 else 0.0 # No more pairs to read.
 
@@ -49,41 +86,108 @@ class Network():
 
             avgCost += cost
 
-    def _trainOneBatch(self, batch: list[MnistDataloader.DataPair]) -> float:
+    def _trainOneBatch(self, batch: MnistBatch | list[MnistDataloader.DataPair]) -> float:
         """
-            Trains one batch!
+            Trains one batch! The whole batch is stacked into one matrix so that every layer
+            only has to do one forward and one backward pass per batch instead of one per image.
 
             :param batch: The batch.
-            :type batch: list[mnist.MnistDataloader.DataPair]
+            :type batch: mnist.MnistBatch | list[mnist.MnistDataloader.DataPair]
 
             :return: Average cost for this batch.
             :rtype: float
         """
-        avgCost: float = 0.0
+        if self._profiler is None:
+            (inputs, expected) = self.StackBatch(batch)
+        else:
+            (inputs, expected) = self._profiler.Call("network", "stack", self.StackBatch, batch)
 
-        for (classification, image) in batch:
-            output: np.ndarray = self._forward(image.GetNormalizedPixels())
+        cost: float = self.AccumulateGradients(inputs, expected)
 
-            expected: np.ndarray     = np.zeros(shape=10)
-            expected[classification] = 1.0 # Ex: [0.0, 0.0, 0.0, 1.0, 0.0, 0.0].
+        self.UpdateLayers(len(batch))
 
-            (derivatives, cost) = self._cost.ComputeCost(output, expected, self._learningRate)
+        return cost / len(batch)
 
-            avgCost += cost
+    def AccumulateGradients(self, inputs: np.ndarray, expected: np.ndarray) -> float:
+        """
+            Runs the forward and backward pass for a batch, which adds the batch's gradients to the
+            gradient buffers of the layers without updating any parameters.
 
-            self._backward(derivatives)
+            :param inputs: The inputs of shape (batch, inputs).
+            :type inputs: numpy.ndarray
 
-        for layer in self._layers:
-            layer.Update(len(batch))
+            :param expected: The expected outputs of shape (batch, outputs).
+            :type expected: numpy.ndarray
 
-        return avgCost / len(batch)
+            :return: The total (summed, not averaged) cost of the batch.
+            :rtype: float
+        """
+        output: np.ndarray = self._forward(inputs)
+
+        # If the cost function can be fused with the last layer (ex: softmax + cross entropy), the cost function
+        # gives the derivatives in terms of the last layer's inputs directly and the last layer's backward pass is skipped.
+        fused: bool           = self._cost.FusesWith(self._layers[-1])
+        computeCost: Callable = self._cost.ComputeFusedCost if fused else self._cost.ComputeCost
+
+        if self._profiler is None:
+            (derivatives, cost) = computeCost(output, expected)
+        else:
+            (derivatives, cost) = self._profiler.Call("network", "cost", computeCost, output, expected)
+
+        self._backward(derivatives, self._layers[:-1] if fused else self._layers)
+
+        return cost
+
+    def UpdateLayers(self, batchSize: int) -> None:
+        """
+            Updates the parameters of all layers with the network's optimizer and resets the gradients.
+
+            :param batchSize: The amount of samples the gradients were accumulated over.
+            :type batchSize: int
+        """
+        if self._profiler is None:
+            for layer in self._layers:
+                layer.Update(batchSize, self._optimizer)
+
+            return
+
+        for (index, layer) in enumerate(self._layers):
+            self._profiler.Call(f"{index}:{type(layer).__name__}", "update", layer.Update, batchSize, self._optimizer)
+
+    def StackBatch(self, batch: MnistBatch | list[MnistDataloader.DataPair]) -> tuple[np.ndarray, np.ndarray]:
+        """
+            Stacks a batch of data pairs into an input matrix and a matrix of expected outputs.
+
+            :param batch: The batch.
+            :type batch: mnist.MnistBatch | list[mnist.MnistDataloader.DataPair]
+
+            :return: The inputs of shape (batch, inputs) and the one hot encoded expected outputs of shape (batch, outputs).
+            :rtype: tuple[numpy.ndarray, numpy.ndarray]
+        """
+        # Written row by row into the network's buffers, instead of building new matrices for every batch.
+        inputs: np.ndarray   = self._buffer("inputs", (len(batch), self._layers[0].GetInputSize()), self.GetDtype())
+        expected: np.ndarray = self._buffer("expected", (len(batch), self._layers[-1].GetOutputSize()), self._layers[-1].GetDtype())
+
+        expected.fill(0.0)
+
+        if isinstance(batch, MnistBatch):
+            # Already one matrix, converted straight into the buffer.
+            batch.GetNormalizedPixels(out=inputs)
+            expected[np.arange(len(batch)), batch.GetLabels()] = 1.0
+
+            return (inputs, expected)
+
+        for (row, (classification, image)) in enumerate(batch):
+            inputs[row]                   = image.GetNormalizedPixels()
+            expected[row, classification] = 1.0 # Ex: [0.0, 0.0, 0.0, 1.0, 0.0, 0.0] for each row.
+
+        return (inputs, expected)
 
-        
     def _forward(self, inputs: np.ndarray) -> np.ndarray:
         """
             Forwards all the layers and returns the output of the last layer.
 
-            :param inputs: The inputs to the network.
+            :param inputs: The inputs to the network. Either one vector or a batch matrix of shape (batch, inputs).
             :type inputs: numpy.ndarray
 
             :return: The last layer's output.
@@ -91,76 +195,252 @@ class Network():
         """
         lastOutput: np.ndarray = inputs
 
-        for layer in self._layers:
-            output: np.ndarray = layer.Forward(lastOutput)
+        if self._profiler is None:
+            for layer in self._layers:
+                output: np.ndarray = layer.Forward(lastOutput)
+                lastOutput         = output
+
+            return output
+
+        for (index, layer) in enumerate(self._layers):
+            output: np.ndarray = self._profiler.Call(f"{index}:{type(layer).__name__}", "forward", layer.Forward, lastOutput)
             lastOutput         = output
 
         return output
     
-    def _backward(self, derivatives: np.ndarray) -> None:
+    def _infer(self, inputs: np.ndarray) -> np.ndarray:
         """
-            Performs the backward pass for all layers. Only used when training.
+            Infers all the layers and returns the output of the last layer. Nothing is stored in the
+            network or the layers, see nn.Layer.Infer.
+
+            :param inputs: The inputs to the network. Either one vector or a batch matrix of shape (batch, inputs).
+            :type inputs: numpy.ndarray
+
+            :return: The last layer's output, a new array.
+            :rtype: numpy.ndarray
+        """
+        output: np.ndarray = inputs
+
+        if self._profiler is None:
+            for layer in self._layers:
+                output = layer.Infer(output)
+
+            return output
+
+        for (index, layer) in enumerate(self._layers):
+            output = self._profiler.Call(f"{index}:{type(layer).__name__}", "infer", layer.Infer, output)
+
+        return output
+
+    def _backward(self, derivatives: np.ndarray, layers: list[Layer]) -> None:
+        """
+            Performs the backward pass for all given layers, last layer first. Only used when training.
 
             :param derivatives: The derivatives fetched from the cost function.
             :type derivatives: numpy.ndarray
+
+            :param layers: The layers to run the backward pass on, in forward order.
+            :type layers: list[nn.Layer]
         """
         lastDerivatives: np.ndarray = derivatives
 
-        for layer in reversed(self._layers):
-            derivatives: np.ndarray = layer.Backward(lastDerivatives)
+        if self._profiler is None:
+            for layer in reversed(layers):
+                derivatives: np.ndarray = layer.Backward(lastDerivatives)
+                lastDerivatives         = derivatives
+
+            return
+
+        # The given layers always start at the first layer, so their index is the same as in the network.
+        for index in reversed(range(len(layers))):
+            layer: Layer            = layers[index]
+            derivatives: np.ndarray = self._profiler.Call(f"{index}:{type(layer).__name__}", "backward", layer.Backward, lastDerivatives)
             lastDerivatives         = derivatives
     
     def Compute(self, inputs: np.ndarray) -> np.ndarray:
         """
-            Computes the model and returns the output.
+            Computes the model and returns the output. Doesn't change the network, so it can be called
+            from several threads at once.
 
-            :param inputs: The inputs to evaluate.
+            :param inputs: The inputs to evaluate. Either one vector or a batch matrix of shape (batch, inputs).
             :type inputs: numpy.ndarray
 
-            :return: The output of the model.
+            :return: The output of the model, one row per sample if a batch was given.
             :rtype: numpy.ndarray
         """        
         if self._layers is None or len(self._layers) <= 0:
             raise RuntimeError("The layers are either undefined or there aren't any layers!")
         
-        outputs: np.ndarray = self._forward(inputs)
-
-        return outputs
+        return self._infer(np.asarray(inputs, dtype=self.GetDtype()))
     
-    def Evaluate(self, dataloader: MnistDataloader) -> float:
+    def Freeze(self) -> FrozenNetwork:
+        """
+            Compiles the trained network into an immutable object that only does inference, but faster (see nn.FrozenNetwork).
+            Later training doesn't change the frozen network.
+
+            :return: The frozen network, which computes the same outputs as Compute.
+            :rtype: nn.FrozenNetwork
+        """
+        if self._layers is None or len(self._layers) <= 0:
+            raise RuntimeError("The layers are either undefined or there aren't any layers!")
+
+        return FrozenNetwork(self._layers)
+
+    def Evaluate(self, dataloader: MnistDataloader, chunkSize: int | None = None) -> float:
         """
             Evaluates the model and return what accuracy it has, from 0 to 1.
 
             :param dataloader: The one responsible for loading the evaluation data.
             :type dataloader: mnist.MnistDataloader
 
+            :param chunkSize: The amount of images computed at once, see EvaluateReport.
+            :type chunkSize: int | None
+
             :return: The accuracy of this model.
             :rtype: float
         """
+        return self.EvaluateReport(dataloader, chunkSize).GetAccuracy()
+
+    def EvaluateReport(self, dataloader: MnistDataloader, chunkSize: int | None = None) -> EvaluationReport:
+        """
+            Evaluates the model on everything the dataloader has left to read. The images are read in chunks
+            which are stacked into one matrix each, so every chunk takes one forward pass and the predictions
+            are compared to the labels all at once.
+
+            :param dataloader: The one responsible for loading the evaluation data.
+            :type dataloader: mnist.MnistDataloader
+
+            :param chunkSize: The amount of images computed at once, bounding the memory used. Defaults to the batch
+            size of the dataloader. Only used if the dataloader can read arrays (mnist.MnistDataloader.ReadArrays),
+            otherwise one batch at a time is read (ex: mnist.PrefetchDataloader).
+            :type chunkSize: int | None
+
+            :return: The accuracy together with how long it took.
+            :rtype: nn.EvaluationReport
+        """
 
         if self._layers is None or len(self._layers) <= 0:
             raise RuntimeError("The layers are either undefined or there aren't any layers!")
 
         correct: int = 0
         total: int   = 0
+        start: float = time.perf_counter()
 
         while True:
-            batch: list[MnistDataloader.DataPair] = dataloader.ReadOneBatch()
+            (labels, inputs) = self._readEvaluationChunk(dataloader, chunkSize)
 
-            if len(batch) <= 0:
+            if len(labels) <= 0:
                 break  # no more data to read.
 
-            for (label, image) in batch:
-                output: np.ndarray = self.Compute(image.GetNormalizedPixels())
+            outputs: np.ndarray   = self._infer(np.asarray(inputs, dtype=self.GetDtype()))
+            predicted: np.ndarray = np.argmax(outputs, axis=1)
+
+            correct += int(np.count_nonzero(predicted == labels))
+            total   += len(labels)
+
+        return EvaluationReport(correct, total, time.perf_counter() - start)
+
+    def _readEvaluationChunk(self, dataloader: MnistDataloader, chunkSize: int | None) -> tuple[np.ndarray, np.ndarray]:
+        """
+            Reads the next chunk of images to evaluate as a label array and an input matrix.
+
+            :return: The labels of shape (images,) and the inputs of shape (images, inputs).
+            :rtype: tuple[numpy.ndarray, numpy.ndarray]
+        """
+        if hasattr(dataloader, "ReadArrays"):
+            return dataloader.ReadArrays(chunkSize)
+
+        batch: MnistBatch | list[MnistDataloader.DataPair] = dataloader.ReadOneBatch()
+
+        if isinstance(batch, MnistBatch):
+            return (batch.GetLabels(), batch.GetNormalizedPixels().astype(self.GetDtype(), copy=False))
+
+        labels: np.ndarray = np.array([label for (label, _) in batch], dtype=np.int64)
+        inputs: np.ndarray = np.array([image.GetNormalizedPixels() for (_, image) in batch], dtype=self.GetDtype())
+
+        return (labels, inputs)
+
+    def EnableProfiling(self, profiler: Profiler | None = None) -> Profiler:
+        """
+            Starts measuring every layer's forward, backward and update, the cost function, stacking the batches
+            and waiting on the dataloader (see nn.Profiler).
 
-                predicted: int = int(np.argmax(output))
+            :param profiler: The profiler to record into. A new one is created if None.
+            :type profiler: nn.Profiler | None
 
-                if predicted == label:
-                    correct += 1
+            :return: The profiler, to read the report from.
+            :rtype: nn.Profiler
+        """
+        if self._profiler is not None and self._profiler is not profiler:
+            self._profiler.Close()
+
+        self._profiler = profiler if profiler is not None else Profiler()
+
+        return self._profiler
+
+    def DisableProfiling(self) -> Profiler | None:
+        """
+            Stops measuring, and stops the profiler's allocation tracing (see nn.Profiler.Close).
+
+            :return: The profiler that was used, if any. Its report can still be read.
+            :rtype: nn.Profiler | None
+        """
+        profiler: Profiler | None = self._profiler
+        self._profiler            = None
 
-                total += 1
+        if profiler is not None:
+            profiler.Close()
 
-        return correct / total if total > 0 else 0.0
+        return profiler
+
+    def GetProfiler(self) -> Profiler | None:
+        return self._profiler
+
+    def GetLayers(self) -> list[Layer]:
+        """
+            :return: The layers of the network, in forward order. Not a copy, so changing the layers changes the network.
+            :rtype: list[nn.Layer]
+        """
+        if self._layers is None or len(self._layers) <= 0:
+            raise RuntimeError("The layers are either undefined or there aren't any layers!")
+
+        return self._layers
+
+    def GetDtype(self) -> np.dtype:
+        """
+            :return: The floating point type the network takes its inputs in, which is the type of the first layer.
+            :rtype: numpy.dtype
+        """
+        if self._layers is None or len(self._layers) <= 0:
+            raise RuntimeError("The layers are either undefined or there aren't any layers!")
+
+        return self._layers[0].GetDtype()
+
+    def GetInputSize(self) -> int:
+        if self._layers is None or len(self._layers) <= 0:
+            raise RuntimeError("The layers are either undefined or there aren't any layers!")
+
+        return self._layers[0].GetInputSize()
+
+    def GetOutputSize(self) -> int:
+        if self._layers is None or len(self._layers) <= 0:
+            raise RuntimeError("The layers are either undefined or there aren't any layers!")
+
+        return self._layers[-1].GetOutputSize()
+
+    def SetDtype(self, dtype: np.typing.DTypeLike) -> None:
+        """
+            Sets the floating point type of every layer, converting the parameters. Ex: numpy.float32 halves the memory
+            used and moved around, and the matrix multiplications run about twice as fast.
+
+            :param dtype: The floating point type.
+            :type dtype: numpy.typing.DTypeLike
+        """
+        if self._layers is None:
+            raise RuntimeError("Layers of a neural network has not been initialized yet!")
+
+        for layer in self._layers:
+            layer.SetDtype(dtype)
 
     def CheckLayerConnection(self) -> None:
         """
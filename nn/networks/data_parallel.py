@@ -0,0 +1,386 @@
+from __future__ import annotations
+
+from multiprocessing.connection import Connection
+from multiprocessing.shared_memory import SharedMemory
+from mnist.mnist_batch import MnistBatch
+from nn.network import Network
+from nn.profiler import Profiler
+from mnist.mnist_dataloader import MnistDataloader
+import multiprocessing
+import numpy as np
+import os
+import sys
+import time
+import traceback
+import warnings
+
+class DataParallel():
+    """
+        Trains a network on several processes at once. Every worker process holds a replica of the
+        network's layers. Each batch is split into one shard per worker, every worker computes the
+        gradients of its shard and writes them into shared memory, and the gradients are then summed
+        up and applied once to the original network.
+
+        Since the gradients of a batch are just the sum of the gradients of its samples, the result is
+        the same as training the network on one process, up to floating point rounding.
+
+        Every process uses BLAS for its own matrix multiplications, so with many workers it's a good
+        idea to limit the BLAS threads per process (ex: OMP_NUM_THREADS=1) to not oversubscribe the cores.
+
+        Every batch costs a round trip to every worker and a sum over their gradients, so small batches train
+        slower than on one process. On a single core, 2 workers were 40% slower than 1 at a batch size of 8 and
+        2-10% slower at 2048, so there it never breaks even. With one core per worker it only pays off from
+        batches of several hundred images; the train_data_parallel entries of the benchmarks (python -m benchmarks)
+        show where it breaks even on a given machine. Workers only get whole rows, so with more workers than rows
+        in a batch, the extra workers sit idle (TrainOnArrays warns about it once).
+    """
+
+    def __init__(self: "DataParallel", network: Network, workers: int | None = None) -> None:
+        """
+            :param network: The network to train. Its parameters are the ones being updated.
+            :type network: nn.Network
+
+            :param workers: The amount of worker processes. Defaults to the amount of cores.
+            :type workers: int | None
+
+            :raises TypeError: If workers is lower than 1.
+        """
+        workerCount: int = (os.cpu_count() or 1) if workers is None else workers
+
+        if workerCount < 1:
+            raise TypeError("The amount of data parallel workers can't be lower than 1!")
+
+        self._network: Network = network
+        self._warnedIdle: bool = False
+
+        # All parameters are laid out after each other in one flat buffer, and so are the gradients of every worker.
+        parameters: list[np.ndarray] = [parameter for layer in network.GetLayers() for (parameter, _) in layer.GetParameters()]
+        self._dtype: np.dtype        = np.result_type(*parameters) if len(parameters) > 0 else np.dtype(np.float64)
+        self._layout: list[tuple[int, tuple[int, ...]]] = []
+
+        offset: int = 0
+        for parameter in parameters:
+            self._layout.append((offset, parameter.shape))
+            offset += parameter.size
+
+        itemSize: int = self._dtype.itemsize
+        self._parameterMemory: SharedMemory = SharedMemory(create=True, size=max(1, offset * itemSize))
+        self._gradientMemory: SharedMemory  = SharedMemory(create=True, size=max(1, workerCount * offset * itemSize))
+
+        self._sharedParameters: np.ndarray = np.ndarray((offset,), dtype=self._dtype, buffer=self._parameterMemory.buf)
+        self._sharedGradients: np.ndarray  = np.ndarray((workerCount, offset), dtype=self._dtype, buffer=self._gradientMemory.buf)
+        self._summedGradients: np.ndarray  = np.zeros(offset, dtype=self._dtype)
+
+        # The input buffers are created when the first batch arrives, since the batch size isn't known before that.
+        self._inputMemory: SharedMemory | None    = None
+        self._expectedMemory: SharedMemory | None = None
+        self._capacity: int                       = 0
+
+        # Fork is used where it exists since the replicas then don't have to be pickled and sent over.
+        methods: list[str] = multiprocessing.get_all_start_methods()
+        context            = multiprocessing.get_context("fork" if "fork" in methods else "spawn")
+
+        self._connections: list[Connection]  = []
+        self._processes: list[multiprocessing.Process] = []
+
+        for index in range(workerCount):
+            (parentConnection, childConnection) = context.Pipe()
+
+            process = context.Process(
+                target=_work,
+                args=(childConnection, network, self._parameterMemory.name, self._gradientMemory.name, workerCount, index),
+                daemon=True
+            )
+            process.start()
+            childConnection.close()
+
+            self._connections.append(parentConnection)
+            self._processes.append(process)
+
+    def TrainOneEpoch(self, dataloader: MnistDataloader) -> float:
+        """
+            Goes through all the batches defined by the dataloader and trains the network,
+            splitting every batch over the workers.
+
+            :param dataloader: The one responsible for loading the training data.
+            :type dataloader: mnist.MnistDataloader
+
+            :return: The average cost for this epoch.
+            :rtype: float
+        """
+        avgCost: float = 0.0
+        batches: int   = 0
+
+        while True:
+            # Profiled like nn.Network.TrainOneEpoch if the network has profiling enabled.
+            profiler: Profiler | None = self._network.GetProfiler()
+
+            if profiler is None:
+                batch: MnistBatch = dataloader.ReadOneBatch()
+            else:
+                batch: MnistBatch = profiler.Call("network", "read", dataloader.ReadOneBatch)
+
+            if len(batch) <= 0: return avgCost / batches if batches > 0 else 0.0 # No more pairs to read.
+
+            batches += 1
+
+            avgCost += self._trainOneBatch(batch)
+
+    def _trainOneBatch(self, batch: MnistBatch | list[MnistDataloader.DataPair]) -> float:
+        """
+            Trains one batch by splitting it over the workers.
+
+            :param batch: The batch.
+            :type batch: mnist.MnistBatch | list[mnist.MnistDataloader.DataPair]
+
+            :return: Average cost for this batch.
+            :rtype: float
+        """
+        (inputs, expected) = self._network.StackBatch(batch)
+
+        return self.TrainOnArrays(inputs, expected)
+
+    def TrainOnArrays(self, inputs: np.ndarray, expected: np.ndarray) -> float:
+        """
+            Trains one batch given as matrices. Warns once if the batch has fewer rows than there are workers.
+
+            :param inputs: The inputs of shape (batch, inputs).
+            :type inputs: numpy.ndarray
+
+            :param expected: The expected outputs of shape (batch, outputs).
+            :type expected: numpy.ndarray
+
+            :return: Average cost for this batch.
+            :rtype: float
+        """
+        if len(self._processes) <= 0:
+            raise RuntimeError("The data parallel trainer has been closed!")
+
+        batchSize: int = len(inputs)
+
+        if batchSize < len(self._connections) and not self._warnedIdle:
+            self._warnedIdle = True
+            warnings.warn(f"A batch of {batchSize} rows is split over {len(self._connections)} data parallel workers, so some of them sit idle. "
+                          f"Use a batch size of at least the amount of workers.", RuntimeWarning, stacklevel=2)
+
+        if batchSize > self._capacity:
+            self._createInputBuffers(batchSize, inputs.shape[1], expected.shape[1])
+
+        self._sharedInputs[:batchSize]   = inputs
+        self._sharedExpected[:batchSize] = expected
+
+        # Publish the current parameters for the replicas.
+        self._publishParameters()
+
+        # Contiguous shards of (almost) the same size, one per worker. Workers without any rows are skipped.
+        bounds: np.ndarray = np.linspace(0, batchSize, len(self._connections) + 1).astype(int)
+        active: list[int]  = [index for index in range(len(self._connections)) if bounds[index + 1] > bounds[index]]
+
+        start: float = time.perf_counter()
+
+        for index in active:
+            self._connections[index].send(("train", int(bounds[index]), int(bounds[index + 1])))
+
+        cost: float = sum(self._receiveAll(active))
+
+        # The layers run inside the workers, so only the time of the whole forward and backward pass is known here.
+        if self._network.GetProfiler() is not None:
+            self._network.GetProfiler().Record("workers", "gradients", time.perf_counter() - start)
+
+        # Sum the gradients of every worker and hand them to the network's own gradient buffers.
+        np.sum(self._sharedGradients[active], axis=0, out=self._summedGradients)
+        self._copyGradients()
+
+        self._network.UpdateLayers(batchSize)
+
+        return cost / batchSize
+
+    def _createInputBuffers(self, rows: int, inputSize: int, outputSize: int) -> None:
+        """
+            (Re)creates the shared input buffers so they fit a batch of the given size and tells the workers about them.
+        """
+        self._closeInputBuffers()
+
+        itemSize: int = self._dtype.itemsize
+
+        self._inputMemory    = SharedMemory(create=True, size=rows * inputSize * itemSize)
+        self._expectedMemory = SharedMemory(create=True, size=rows * outputSize * itemSize)
+        self._capacity       = rows
+
+        self._sharedInputs: np.ndarray   = np.ndarray((rows, inputSize), dtype=self._dtype, buffer=self._inputMemory.buf)
+        self._sharedExpected: np.ndarray = np.ndarray((rows, outputSize), dtype=self._dtype, buffer=self._expectedMemory.buf)
+
+        for connection in self._connections:
+            connection.send(("inputs", self._inputMemory.name, self._expectedMemory.name, rows, inputSize, outputSize))
+
+        self._receiveAll(list(range(len(self._connections))))
+
+    def _receiveAll(self, indices: list[int]) -> list:
+        """
+            Waits for the answers of the given workers, raising the error of the first one that failed. Every answer
+            is read before raising, so none is left in a pipe to be taken for the answer to the next message.
+
+            :return: The answers, in the order of the indices.
+            :rtype: list
+        """
+        replies: list[tuple[str, object]] = [self._connections[index].recv() for index in indices]
+
+        for (index, (status, value)) in zip(indices, replies):
+            if status == "error":
+                raise RuntimeError(f"Data parallel worker {index} failed:\n{value}")
+
+        return [value for (_, value) in replies]
+
+    def _publishParameters(self) -> None:
+        """
+            Copies the network's parameters into the shared parameter buffer.
+        """
+        parameters: list[np.ndarray] = [parameter for layer in self._network.GetLayers() for (parameter, _) in layer.GetParameters()]
+
+        for (parameter, (offset, shape)) in zip(parameters, self._layout):
+            self._sharedParameters[offset:offset + parameter.size] = parameter.reshape(-1)
+
+    def _copyGradients(self) -> None:
+        """
+            Adds the summed gradients of the workers to the network's gradient buffers.
+        """
+        gradients: list[np.ndarray] = [gradient for layer in self._network.GetLayers() for (_, gradient) in layer.GetParameters()]
+
+        for (gradient, (offset, shape)) in zip(gradients, self._layout):
+            gradient += self._summedGradients[offset:offset + gradient.size].reshape(shape)
+
+    def Close(self) -> None:
+        """
+            Stops the worker processes and frees the shared memory.
+        """
+        if len(self._processes) <= 0:
+            return # Already closed.
+
+        for connection in self._connections:
+            try:
+                connection.send(("stop",))
+            except (BrokenPipeError, OSError):
+                pass
+
+        for process in self._processes:
+            process.join()
+
+        for connection in self._connections:
+            connection.close()
+
+        self._connections = []
+        self._processes   = []
+
+        self._closeInputBuffers()
+
+        for memory in (self._parameterMemory, self._gradientMemory):
+            memory.close()
+            memory.unlink()
+
+    def _closeInputBuffers(self) -> None:
+        for memory in (self._inputMemory, self._expectedMemory):
+            if memory is not None:
+                memory.close()
+                memory.unlink()
+
+        self._inputMemory    = None
+        self._expectedMemory = None
+        self._capacity       = 0
+
+    def __enter__(self) -> "DataParallel":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.Close()
+
+    def __del__(self):
+        if hasattr(self, "_processes") and self._processes:
+            self.Close()
+
+def _work(connection: Connection, network: Network, parameterName: str, gradientName: str, workerCount: int, index: int) -> None:
+    """
+        The loop of a worker process. Waits for shards to train on and writes the gradients of
+        each shard into its own row of the shared gradient buffer.
+
+        :param connection: The connection to the trainer.
+        :param network: The replica of the network.
+        :param parameterName: Name of the shared memory with the current parameters.
+        :param gradientName: Name of the shared memory with the gradients of all workers.
+        :param workerCount: The amount of workers.
+        :param index: The index of this worker.
+    """
+    parameterMemory: SharedMemory     = _attach(parameterName)
+    gradientMemory: SharedMemory      = _attach(gradientName)
+    inputMemories: list[SharedMemory] = []
+    inputs: np.ndarray | None         = None
+    expected: np.ndarray | None       = None
+
+    network.DisableProfiling() # The replica's measurements would never reach the trainer.
+
+    pairs: list[tuple[np.ndarray, np.ndarray]] = [pair for layer in network.GetLayers() for pair in layer.GetParameters()]
+    dtype: np.dtype                            = np.result_type(*[parameter for (parameter, _) in pairs]) if len(pairs) > 0 else np.dtype(np.float64)
+    parameterCount: int                        = sum(parameter.size for (parameter, _) in pairs)
+
+    sharedParameters: np.ndarray = np.ndarray((parameterCount,), dtype=dtype, buffer=parameterMemory.buf)
+    sharedGradients: np.ndarray  = np.ndarray((workerCount, parameterCount), dtype=dtype, buffer=gradientMemory.buf)[index]
+
+    try:
+        while True:
+            message: tuple = connection.recv()
+
+            try:
+                if message[0] == "stop":
+                    break
+
+                if message[0] == "inputs":
+                    (_, inputName, expectedName, rows, inputSize, outputSize) = message
+
+                    inputs = expected = None
+
+                    for memory in inputMemories:
+                        memory.close()
+
+                    inputMemories = [_attach(inputName), _attach(expectedName)]
+                    inputs        = np.ndarray((rows, inputSize), dtype=dtype, buffer=inputMemories[0].buf)
+                    expected      = np.ndarray((rows, outputSize), dtype=dtype, buffer=inputMemories[1].buf)
+
+                    connection.send(("ok", 0.0))
+                    continue
+
+                (_, start, stop) = message
+
+                # Take the newest parameters and start from empty gradients.
+                offset: int = 0
+                for (parameter, gradient) in pairs:
+                    parameter.reshape(-1)[:] = sharedParameters[offset:offset + parameter.size]
+                    gradient.fill(0.0)
+                    offset += parameter.size
+
+                cost: float = network.AccumulateGradients(inputs[start:stop], expected[start:stop])
+
+                offset = 0
+                for (_, gradient) in pairs:
+                    sharedGradients[offset:offset + gradient.size] = gradient.reshape(-1)
+                    offset += gradient.size
+
+                connection.send(("ok", float(cost)))
+            except Exception:
+                connection.send(("error", traceback.format_exc()))
+    finally:
+        # The arrays have to let go of the buffers before the shared memory can be closed.
+        sharedParameters = sharedGradients = inputs = expected = None
+
+        for memory in [parameterMemory, gradientMemory, *inputMemories]:
+            memory.close()
+
+        connection.close()
+
+def _attach(name: str) -> SharedMemory:
+    """
+        Attaches to shared memory created by the trainer. The trainer owns it, so the worker
+        shouldn't register it for clean up (only possible to opt out of from python 3.13).
+    """
+    if sys.version_info >= (3, 13):
+        return SharedMemory(name=name, track=False)
+
+    return SharedMemory(name=name)
@@ -3,25 +3,36 @@ from __future__ import annotations
 from nn.network import Network
 from nn.layer import Layer
 from nn.cost import Cost
+from nn.optimizer import Optimizer
+from nn.optimizers.sgd import Sgd
 from mnist.mnist_dataloader import MnistDataloader
+import numpy as np
 
 class Sequential(Network):
     """
         A sequential network executes layers in sequence.
     """
 
-    def __init__(self: "Sequential", layers: list[Layer], cost: Cost, learningRate: float = 0.01) -> None:
+    def __init__(self: "Sequential", layers: list[Layer], cost: Cost, optimizer: Optimizer | float = 0.01, dtype: np.typing.DTypeLike | None = None) -> None:
         """
             :param layers: A list of layers, computed in sequence of each other.
             :type layers: list[nn.Layer]
 
-            :param cost: The cost object to take care of calculating the error.
+            :param cost: The cost object to take care of calculating the error. If the cost can be fused with the
+            last layer (ex: nn.costs.CrossEntropy after a nn.layers.Softmax), training skips that layer's backward pass.
             :type cost: nn.Cost
 
-            :param learningRate: The rate at which learning will occur. Lower values often mean more stable
-            but longer training time.
-            :type learningRate: float
+            :param optimizer: The optimizer that updates the parameters after every batch (ex: nn.optimizers.Adam).
+            A number is used as the learning rate of plain SGD (nn.optimizers.Sgd).
+            :type optimizer: nn.Optimizer | float
+
+            :param dtype: The floating point type of the whole network (ex: numpy.float32 to halve the memory traffic).
+            Sets the type of every layer. If None, every layer keeps the type it was created with.
+            :type dtype: numpy.typing.DTypeLike | None
         """
         self._layers: list[Layer] = layers
         self._cost: Cost          = cost
-        self._learningRate: float = learningRate
\ No newline at end of file
+        self._optimizer: Optimizer = optimizer if isinstance(optimizer, Optimizer) else Sgd(optimizer)
+
+        if dtype is not None:
+            self.SetDtype(dtype)
\ No newline at end of file
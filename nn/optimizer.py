@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import numpy as np
+
+class Optimizer():
+    """
+        The optimizer class is a base class for all optimizers. It's purpose is to take
+        the gradients accumulated over a batch and use them to change the parameters so
+        that the cost goes down.
+
+        An optimizer doesn't keep any state itself, so the same optimizer can be used for every layer.
+        The state it needs per parameter (ex: the momentum) is kept in a dictionary which the layer owns,
+        right next to the parameter (see nn.Layer.Update), and is saved together with the layer.
+    """
+
+    def Step(self, parameter: np.ndarray, gradient: np.ndarray, state: dict, batchSize: int) -> None:
+        """
+            Should be implemented by another class and should update the parameter in place.
+            The gradient may be used as scratch space, since it's reset after the step.
+
+            :param parameter: The parameter to update.
+            :type parameter: numpy.ndarray
+
+            :param gradient: The gradient of the parameter, summed over the batch.
+            :type gradient: numpy.ndarray
+
+            :param state: The optimizer's state for this parameter. Empty on the first step.
+            :type state: dict
+
+            :param batchSize: The amount of samples the gradient was summed over.
+            :type batchSize: int
+        """
+        raise NotImplementedError("Can't use the Optimizer class own Step!")
+
+    def GetConfig(self) -> dict:
+        """
+            Gets the arguments the optimizer was created with, so that it can be created again when
+            loading a saved network (see nn.ModelFile).
+
+            :return: The keyword arguments of the constructor. Only json values.
+            :rtype: dict
+        """
+        raise NotImplementedError("Can't use the Optimizer class own GetConfig!")
+
+    def _stateBuffer(self, state: dict, name: str, parameter: np.ndarray) -> np.ndarray:
+        """
+            Gets a state buffer of the same shape and type as the parameter, starting out as zeros.
+            If the parameter changed type (see nn.Layer.SetDtype), the buffer is converted as well.
+
+            :return: The state buffer.
+            :rtype: numpy.ndarray
+        """
+        buffer: np.ndarray | None = state.get(name)
+
+        if buffer is None or buffer.shape != parameter.shape:
+            buffer      = np.zeros_like(parameter)
+            state[name] = buffer
+        elif buffer.dtype != parameter.dtype:
+            buffer      = buffer.astype(parameter.dtype)
+            state[name] = buffer
+
+        return buffer
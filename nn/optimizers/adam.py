@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from nn.optimizer import Optimizer
+import math
+import numpy as np
+
+class Adam(Optimizer):
+    """
+        Adam - Adaptive Moment Estimation, keeps a running average of the gradients (the first moment, like
+        momentum) and of the squared gradients (the second moment). Every parameter's step is divided by the
+        square root of its second moment, so parameters with small gradients take as big steps as the ones with
+        large gradients. It usually needs far fewer epochs than SGD and is not very picky about the learning rate.
+    """
+
+    def __init__(self: "Adam", learningRate: float = 0.001, beta1: float = 0.9, beta2: float = 0.999, epsilon: float = 1e-8):
+        """
+            :param learningRate: The size of the steps.
+            :type learningRate: float
+
+            :param beta1: How much of the running average of the gradients to keep every step.
+            :type beta1: float
+
+            :param beta2: How much of the running average of the squared gradients to keep every step.
+            :type beta2: float
+
+            :param epsilon: Small value that keeps the division from blowing up when the second moment is 0.
+            :type epsilon: float
+        """
+        if learningRate <= 0:
+            raise RuntimeError("Learning rate has to be bigger than 0!")
+
+        if not (0 <= beta1 < 1 and 0 <= beta2 < 1):
+            raise RuntimeError("The betas have to be in the range [0, 1)!")
+
+        self._learningRate: float = learningRate
+        self._beta1: float        = beta1
+        self._beta2: float        = beta2
+        self._epsilon: float      = epsilon
+
+    def GetConfig(self) -> dict:
+        return {"learningRate": self._learningRate, "beta1": self._beta1, "beta2": self._beta2, "epsilon": self._epsilon}
+
+    def Step(self, parameter: np.ndarray, gradient: np.ndarray, state: dict, batchSize: int) -> None:
+        """
+            The moments start at 0, which biases them towards 0 for the first steps. Instead of correcting both
+            moments, the correction is folded into the step size and epsilon, which gives the same update:
+            parameter -= stepSize * moment / (sqrt(squaredMoment) + epsilonHat). Everything is done in place,
+            using the gradient as scratch space.
+        """
+        moment: np.ndarray        = self._stateBuffer(state, "moment", parameter)
+        squaredMoment: np.ndarray = self._stateBuffer(state, "squaredMoment", parameter)
+        step: int                 = state.get("step", 0) + 1
+        state["step"]             = step
+
+        gradient *= 1.0 / batchSize
+
+        # moment = beta1 * moment + (1 - beta1) * gradient, written as beta1 * (moment - gradient) + gradient.
+        moment -= gradient
+        moment *= self._beta1
+        moment += gradient
+
+        # The same for the squared gradients.
+        np.square(gradient, out=gradient)
+        squaredMoment -= gradient
+        squaredMoment *= self._beta2
+        squaredMoment += gradient
+
+        secondCorrection: float = math.sqrt(1.0 - self._beta2 ** step)
+        stepSize: float         = self._learningRate * secondCorrection / (1.0 - self._beta1 ** step)
+
+        np.sqrt(squaredMoment, out=gradient)
+        gradient += self._epsilon * secondCorrection
+        np.divide(moment, gradient, out=gradient)
+        gradient *= stepSize
+        parameter -= gradient
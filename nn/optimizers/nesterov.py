@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from nn.optimizers.sgd import Sgd
+import numpy as np
+
+class Nesterov(Sgd):
+    """
+        SGD with Nesterov momentum. Normal momentum steps with the velocity, Nesterov also looks
+        ahead: it steps with gradient + momentum * velocity, which is roughly the velocity of the
+        next step. That makes it correct itself earlier when it's about to overshoot.
+    """
+
+    def __init__(self: "Nesterov", learningRate: float = 0.01, momentum: float = 0.9):
+        """
+            :param learningRate: The size of the steps.
+            :type learningRate: float
+
+            :param momentum: How much of the last step to keep, bigger than 0 and below 1.
+            :type momentum: float
+        """
+        if momentum <= 0:
+            raise RuntimeError("Nesterov momentum has to be bigger than 0!")
+
+        super().__init__(learningRate, momentum)
+
+    def _applyVelocity(self, parameter: np.ndarray, gradient: np.ndarray, velocity: np.ndarray) -> None:
+        """
+            parameter -= learningRate * (gradient + momentum * velocity), split into two in place steps.
+        """
+        gradient *= self._learningRate
+        parameter -= gradient
+
+        np.multiply(velocity, self._learningRate * self._momentum, out=gradient)
+        parameter -= gradient
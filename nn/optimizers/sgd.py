@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from nn.optimizer import Optimizer
+import numpy as np
+
+class Sgd(Optimizer):
+    """
+        SGD - Stochastic Gradient Descent, takes a step against the average gradient of the batch:
+        parameter -= learningRate * gradient. With momentum, the steps are averaged over time instead,
+        which smooths out the noise of small batches and speeds up in directions where the gradients agree.
+    """
+
+    def __init__(self: "Sgd", learningRate: float = 0.01, momentum: float = 0.0):
+        """
+            :param learningRate: The size of the steps. Lower values often mean more stable but longer training time.
+            :type learningRate: float
+
+            :param momentum: How much of the last step to keep, from 0 (plain SGD) to below 1. Ex: 0.9.
+            :type momentum: float
+        """
+        if learningRate <= 0:
+            raise RuntimeError("Learning rate has to be bigger than 0!")
+
+        if momentum < 0 or momentum >= 1:
+            raise RuntimeError("Momentum has to be in the range [0, 1)!")
+
+        self._learningRate: float = learningRate
+        self._momentum: float     = momentum
+
+    def Step(self, parameter: np.ndarray, gradient: np.ndarray, state: dict, batchSize: int) -> None:
+        """
+            With momentum, the velocity becomes: velocity = momentum * velocity + gradient and the step is
+            learningRate * velocity. Everything is done in place, using the gradient as scratch space.
+        """
+        gradient *= 1.0 / batchSize
+
+        if self._momentum == 0:
+            gradient *= self._learningRate
+            parameter -= gradient
+
+            return
+
+        velocity: np.ndarray = self._stateBuffer(state, "velocity", parameter)
+        velocity *= self._momentum
+        velocity += gradient
+
+        self._applyVelocity(parameter, gradient, velocity)
+
+    def GetConfig(self) -> dict:
+        return {"learningRate": self._learningRate, "momentum": self._momentum}
+
+    def _applyVelocity(self, parameter: np.ndarray, gradient: np.ndarray, velocity: np.ndarray) -> None:
+        """
+            Takes the step once the velocity has been updated. The gradient holds the average gradient
+            of the batch and may be overwritten.
+        """
+        np.multiply(velocity, self._learningRate, out=gradient)
+        parameter -= gradient
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+import time
+import tracemalloc
+
+class ProfileEntry():
+    """
+        What the profiler measured for one phase (ex: "forward") of one part of the network (ex: "0:Dense").
+    """
+
+    def __init__(self: "ProfileEntry", scope: str, phase: str) -> None:
+        """
+            :param scope: What was measured, ex: "0:Dense" for the first layer or "network" for the network itself.
+            :type scope: str
+
+            :param phase: The phase, ex: "forward", "backward", "update", "infer", "cost" or "read".
+            :type phase: str
+        """
+        self.scope: str          = scope
+        self.phase: str          = phase
+        self.calls: int          = 0
+        self.seconds: float      = 0.0
+        self.bytesAllocated: int = 0 # Only counted if the profiler tracks allocations.
+
+    def ToDict(self) -> dict:
+        return {"scope": self.scope, "phase": self.phase, "calls": self.calls, "seconds": self.seconds, "bytesAllocated": self.bytesAllocated}
+
+    def __repr__(self) -> str:
+        return f"ProfileEntry({self.scope}, {self.phase}, calls={self.calls}, seconds={self.seconds:.6f}, bytesAllocated={self.bytesAllocated})"
+
+class Profiler():
+    """
+        Records the wall time, call count and (optionally) bytes allocated of every phase of training and
+        inference, per layer. Attach it with nn.Network.EnableProfiling. The network only checks if a profiler
+        is attached, so without one the cost is one attribute check per phase.
+
+        The measurements are available as a report (GetReport, GetSummary) or as they happen through a callback.
+    """
+
+    # Callback type: (scope, phase, seconds, bytesAllocated).
+    Callback = Callable[[str, str, float, int], None]
+
+    def __init__(self: "Profiler", trackAllocations: bool = False, callback: "Profiler.Callback | None" = None) -> None:
+        """
+            :param trackAllocations: Count the bytes allocated by every call, using tracemalloc. This slows down
+            every allocation in the process until Close is called, so it's off by default.
+            :type trackAllocations: bool
+
+            :param callback: Called after every measured call with (scope, phase, seconds, bytesAllocated).
+            :type callback: Profiler.Callback | None
+        """
+        self._trackAllocations: bool                       = trackAllocations
+        self._callback: Profiler.Callback | None           = callback
+        self._entries: dict[tuple[str, str], ProfileEntry] = {}
+        self._startedTracing: bool                         = False # Only tracing started by this profiler is stopped by Close.
+
+    def Call(self, scope: str, phase: str, function: Callable, *arguments):
+        """
+            Calls the function with the arguments and records how long it took.
+
+            :param scope: What is measured, ex: "0:Dense".
+            :type scope: str
+
+            :param phase: The phase, ex: "forward".
+            :type phase: str
+
+            :return: What the function returned.
+        """
+        if self._trackAllocations:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._startedTracing = True
+
+            (before, _) = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+
+        start: float   = time.perf_counter()
+        result         = function(*arguments)
+        seconds: float = time.perf_counter() - start
+
+        bytesAllocated: int = 0
+
+        if self._trackAllocations:
+            # The peak above the memory in use before the call, so temporaries freed before returning count too.
+            (_, peak)      = tracemalloc.get_traced_memory()
+            bytesAllocated = max(0, peak - before)
+
+        self.Record(scope, phase, seconds, bytesAllocated)
+
+        return result
+
+    def Record(self, scope: str, phase: str, seconds: float, bytesAllocated: int = 0) -> None:
+        """
+            Records one call that was measured elsewhere.
+
+            :param scope: What was measured.
+            :type scope: str
+
+            :param phase: The phase.
+            :type phase: str
+
+            :param seconds: The wall time of the call.
+            :type seconds: float
+
+            :param bytesAllocated: The bytes allocated during the call.
+            :type bytesAllocated: int
+        """
+        entry: ProfileEntry | None = self._entries.get((scope, phase))
+
+        if entry is None:
+            entry                          = ProfileEntry(scope, phase)
+            self._entries[(scope, phase)] = entry
+
+        entry.calls          += 1
+        entry.seconds        += seconds
+        entry.bytesAllocated += bytesAllocated
+
+        if self._callback is not None:
+            self._callback(scope, phase, seconds, bytesAllocated)
+
+    def GetReport(self) -> list[ProfileEntry]:
+        """
+            :return: Every measured phase, slowest first.
+            :rtype: list[nn.ProfileEntry]
+        """
+        return sorted(self._entries.values(), key=lambda entry: entry.seconds, reverse=True)
+
+    def GetSummary(self) -> str:
+        """
+            :return: The report as a table, with every phase's share of the total measured time.
+            :rtype: str
+        """
+        report: list[ProfileEntry] = self.GetReport()
+        total: float               = sum(entry.seconds for entry in report)
+        lines: list[str]           = [f"{'scope':<16}{'phase':<10}{'calls':>10}{'seconds':>12}{'share':>8}{'bytes':>14}"]
+
+        for entry in report:
+            share: float = entry.seconds / total if total > 0 else 0.0
+            lines.append(f"{entry.scope:<16}{entry.phase:<10}{entry.calls:>10}{entry.seconds:>12.4f}{share:>8.1%}{entry.bytesAllocated:>14}")
+
+        return "\n".join(lines)
+
+    def Reset(self) -> None:
+        """
+            Forgets everything measured so far.
+        """
+        self._entries.clear()
+
+    def Close(self) -> None:
+        """
+            Stops tracing allocations, if this profiler started it, so the rest of the process runs at full speed
+            again. The measurements stay available. Called by nn.Network.DisableProfiling.
+        """
+        if self._startedTracing:
+            tracemalloc.stop()
+            self._startedTracing = False
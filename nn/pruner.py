@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import copy
+from mnist.mnist_dataloader import MnistDataloader
+from nn.layer import Layer
+from nn.layers.dense import Dense
+from nn.layers.relu import Relu
+from nn.network import Network
+from nn.networks.sequential import Sequential
+import numpy as np
+
+class UnitStatistics():
+    """
+        How the units of one ReLU layer behaved over a dataset (see Pruner.CollectStatistics).
+    """
+
+    def __init__(self: "UnitStatistics", units: int) -> None:
+        """
+            :param units: The amount of units of the layer.
+            :type units: int
+        """
+        self.images: int                = 0
+        self.activeCounts: np.ndarray   = np.zeros(units, dtype=np.int64)   # Images where the unit was above 0.
+        self.activationSums: np.ndarray = np.zeros(units, dtype=np.float64) # The unit's outputs summed over all images.
+
+    def Record(self, outputs: np.ndarray) -> None:
+        """
+            :param outputs: The ReLU outputs of a batch, of shape (batch, units).
+            :type outputs: numpy.ndarray
+        """
+        self.images         += len(outputs)
+        self.activeCounts   += np.count_nonzero(outputs > 0, axis=0)
+        self.activationSums += np.sum(outputs, axis=0, dtype=np.float64)
+
+    def GetActiveFraction(self) -> np.ndarray:
+        """
+            :return: For every unit, the fraction of images it was active for, from 0 to 1.
+            :rtype: numpy.ndarray
+        """
+        return self.activeCounts / max(1, self.images)
+
+    def GetMeanActivation(self) -> np.ndarray:
+        """
+            :return: For every unit, its average output.
+            :rtype: numpy.ndarray
+        """
+        return self.activationSums / max(1, self.images)
+
+    def __repr__(self) -> str:
+        return f"UnitStatistics(images={self.images}, units={len(self.activeCounts)}, dead={int(np.count_nonzero(self.activeCounts == 0))})"
+
+class Pruner():
+    """
+        Structured pruning of hidden units. For every Dense -> Relu -> Dense in a network, the hidden units are
+        removed if they were never (or almost never) active over a dataset, or if they contribute little to the next
+        layer. How much a unit contributes is measured as its mean activation times the size (L2 norm) of its
+        outgoing weights. The layers are then created again with fewer units: the rows of the first dense layer,
+        the ReLU and the columns of the second dense layer that belong to the removed units are left out, so
+        every forward and backward pass does less work.
+
+        Removing units that were never active doesn't change the outputs for the data they were measured on.
+        Removing units that were active does, which a few epochs of fine tuning (FineTune) can make up for.
+    """
+
+    def __init__(self: "Pruner", activationThreshold: float = 0.0, magnitudeRatio: float = 0.0, chunkSize: int = 1000) -> None:
+        """
+            :param activationThreshold: Units active for this fraction of the images or less are removed. 0 only removes dead units.
+            :type activationThreshold: float
+
+            :param magnitudeRatio: Units that contribute less than this fraction of the layer's most contributing unit are removed.
+            0 doesn't remove any units by their contribution.
+            :type magnitudeRatio: float
+
+            :param chunkSize: The amount of images computed at once when collecting statistics.
+            :type chunkSize: int
+        """
+        if not 0.0 <= activationThreshold < 1.0 or not 0.0 <= magnitudeRatio < 1.0:
+            raise TypeError("The activation threshold and the magnitude ratio have to be from 0 up to (not including) 1!")
+
+        self._activationThreshold: float = activationThreshold
+        self._magnitudeRatio: float      = magnitudeRatio
+        self._chunkSize: int             = chunkSize
+
+    @staticmethod
+    def GetPrunableLayers(network: Network) -> list[int]:
+        """
+            :return: The index of every Relu that sits between two dense layers, their units can be removed.
+            :rtype: list[int]
+        """
+        layers: list[Layer] = network._layers
+
+        return [index for index in range(1, len(layers) - 1) if type(layers[index - 1]) is Dense and type(layers[index]) is Relu and type(layers[index + 1]) is Dense]
+
+    def CollectStatistics(self, network: Network, dataloader: MnistDataloader) -> dict[int, UnitStatistics]:
+        """
+            Runs the network on everything the dataloader has left and records how active every prunable unit was.
+
+            :param network: The trained network.
+            :type network: nn.Network
+
+            :param dataloader: The data to measure on, ex: the training data.
+            :type dataloader: mnist.MnistDataloader
+
+            :return: The statistics of every prunable Relu, by its index in the network.
+            :rtype: dict[int, nn.UnitStatistics]
+        """
+        statistics: dict[int, UnitStatistics] = {index: UnitStatistics(network._layers[index].GetOutputSize()) for index in Pruner.GetPrunableLayers(network)}
+
+        while True:
+            (labels, inputs) = network._readEvaluationChunk(dataloader, self._chunkSize)
+
+            if len(labels) <= 0:
+                break
+
+            outputs: np.ndarray = np.asarray(inputs, dtype=network.GetDtype())
+
+            for (index, layer) in enumerate(network._layers):
+                outputs = layer.Infer(outputs)
+
+                if index in statistics:
+                    statistics[index].Record(outputs)
+
+        return statistics
+
+    def SelectUnits(self, network: Network, statistics: dict[int, UnitStatistics]) -> dict[int, np.ndarray]:
+        """
+            :return: The units to keep of every prunable Relu, by its index. At least one unit is always kept.
+            :rtype: dict[int, numpy.ndarray]
+        """
+        kept: dict[int, np.ndarray] = {}
+
+        for (index, unitStatistics) in statistics.items():
+            outgoing: np.ndarray     = network._layers[index + 1].GetWeights()["weights"]
+            contribution: np.ndarray = unitStatistics.GetMeanActivation() * np.linalg.norm(outgoing, axis=0)
+
+            keep: np.ndarray = unitStatistics.GetActiveFraction() > self._activationThreshold
+            keep            &= contribution >= self._magnitudeRatio * np.max(contribution)
+
+            if not np.any(keep):
+                keep[np.argmax(contribution)] = True # A layer without units would disconnect the network.
+
+            kept[index] = np.flatnonzero(keep)
+
+        return kept
+
+    def Prune(self, network: Network, dataloader: MnistDataloader) -> Sequential:
+        """
+            Collects the statistics over the dataloader and creates a network with the selected units removed. The given
+            network isn't changed.
+
+            :param network: The trained network.
+            :type network: nn.Network
+
+            :param dataloader: The data to measure the units on.
+            :type dataloader: mnist.MnistDataloader
+
+            :return: The smaller network.
+            :rtype: nn.networks.Sequential
+        """
+        return Pruner.RemoveUnits(network, self.SelectUnits(network, self.CollectStatistics(network, dataloader)))
+
+    @staticmethod
+    def RemoveUnits(network: Network, kept: dict[int, np.ndarray]) -> Sequential:
+        """
+            Creates the network again with only the kept units of the given Relu layers. The other layers are
+            copied, so that fine tuning the smaller network doesn't change the given one.
+
+            :param network: The network.
+            :type network: nn.Network
+
+            :param kept: The units to keep of prunable Relu layers (see GetPrunableLayers), by the index of the Relu.
+            :type kept: dict[int, numpy.ndarray]
+
+            :return: The smaller network.
+            :rtype: nn.networks.Sequential
+        """
+        layers: list[Layer] = [copy.deepcopy(layer) for layer in network._layers]
+
+        for (index, units) in sorted(kept.items()):
+            if index not in Pruner.GetPrunableLayers(network):
+                raise RuntimeError(f"Layer {index} isn't a Relu between two dense layers!")
+
+            relu: Relu = Relu(len(units))
+            relu.SetDtype(layers[index].GetDtype())
+
+            layers[index - 1] = Pruner._sliceDense(layers[index - 1], rows=units)
+            layers[index]     = relu
+            layers[index + 1] = Pruner._sliceDense(layers[index + 1], columns=units)
+
+        pruned: Sequential = Sequential(layers, network._cost, network._optimizer)
+        pruned.CheckLayerConnection()
+
+        return pruned
+
+    @staticmethod
+    def _sliceDense(layer: Dense, rows: np.ndarray | None = None, columns: np.ndarray | None = None) -> Dense:
+        """
+            :return: A new dense layer with only the given outputs (rows) or inputs (columns) of the layer's weights.
+            :rtype: nn.layers.Dense
+        """
+        weights: dict[str, np.ndarray] = {name: np.array(array) for (name, array) in layer.GetWeights().items()} # Writable copies.
+
+        if rows is not None:
+            weights["weights"] = weights["weights"][rows]
+
+            if "bias" in weights:
+                weights["bias"] = weights["bias"][rows]
+
+        if columns is not None:
+            weights["weights"] = weights["weights"][:, columns]
+
+        (outputs, inputs) = weights["weights"].shape
+        config: dict      = {**layer.GetConfig(), "input": inputs, "output": outputs}
+
+        # Created around the sliced weights, so no random weights are drawn just to be replaced.
+        return Dense.FromWeights(config, {name: np.ascontiguousarray(array) for (name, array) in weights.items()})
+
+    @staticmethod
+    def FineTune(network: Network, dataloader: MnistDataloader, epochs: int) -> list[float]:
+        """
+            Trains the pruned network for a few epochs, so the remaining units make up for the removed ones.
+
+            :param network: The pruned network.
+            :type network: nn.Network
+
+            :param dataloader: The training data. It's reset after every epoch.
+            :type dataloader: mnist.MnistDataloader
+
+            :param epochs: The amount of epochs.
+            :type epochs: int
+
+            :return: The average cost of every epoch.
+            :rtype: list[float]
+        """
+        costs: list[float] = []
+
+        for _ in range(epochs):
+            costs.append(network.TrainOneEpoch(dataloader))
+            dataloader.Reset()
+
+        return costs
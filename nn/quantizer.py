@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+from mnist.mnist_dataloader import MnistDataloader
+from nn.evaluation_report import EvaluationReport
+from nn.layer import Layer
+from nn.layers.dense import Dense
+from nn.layers.quantized_dense import QuantizedDense
+from nn.network import Network
+from nn.networks.sequential import Sequential
+import numpy as np
+
+class QuantizationReport():
+    """
+        How a quantized network compares to the float network it was made from (see Quantizer.Compare).
+    """
+
+    def __init__(self: "QuantizationReport", floatReport: EvaluationReport, quantizedReport: EvaluationReport, floatBytes: int, quantizedBytes: int) -> None:
+        """
+            :param floatReport: The evaluation of the float network.
+            :type floatReport: nn.EvaluationReport
+
+            :param quantizedReport: The evaluation of the quantized network, on the same data.
+            :type quantizedReport: nn.EvaluationReport
+
+            :param floatBytes: The size of the float network's weights.
+            :type floatBytes: int
+
+            :param quantizedBytes: The size of the quantized network's weights.
+            :type quantizedBytes: int
+        """
+        self.floatReport: EvaluationReport     = floatReport
+        self.quantizedReport: EvaluationReport = quantizedReport
+        self.floatBytes: int                   = floatBytes
+        self.quantizedBytes: int               = quantizedBytes
+
+    def GetAccuracyDrop(self) -> float:
+        """
+            :return: How much lower the accuracy of the quantized network is, from 0 to 1. Negative if it got better.
+            :rtype: float
+        """
+        return self.floatReport.GetAccuracy() - self.quantizedReport.GetAccuracy()
+
+    def GetCompression(self) -> float:
+        """
+            :return: How many times smaller the quantized weights are.
+            :rtype: float
+        """
+        return self.floatBytes / self.quantizedBytes if self.quantizedBytes > 0 else 0.0
+
+    def GetSummary(self) -> str:
+        """
+            :return: The report as a readable table.
+            :rtype: str
+        """
+        lines: list[str] = [f"{'':<10}{'accuracy':>10}{'images/s':>12}{'weights':>12}"]
+
+        for (name, report, size) in (("float", self.floatReport, self.floatBytes), ("int8", self.quantizedReport, self.quantizedBytes)):
+            lines.append(f"{name:<10}{report.GetAccuracy():>10.4f}{report.GetThroughput():>12.0f}{size / 1024:>10.1f}KB")
+
+        lines.append(f"Accuracy drop: {self.GetAccuracyDrop() * 100:.2f} percentage points, weights {self.GetCompression():.1f}x smaller.")
+
+        return "\n".join(lines)
+
+    def __repr__(self) -> str:
+        return (f"QuantizationReport(floatAccuracy={self.floatReport.GetAccuracy():.4f}, quantizedAccuracy={self.quantizedReport.GetAccuracy():.4f}, "
+                f"drop={self.GetAccuracyDrop():.4f}, compression={self.GetCompression():.1f})")
+
+class Quantizer():
+    """
+        Post training quantization: turns the dense layers of a trained network into int8 ones (nn.layers.QuantizedDense).
+        The weights get one scale per row. The inputs of every dense layer get one scale as well, found by running
+        the float network on a sample of the data (calibrating) and taking the largest input the layer was given.
+
+        The quantized weights are 8 times smaller than float64 ones (4 times than float32), both in memory and in
+        saved model files. Check the accuracy with Compare before using the quantized network.
+    """
+
+    def __init__(self: "Quantizer", calibrationSize: int = 1000, accumulate: str = "float") -> None:
+        """
+            :param calibrationSize: The amount of images the input scales are calibrated on.
+            :type calibrationSize: int
+
+            :param accumulate: How the quantized layers sum up the products, see nn.layers.QuantizedDense.
+            :type accumulate: str
+        """
+        if calibrationSize < 1:
+            raise TypeError("The calibration size has to be at least 1!")
+
+        if accumulate not in QuantizedDense.ACCUMULATE:
+            raise TypeError(f"The accumulation has to be one of {QuantizedDense.ACCUMULATE}, got {accumulate}!")
+
+        self._calibrationSize: int = calibrationSize
+        self._accumulate: str      = accumulate
+
+    def Calibrate(self, network: Network, dataloader: MnistDataloader) -> list[float | None]:
+        """
+            Runs the float network on up to calibrationSize images of the dataloader and records the largest input
+            of every dense layer.
+
+            :param network: The trained network.
+            :type network: nn.Network
+
+            :param dataloader: Where the calibration images are read from, ex: the training data.
+            :type dataloader: mnist.MnistDataloader
+
+            :return: The largest absolute input of every layer, None for the layers that aren't dense.
+            :rtype: list[float | None]
+        """
+        largest: list[float | None] = [0.0 if type(layer) is Dense else None for layer in network._layers]
+        remaining: int              = self._calibrationSize
+
+        while remaining > 0:
+            (labels, inputs) = network._readEvaluationChunk(dataloader, remaining)
+
+            if len(labels) <= 0:
+                break # Less data than the calibration size.
+
+            outputs: np.ndarray = np.asarray(inputs[:remaining], dtype=network.GetDtype())
+            remaining          -= len(outputs)
+
+            for (index, layer) in enumerate(network._layers):
+                if largest[index] is not None:
+                    largest[index] = max(largest[index], float(np.max(np.abs(outputs))))
+
+                outputs = layer.Infer(outputs)
+
+        if remaining == self._calibrationSize:
+            raise RuntimeError("The dataloader didn't have any images to calibrate on!")
+
+        return largest
+
+    def Quantize(self, network: Network, dataloader: MnistDataloader) -> Sequential:
+        """
+            Calibrates on the dataloader and creates a network where every dense layer is quantized. The other
+            layers, the cost function and the optimizer are shared with the given network.
+
+            :param network: The trained network.
+            :type network: nn.Network
+
+            :param dataloader: Where the calibration images are read from.
+            :type dataloader: mnist.MnistDataloader
+
+            :return: The quantized network, for inference only.
+            :rtype: nn.networks.Sequential
+        """
+        largest: list[float | None] = self.Calibrate(network, dataloader)
+        layers: list[Layer]         = []
+
+        for (layer, largestInput) in zip(network._layers, largest):
+            if largestInput is None:
+                layers.append(layer)
+            else:
+                # A layer that only ever got zeros can use any scale.
+                layers.append(QuantizedDense.FromDense(layer, largestInput / 127 if largestInput > 0 else 1.0, self._accumulate))
+
+        return Sequential(layers, network._cost, network._optimizer)
+
+    @staticmethod
+    def Compare(network: Network, quantized: Network, dataloader: MnistDataloader, chunkSize: int | None = None) -> QuantizationReport:
+        """
+            Evaluates both networks on everything the dataloader has left, resetting it in between.
+
+            :param network: The float network.
+            :type network: nn.Network
+
+            :param quantized: The quantized network.
+            :type quantized: nn.Network
+
+            :param dataloader: The evaluation data, ex: mnist_test.csv.
+            :type dataloader: mnist.MnistDataloader
+
+            :param chunkSize: The amount of images computed at once, see nn.Network.EvaluateReport.
+            :type chunkSize: int | None
+
+            :return: The accuracy of both networks and the size of their weights.
+            :rtype: nn.QuantizationReport
+        """
+        floatReport: EvaluationReport = network.EvaluateReport(dataloader, chunkSize)
+        dataloader.Reset()
+        quantizedReport: EvaluationReport = quantized.EvaluateReport(dataloader, chunkSize)
+
+        return QuantizationReport(floatReport, quantizedReport, Quantizer.GetWeightBytes(network), Quantizer.GetWeightBytes(quantized))
+
+    @staticmethod
+    def GetWeightBytes(network: Network) -> int:
+        """
+            :return: The size of all weights of the network (see nn.Layer.GetWeights), in bytes.
+            :rtype: int
+        """
+        return sum(array.nbytes for layer in network._layers for array in layer.GetWeights().values())
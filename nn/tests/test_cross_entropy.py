@@ -0,0 +1,49 @@
+import unittest
+
+from nn.cost import Cost
+from nn.costs.cross_entropy import CrossEntropy
+from nn.costs.mse import Mse
+from nn.layers.relu import Relu
+from nn.layers.softmax import Softmax
+import numpy as np
+
+class TestCrossEntropyComputation(unittest.TestCase):
+    def test_computes_correct_cost(self) -> None:
+        # Arrange:
+        cost: Cost           = CrossEntropy(3)
+        inputs: np.array     = np.array([0.2, 0.7, 0.1])
+        expected: np.array   = np.array([0.0, 1.0, 0.0])
+
+        # Act:
+        (derivatives, value) = cost.ComputeCost(inputs, expected)
+
+        # Assert:
+        self.assertAlmostEqual(value, -np.log(0.7))
+        np.testing.assert_allclose(derivatives, np.array([0.0, -1.0 / 0.7, 0.0]))
+
+    def test_fused_matches_softmax_backward(self) -> None:
+        # Arrange:
+        cost: Cost         = CrossEntropy(4)
+        softmax: Softmax   = Softmax(4)
+        logits: np.array   = np.random.normal(size=(6, 4))
+        expected: np.array = np.eye(4)[np.random.randint(0, 4, size=6)]
+
+        probabilities: np.array = softmax.Forward(logits)
+
+        # Act:
+        (fusedDerivatives, fusedCost) = cost.ComputeFusedCost(probabilities, expected)
+        (derivatives, unfusedCost)    = cost.ComputeCost(probabilities, expected)
+        unfusedDerivatives: np.array  = softmax.Backward(derivatives)
+
+        # Assert:
+        self.assertAlmostEqual(fusedCost, unfusedCost)
+        np.testing.assert_allclose(fusedDerivatives, unfusedDerivatives, atol=1e-9)
+
+    def test_fuses_only_with_softmax(self) -> None:
+        # Assert:
+        self.assertTrue(CrossEntropy(3).FusesWith(Softmax(3)))
+        self.assertFalse(CrossEntropy(3).FusesWith(Relu(3)))
+        self.assertFalse(Mse(3).FusesWith(Softmax(3)))
+
+if __name__ == "__main__":
+    unittest.main()
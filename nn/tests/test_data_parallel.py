@@ -0,0 +1,111 @@
+import copy
+import unittest
+
+from nn.costs.cross_entropy import CrossEntropy
+from nn.layers.dense import Dense
+from nn.layers.relu import Relu
+from nn.layers.softmax import Softmax
+from nn.layer import Layer
+from nn.network import Network
+from nn.networks.data_parallel import DataParallel
+from nn.networks.sequential import Sequential
+import numpy as np
+import warnings
+
+class _FailOnNan(Layer):
+    """
+        Passes the inputs through, but fails on NaN inputs, so that a single worker can be made to fail.
+    """
+
+    def __init__(self: "_FailOnNan", inputs: int):
+        self._size: tuple[int, int] = (inputs, inputs)
+
+    def Forward(self, inputs: np.ndarray) -> np.ndarray:
+        if np.any(np.isnan(inputs)):
+            raise RuntimeError("NaN input!")
+
+        return inputs
+
+    def Backward(self, derivatives: np.ndarray) -> np.ndarray:
+        return derivatives
+
+class TestDataParallelTraining(unittest.TestCase):
+    def _createNetwork(self) -> Network:
+        return Sequential([Dense(20, 8), Relu(8), Dense(8, 4), Softmax(4)], CrossEntropy(4), 0.1)
+
+    def test_matches_single_process_training(self) -> None:
+        # Arrange:
+        network: Network         = self._createNetwork()
+        parallelNetwork: Network = copy.deepcopy(network)
+        batches: list            = [(np.random.rand(size, 20), np.eye(4)[np.random.randint(0, 4, size=size)]) for size in (16, 16, 5, 2)]
+
+        # Act:
+        expectedCosts: list[float] = []
+        for (inputs, expected) in batches:
+            expectedCosts.append(network.AccumulateGradients(inputs, expected) / len(inputs))
+            network.UpdateLayers(len(inputs))
+
+        with DataParallel(parallelNetwork, workers=3) as trainer, self.assertWarns(RuntimeWarning): # The batch of 2 leaves a worker idle.
+            costs: list[float] = [trainer.TrainOnArrays(inputs, expected) for (inputs, expected) in batches]
+
+        # Assert:
+        np.testing.assert_allclose(costs, expectedCosts, rtol=1e-10)
+        for (layer, parallelLayer) in zip(network._layers, parallelNetwork._layers):
+            for ((parameter, _), (parallelParameter, parallelGradient)) in zip(layer.GetParameters(), parallelLayer.GetParameters()):
+                np.testing.assert_allclose(parallelParameter, parameter, rtol=1e-10, atol=1e-12)
+                np.testing.assert_array_equal(parallelGradient, 0.0)
+
+    def test_worker_error_keeps_workers_in_sync(self) -> None:
+        # Arrange:
+        network: Network         = Sequential([_FailOnNan(20), Dense(20, 4), Softmax(4)], CrossEntropy(4), 0.1)
+        parallelNetwork: Network = copy.deepcopy(network)
+        failing: np.ndarray      = np.random.rand(9, 20)
+        failing[0, 0]            = np.nan # Only in the shard of the first worker.
+        inputs: np.ndarray       = np.random.rand(9, 20)
+        expected: np.ndarray     = np.eye(4)[np.random.randint(0, 4, size=9)]
+
+        # Act:
+        expectedCost: float = network.AccumulateGradients(inputs, expected) / len(inputs)
+
+        with DataParallel(parallelNetwork, workers=3) as trainer:
+            self.assertRaises(RuntimeError, trainer.TrainOnArrays, failing, expected)
+            cost: float = trainer.TrainOnArrays(inputs, expected)
+
+        # Assert:
+        self.assertAlmostEqual(cost, expectedCost, places=10)
+
+    def test_warns_once_about_idle_workers(self) -> None:
+        # Arrange:
+        inputs: np.ndarray   = np.random.rand(2, 20)
+        expected: np.ndarray = np.eye(4)[[0, 1]]
+
+        with DataParallel(self._createNetwork(), workers=3) as trainer:
+            # Act:
+            with warnings.catch_warnings(record=True) as caught:
+                warnings.simplefilter("always")
+
+                for _ in range(3):
+                    trainer.TrainOnArrays(inputs, expected)
+
+                trainer.TrainOnArrays(np.random.rand(3, 20), np.eye(4)[[0, 1, 2]])
+
+        # Assert:
+        self.assertEqual([warning.category for warning in caught], [RuntimeWarning])
+
+    def test_closed_trainer(self) -> None:
+        # Arrange:
+        trainer: DataParallel = DataParallel(self._createNetwork(), workers=1)
+
+        # Act:
+        trainer.Close()
+        trainer.Close()
+
+        # Assert:
+        self.assertRaises(RuntimeError, trainer.TrainOnArrays, np.zeros((2, 20)), np.zeros((2, 4)))
+
+    def test_wrong_worker_count(self) -> None:
+        # Assert:
+        self.assertRaises(TypeError, DataParallel, self._createNetwork(), 0)
+
+if __name__ == "__main__":
+    unittest.main()
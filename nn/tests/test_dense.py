@@ -34,5 +34,94 @@ class TestDenseComputation(unittest.TestCase):
         np.testing.assert_array_equal(toPropagate, np.array([3.0, 3.0]))
         np.testing.assert_array_equal(layer._weights, np.array([[-3.0, -2.0], [-3.0, -2.0], [-3.0, -2.0]]))
 
+    def test_gradients_created_by_first_backward(self) -> None:
+        # Arrange:
+        layer: Dense = Dense(2, 3)
+        layer.Forward(np.array([4.0, 3.0]))
+
+        # Act:
+        before: np.ndarray | None = layer._dW
+        layer.Backward(np.array([1.0, 1.0, 1.0]))
+
+        # Assert:
+        self.assertIsNone(before)
+        np.testing.assert_array_equal(layer._dW, np.array([[4.0, 3.0], [4.0, 3.0], [4.0, 3.0]]))
+        np.testing.assert_array_equal(layer._dB, np.array([1.0, 1.0, 1.0]))
+
+    def test_set_dtype_before_set_weights(self) -> None:
+        # Arrange:
+        layer: Dense = Dense(2, 3, initialize=False)
+
+        # Act:
+        layer.SetDtype(np.float32)
+        layer.SetWeights({"weights": np.ones((3, 2), dtype=np.float32), "bias": np.zeros(3, dtype=np.float32)})
+
+        # Assert:
+        self.assertEqual(layer.GetDtype(), np.float32)
+        np.testing.assert_array_equal(layer.Forward(np.array([1.0, 2.0])), np.array([3.0, 3.0, 3.0]))
+
+    def test_from_weights_uses_the_given_arrays(self) -> None:
+        # Arrange:
+        weights: dict[str, np.ndarray] = {"weights": np.ones((3, 2), dtype=np.float32), "bias": np.zeros(3, dtype=np.float32)}
+
+        # Act:
+        layer: Dense = Dense.FromWeights({"input": 2, "output": 3, "dtype": "float32"}, weights)
+
+        # Assert:
+        self.assertIs(layer._weights, weights["weights"])
+        self.assertIs(layer._bias, weights["bias"])
+        self.assertRaises(TypeError, Dense.FromWeights, {"input": 3, "output": 3, "dtype": "float32"}, weights)
+
+    def test_batch_matches_single_vectors(self) -> None:
+        # Arrange:
+        batchLayer: Dense     = Dense(4, 3)
+        singleLayer: Dense    = Dense(4, 3)
+        singleLayer._weights  = batchLayer._weights.copy()
+        inputs: np.ndarray      = np.random.normal(size=(5, 4))
+        derivatives: np.ndarray = np.random.normal(size=(5, 3))
+
+        # Act:
+        batchOutputs: np.ndarray     = batchLayer.Forward(inputs)
+        batchToPropagate: np.ndarray = batchLayer.Backward(derivatives)
+
+        singleOutputs: list[np.ndarray]     = []
+        singleToPropagate: list[np.ndarray] = []
+        for (row, rowDerivatives) in zip(inputs, derivatives):
+            singleOutputs.append(singleLayer.Forward(row).copy())
+            singleToPropagate.append(singleLayer.Backward(rowDerivatives))
+
+        # Assert:
+        np.testing.assert_allclose(batchOutputs, np.array(singleOutputs))
+        np.testing.assert_allclose(batchToPropagate, np.array(singleToPropagate))
+        np.testing.assert_allclose(batchLayer._dW, singleLayer._dW)
+        np.testing.assert_allclose(batchLayer._dB, singleLayer._dB)
+
+    def test_infer_matches_forward(self) -> None:
+        # Arrange:
+        layer: Dense       = Dense(4, 3)
+        layer._bias[:]     = [0.5, -0.5, 1.0]
+        inputs: np.ndarray = np.random.normal(size=(5, 4))
+
+        # Act:
+        inferred: np.ndarray = layer.Infer(inputs)
+        single: np.ndarray   = layer.Infer(inputs[0])
+
+        # Assert:
+        np.testing.assert_allclose(inferred, layer.Forward(inputs))
+        np.testing.assert_allclose(single, inferred[0])
+        self.assertIsNot(layer.Infer(inputs), inferred)
+
+    def test_from_weights_ignores_the_removed_sparse_threshold(self) -> None:
+        # Arrange:
+        config: dict                   = {"input": 2, "output": 3, "useBias": False, "dtype": "float64", "sparseThreshold": 0.3}
+        weights: dict[str, np.ndarray] = {"weights": np.ones((3, 2))}
+
+        # Act:
+        layer: Dense = Dense.FromWeights(config, weights)
+
+        # Assert:
+        self.assertNotIn("sparseThreshold", layer.GetConfig())
+        np.testing.assert_array_equal(layer.Forward(np.array([1.0, 2.0])), np.array([3.0, 3.0, 3.0]))
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,76 @@
+import unittest
+
+from nn.costs.cross_entropy import CrossEntropy
+from nn.frozen_network import FrozenNetwork
+from nn.layers.dense import Dense
+from nn.layers.relu import Relu
+from nn.layers.softmax import Softmax
+from nn.network import Network
+from nn.networks.sequential import Sequential
+import numpy as np
+
+class TestFrozenNetwork(unittest.TestCase):
+    def setUp(self) -> None:
+        # Shaped like the network in main.py, with a bias so that the fused bias add is tested too.
+        self._network: Network = Sequential([Dense(28 * 28, 16), Relu(16), Dense(16, 10), Relu(10), Softmax(10)], CrossEntropy(10), 0.1)
+
+        for layer in self._network._layers:
+            for (parameter, _) in layer.GetParameters():
+                parameter[...] = np.random.normal(scale=0.1, size=parameter.shape)
+
+    def test_matches_compute(self) -> None:
+        # Arrange:
+        frozen: FrozenNetwork = self._network.Freeze()
+        images: np.ndarray    = np.random.rand(50, 28 * 28)
+
+        # Act:
+        outputs: np.ndarray     = frozen.Compute(images)
+        predictions: np.ndarray = frozen.Predict(images)
+
+        # Assert:
+        expected: np.ndarray = self._network.Compute(images)
+        np.testing.assert_allclose(outputs, expected, rtol=1e-12)
+        np.testing.assert_array_equal(predictions, np.argmax(expected, axis=1))
+        np.testing.assert_allclose(frozen.Compute(images[3]), expected[3], rtol=1e-12)
+        self.assertEqual(frozen.Predict(images[3]), int(np.argmax(expected[3])))
+
+    def test_folds_layers(self) -> None:
+        # Act:
+        frozen: FrozenNetwork = self._network.Freeze()
+
+        # Assert: Both ReLUs are fused into the dense layers and the weights are stored transposed.
+        self.assertEqual([step[0] for step in frozen._steps], ["dense", "dense", "softmax"])
+        self.assertEqual([step[0] for step in frozen._predictSteps], ["dense", "dense"])
+        self.assertEqual(frozen._steps[0][1].shape, (28 * 28, 16))
+        self.assertTrue(frozen._steps[0][1].flags.c_contiguous)
+        self.assertTrue(frozen._steps[0][3])
+
+    def test_is_immutable(self) -> None:
+        # Arrange:
+        frozen: FrozenNetwork = self._network.Freeze()
+        image: np.ndarray     = np.random.rand(28 * 28)
+        before: np.ndarray    = frozen.Compute(image)
+
+        # Act:
+        self._network._layers[0]._weights += 1.0 # Training afterwards doesn't change the frozen network.
+
+        # Assert:
+        np.testing.assert_array_equal(frozen.Compute(image), before)
+        self.assertRaises(RuntimeError, setattr, frozen, "_steps", ())
+        self.assertRaises(ValueError, frozen._steps[0][1].fill, 0.0)
+
+    def test_float32(self) -> None:
+        # Arrange:
+        self._network.SetDtype(np.float32)
+        frozen: FrozenNetwork = self._network.Freeze()
+        images: np.ndarray    = np.random.rand(8, 28 * 28)
+
+        # Act:
+        outputs: np.ndarray = frozen.Compute(images)
+
+        # Assert:
+        self.assertEqual(outputs.dtype, np.float32)
+        np.testing.assert_allclose(outputs, self._network.Compute(images), rtol=1e-5)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+import tempfile
+import unittest
+import unittest.mock
+
+from nn.costs.cross_entropy import CrossEntropy
+from nn.layers.dense import Dense
+from nn.layers.relu import Relu
+from nn.layers.softmax import Softmax
+from nn.layer import Layer
+from nn.memory import Memory
+from nn.model_file import ModelFile
+from nn.network import Network
+from nn.networks.sequential import Sequential
+from nn.optimizers.adam import Adam
+from pathlib import Path
+import numpy as np
+
+class TestMemorySaveLoad(unittest.TestCase):
+    def test_keeps_dtype(self) -> None:
+        # Arrange:
+        network: Network = Sequential([Dense(6, 4), Relu(4), Dense(4, 3), Softmax(3)], CrossEntropy(3), 0.1, dtype=np.float32)
+        inputs: np.ndarray = np.random.rand(5, 6).astype(np.float32)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path: Path = Path(directory) / "network.pkl"
+
+            # Act:
+            Memory().SaveNetwork(network, path)
+            loaded: Network = Memory().LoadNetwork(path)
+
+        # Assert:
+        self.assertEqual(loaded.GetDtype(), np.float32)
+        for layer in loaded._layers:
+            for (parameter, gradient) in layer.GetParameters():
+                self.assertEqual(parameter.dtype, np.float32)
+                self.assertEqual(gradient.dtype, np.float32)
+        np.testing.assert_array_equal(loaded.Compute(inputs), network.Compute(inputs))
+
+    def test_loads_network_saved_before_dtypes(self) -> None:
+        # Arrange:
+        path: Path = Path(__file__).resolve().parent.parent.parent / "95percent.pkl"
+
+        # Act:
+        network: Network = Memory().LoadNetwork(path)
+
+        # Assert:
+        self.assertEqual(network.GetDtype(), np.float64)
+        self.assertEqual(network.Compute(np.zeros(28 * 28)).shape, (10,))
+
+class TestModelFile(unittest.TestCase):
+    def setUp(self) -> None:
+        self._directory        = tempfile.TemporaryDirectory()
+        self._path: Path       = Path(self._directory.name) / "network.model"
+        self._network: Network = Sequential([Dense(6, 4), Relu(4), Dense(4, 3, useBias=False), Softmax(3)], CrossEntropy(3), Adam(0.002), dtype=np.float32)
+
+    def tearDown(self) -> None:
+        self._directory.cleanup()
+
+    def test_round_trip(self) -> None:
+        # Arrange:
+        inputs: np.ndarray = np.random.rand(5, 6)
+
+        for memoryMap in (False, True):
+            # Act:
+            Memory().SaveNetwork(self._network, self._path)
+            loaded: Network = Memory().LoadNetwork(self._path, memoryMap=memoryMap)
+
+            # Assert:
+            self.assertTrue(ModelFile.IsModelFile(self._path))
+            self.assertEqual([type(layer) for layer in loaded._layers], [type(layer) for layer in self._network._layers])
+            self.assertEqual(loaded.GetDtype(), np.float32)
+            self.assertEqual(loaded._optimizer.GetConfig(), self._network._optimizer.GetConfig())
+            np.testing.assert_array_equal(loaded.Compute(inputs), self._network.Compute(inputs))
+
+    def test_memory_mapped_weights_are_read_only_and_aligned(self) -> None:
+        # Arrange:
+        Memory().SaveNetwork(self._network, self._path)
+
+        # Act:
+        mapped: Network = Memory().LoadNetwork(self._path, memoryMap=True)
+        loaded: Network = Memory().LoadNetwork(self._path)
+
+        # Assert:
+        for layer in mapped._layers:
+            for weights in layer.GetWeights().values():
+                self.assertFalse(weights.flags.writeable)
+                self.assertEqual(weights.ctypes.data % ModelFile.ALIGNMENT, 0)
+        self.assertTrue(loaded._layers[0]._weights.flags.writeable)
+        self.assertTrue(ModelFile.Load(self._path)._layers[0]._weights.flags.writeable) # Same default as Memory.LoadNetwork.
+
+    def test_memory_mapped_load_creates_no_arrays(self) -> None:
+        # Arrange:
+        Memory().SaveNetwork(self._network, self._path)
+
+        # Act:
+        with unittest.mock.patch("numpy.random.normal", side_effect=AssertionError("Weights were initialized!")):
+            mapped: Network = Memory().LoadNetwork(self._path, memoryMap=True)
+
+        # Assert:
+        for layer in mapped._layers:
+            if isinstance(layer, Dense):
+                self.assertIsNone(layer._dW)
+                self.assertIsNone(layer._dB)
+        mapped.Compute(np.random.rand(2, 6))
+        self.assertIsNone(mapped._layers[0]._dW)
+
+    def test_converts_pickled_network(self) -> None:
+        # Arrange:
+        path: Path         = Path(__file__).resolve().parent.parent.parent / "95percent.pkl"
+        inputs: np.ndarray = np.random.rand(3, 28 * 28)
+
+        # Act:
+        modelPath: Path = Memory().ConvertNetwork(path, self._path)
+
+        # Assert:
+        np.testing.assert_array_equal(Memory().LoadNetwork(modelPath).Compute(inputs), Memory().LoadNetwork(path).Compute(inputs))
+
+    def test_unknown_layer(self) -> None:
+        # Arrange:
+        class Custom(Layer):
+            def __init__(self, inputs: int) -> None:
+                self._size = (inputs, inputs)
+
+            def Forward(self, inputs: np.ndarray) -> np.ndarray:
+                return inputs
+
+        network: Network = Sequential([Dense(2, 2), Custom(2)], CrossEntropy(2), 0.1)
+
+        # Act & Assert:
+        self.assertRaises(TypeError, ModelFile.Save, network, self._path)
+
+        ModelFile.Register(Custom)
+        try:
+            ModelFile.Save(network, self._path)
+            self.assertIsInstance(ModelFile.Load(self._path)._layers[1], Custom)
+        finally:
+            del ModelFile.LAYERS["Custom"]
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,21 @@
+import tempfile
 import unittest
 
+from mnist.mnist_dataloader import MnistDataloader
+from mnist.mnist_image import MnistImage
+from mnist.prefetch_dataloader import PrefetchDataloader
+from nn.costs.cross_entropy import CrossEntropy
+from nn.costs.mse import Mse
+from nn.evaluation_report import EvaluationReport
 from nn.layer import Layer
+from nn.layers.dense import Dense
+from nn.layers.relu import Relu
+from nn.layers.softmax import Softmax
 from nn.network import Network
+from nn.networks.sequential import Sequential
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import numpy as np
 
 class TestNetworkConnection(unittest.TestCase):
     def test_fully_connecting_layers(self) -> None:
@@ -40,5 +54,166 @@ class TestNetworkConnection(unittest.TestCase):
         
         self.fail("Layers wasn't connected and still passed!")
 
+class TestNetworkTraining(unittest.TestCase):
+    def test_batch_training_matches_per_sample(self) -> None:
+        # Arrange:
+        layers: list[Layer] = [Dense(28 * 28, 8), Relu(8), Dense(8, 10), Softmax(10)]
+        network: Network    = Sequential(layers, Mse(10), 0.1)
+        batch: list         = [(label, MnistImage(list(np.random.randint(0, 256, size=28 * 28)))) for label in range(10)]
+
+        weightsBefore: list[np.ndarray] = [layer._weights.copy() for layer in layers if isinstance(layer, Dense)]
+
+        # Expected gradients accumulated one sample at a time, the way the network used to train.
+        expectedCost: float = 0.0
+        for (label, image) in batch:
+            expected: np.ndarray = np.zeros(10)
+            expected[label]      = 1.0
+            output: np.ndarray   = network._forward(np.array(image.GetNormalizedPixels()))
+            (derivatives, cost)  = network._cost.ComputeCost(output, expected)
+            expectedCost        += cost
+            network._backward(derivatives, layers)
+
+        expectedGradients: list[np.ndarray] = [layer._dW.copy() for layer in layers if isinstance(layer, Dense)]
+        for layer in layers:
+            if isinstance(layer, Dense):
+                layer._dW.fill(0.0)
+                layer._dB.fill(0.0)
+
+        # Act:
+        averageCost: float = network._trainOneBatch(batch)
+
+        # Assert:
+        self.assertAlmostEqual(averageCost, expectedCost / len(batch))
+        denseLayers: list[Dense] = [layer for layer in layers if isinstance(layer, Dense)]
+        for (layer, before, gradient) in zip(denseLayers, weightsBefore, expectedGradients):
+            np.testing.assert_allclose(layer._weights, before - 0.1 * gradient / len(batch), atol=1e-12)
+
+class TestNetworkDtype(unittest.TestCase):
+    def test_float32_end_to_end(self) -> None:
+        for cost in (Mse(10), CrossEntropy(10)):
+            # Arrange:
+            layers: list[Layer] = [Dense(28 * 28, 8), Relu(8), Dense(8, 10), Relu(10), Softmax(10)]
+            network: Network    = Sequential(layers, cost, 0.1, dtype=np.float32)
+            batch: list         = [(label, MnistImage(list(np.random.randint(0, 256, size=28 * 28)), np.float32)) for label in range(10)]
+
+            # Act:
+            network._trainOneBatch(batch)
+            outputs: np.ndarray = network.Compute(np.random.rand(3, 28 * 28)) # float64 inputs.
+
+            # Assert:
+            self.assertEqual(network.GetDtype(), np.float32)
+            self.assertEqual(outputs.dtype, np.float32)
+            activations: np.ndarray = batch[0][1].GetNormalizedPixels()
+            for layer in layers:
+                activations = layer.Forward(activations)
+                self.assertEqual(activations.dtype, np.float32)
+
+                for (parameter, gradient) in layer.GetParameters():
+                    self.assertEqual(parameter.dtype, np.float32)
+                    self.assertEqual(gradient.dtype, np.float32)
+
+    def test_per_layer_dtype(self) -> None:
+        # Arrange:
+        layer: Dense = Dense(4, 3, dtype=np.float32)
+
+        # Act:
+        outputs: np.ndarray   = layer.Forward(np.ones(4))
+        toProp: np.ndarray    = layer.Backward(np.ones(3))
+        layer.Update(1)
+
+        # Assert:
+        self.assertEqual(outputs.dtype, np.float32)
+        self.assertEqual(toProp.dtype, np.float32)
+        self.assertEqual(layer._weights.dtype, np.float32)
+        self.assertEqual(layer._bias.dtype, np.float32)
+
+class TestNetworkEvaluation(unittest.TestCase):
+    def setUp(self) -> None:
+        self._directory = tempfile.TemporaryDirectory()
+        self._csvPath: Path = Path(self._directory.name) / "mnist_small.csv"
+
+        with open(self._csvPath, "w") as f:
+            for _ in range(37):
+                label: int         = np.random.randint(0, 10)
+                pixels: np.ndarray = np.random.randint(0, 256, size=28 * 28)
+                f.write(",".join(str(val) for val in [label, *pixels]) + "\n")
+
+        self._network: Network = Sequential([Dense(28 * 28, 10), Relu(10), Dense(10, 10), Softmax(10)], Mse(10), 0.1)
+
+    def tearDown(self) -> None:
+        self._directory.cleanup()
+
+    def _expectedCorrect(self) -> int:
+        loader: MnistDataloader = MnistDataloader(self._csvPath, 1)
+        correct: int            = 0
+
+        while len(batch := loader.ReadOneBatch()) > 0:
+            (label, image) = batch[0]
+            correct       += int(np.argmax(self._network.Compute(image.GetNormalizedPixels())) == label)
+
+        return correct
+
+    def test_evaluate_matches_per_image(self) -> None:
+        # Arrange:
+        expectedCorrect: int = self._expectedCorrect()
+
+        loaders: list = [
+            (MnistDataloader(self._csvPath, 10), None),
+            (MnistDataloader(self._csvPath, 10, useCache=True), 8),
+            (MnistDataloader(self._csvPath, 10, useCache=True), 1000),
+            (PrefetchDataloader(MnistDataloader(self._csvPath, 10)), None)
+        ]
+
+        for (loader, chunkSize) in loaders:
+            # Act:
+            report: EvaluationReport = self._network.EvaluateReport(loader, chunkSize)
+
+            # Assert:
+            self.assertEqual(report.total, 37)
+            self.assertEqual(report.correct, expectedCorrect)
+            self.assertAlmostEqual(report.GetAccuracy(), expectedCorrect / 37)
+            self.assertGreaterEqual(report.seconds, 0.0)
+
+class TestNetworkThreadSafety(unittest.TestCase):
+    def test_compute_from_many_threads(self) -> None:
+        # Arrange:
+        network: Network     = Sequential([Dense(28 * 28, 32), Relu(32), Dense(32, 10), Softmax(10)], CrossEntropy(10), 0.1)
+        images: np.ndarray   = np.random.rand(64, 28 * 28)
+        expected: np.ndarray = np.array([network.Compute(image) for image in images])
+
+        def compute(index: int) -> np.ndarray:
+            # Batches of different sizes and single images, so that a shared buffer would show up as wrong rows.
+            if index % 2 == 0:
+                return np.array([network.Compute(image) for image in images[index:index + 8]])
+
+            return network.Compute(images[index:index + 1 + index % 7])
+
+        # Act:
+        for _ in range(5):
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                results: list[np.ndarray] = list(pool.map(compute, range(len(images))))
+
+            # Assert:
+            for (index, result) in enumerate(results):
+                rows: int = len(images[index:index + 8]) if index % 2 == 0 else len(images[index:index + 1 + index % 7])
+                np.testing.assert_allclose(result, expected[index:index + rows], rtol=1e-12)
+
+    def test_compute_stores_nothing(self) -> None:
+        # Arrange:
+        network: Network = Sequential([Dense(28 * 28, 16), Relu(16), Dense(16, 10), Softmax(10)], CrossEntropy(10), 0.1)
+        before: dict     = {id(layer): dict(layer.__dict__) for layer in network._layers}
+
+        # Act:
+        first: np.ndarray  = network.Compute(np.random.rand(4, 28 * 28))
+        second: np.ndarray = network.Compute(np.random.rand(4, 28 * 28))
+
+        # Assert:
+        self.assertFalse(np.shares_memory(first, second))
+        self.assertIsNone(network._workspace)
+        for layer in network._layers:
+            self.assertEqual(layer.__dict__.keys(), before[id(layer)].keys())
+            for (name, value) in layer.__dict__.items():
+                self.assertIs(value, before[id(layer)][name])
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,159 @@
+import tracemalloc
+import unittest
+
+from nn.costs.mse import Mse
+from nn.layers.dense import Dense
+from nn.network import Network
+from nn.networks.sequential import Sequential
+from nn.optimizer import Optimizer
+from nn.optimizers.adam import Adam
+from nn.optimizers.nesterov import Nesterov
+from nn.optimizers.sgd import Sgd
+import numpy as np
+
+class TestOptimizerSteps(unittest.TestCase):
+    def _step(self, optimizer: Optimizer, gradients: list[np.ndarray]) -> np.ndarray:
+        parameter: np.ndarray = np.array([1.0, -2.0, 3.0])
+        state: dict           = {}
+
+        for gradient in gradients:
+            optimizer.Step(parameter, gradient.copy() * 4, state, 4) # Summed over a batch of 4.
+
+        return parameter
+
+    def test_sgd(self) -> None:
+        # Arrange:
+        gradients: list[np.ndarray] = [np.random.normal(size=3) for _ in range(3)]
+
+        # Act:
+        parameter: np.ndarray = self._step(Sgd(0.1), gradients)
+
+        # Assert:
+        np.testing.assert_allclose(parameter, np.array([1.0, -2.0, 3.0]) - 0.1 * sum(gradients))
+
+    def test_momentum_and_nesterov(self) -> None:
+        # Arrange:
+        gradients: list[np.ndarray] = [np.random.normal(size=3) for _ in range(3)]
+
+        # The textbook updates.
+        expectedMomentum: np.ndarray = np.array([1.0, -2.0, 3.0])
+        expectedNesterov: np.ndarray = np.array([1.0, -2.0, 3.0])
+        velocity: np.ndarray         = np.zeros(3)
+        for gradient in gradients:
+            velocity          = 0.9 * velocity + gradient
+            expectedMomentum -= 0.1 * velocity
+            expectedNesterov -= 0.1 * (gradient + 0.9 * velocity)
+
+        # Act:
+        momentum: np.ndarray = self._step(Sgd(0.1, momentum=0.9), gradients)
+        nesterov: np.ndarray = self._step(Nesterov(0.1, momentum=0.9), gradients)
+
+        # Assert:
+        np.testing.assert_allclose(momentum, expectedMomentum)
+        np.testing.assert_allclose(nesterov, expectedNesterov)
+
+    def test_adam(self) -> None:
+        # Arrange:
+        gradients: list[np.ndarray] = [np.random.normal(size=3) for _ in range(5)]
+
+        # The textbook update with both moments bias corrected.
+        expected: np.ndarray      = np.array([1.0, -2.0, 3.0])
+        moment: np.ndarray        = np.zeros(3)
+        squaredMoment: np.ndarray = np.zeros(3)
+        for (step, gradient) in enumerate(gradients, start=1):
+            moment        = 0.9 * moment + 0.1 * gradient
+            squaredMoment = 0.999 * squaredMoment + 0.001 * gradient ** 2
+            correctedMoment: np.ndarray        = moment / (1 - 0.9 ** step)
+            correctedSquaredMoment: np.ndarray = squaredMoment / (1 - 0.999 ** step)
+            expected -= 0.01 * correctedMoment / (np.sqrt(correctedSquaredMoment) + 1e-8)
+
+        # Act:
+        parameter: np.ndarray = self._step(Adam(0.01), gradients)
+
+        # Assert:
+        np.testing.assert_allclose(parameter, expected, rtol=1e-6)
+
+    def test_wrong_settings(self) -> None:
+        # Assert:
+        self.assertRaises(RuntimeError, Sgd, 0.0)
+        self.assertRaises(RuntimeError, Sgd, 0.1, 1.0)
+        self.assertRaises(RuntimeError, Nesterov, 0.1, 0.0)
+        self.assertRaises(RuntimeError, Adam, 0.1, 1.0)
+
+class TestOptimizerTraining(unittest.TestCase):
+    def _createNetwork(self, optimizer: Optimizer) -> Network:
+        layer: Dense    = Dense(8, 4)
+        layer._weights  = np.full((4, 8), 0.1)
+        layer._bias     = np.zeros(4)
+
+        return Sequential([layer], Mse(4), optimizer)
+
+    def test_updates_in_place_without_allocating(self) -> None:
+        for optimizer in (Sgd(0.1), Sgd(0.1, momentum=0.9), Nesterov(0.1), Adam(0.01)):
+            # Arrange:
+            layer: Dense         = Dense(64, 32)
+            network: Network     = Sequential([layer], Mse(32), optimizer)
+            weights: np.ndarray  = layer._weights
+            inputs: np.ndarray   = np.random.rand(16, 64)
+            expected: np.ndarray = np.random.rand(16, 32)
+
+            network.AccumulateGradients(inputs, expected)
+            network.UpdateLayers(len(inputs)) # Creates the optimizer state.
+            network.AccumulateGradients(inputs, expected)
+
+            # Act:
+            tracemalloc.start()
+            network.UpdateLayers(len(inputs))
+            (_, peak) = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            # Assert:
+            self.assertIs(layer._weights, weights)
+            self.assertLess(peak, weights.nbytes)
+            np.testing.assert_array_equal(layer._dW, 0.0)
+
+    def test_momentum_and_adam_train_faster(self) -> None:
+        # Arrange: A badly conditioned linear regression, where plain SGD is slow.
+        target: np.ndarray   = np.random.normal(size=(4, 8))
+        inputs: np.ndarray   = np.random.rand(64, 8) * np.array([1.0, 1.0, 1.0, 1.0, 0.1, 0.1, 0.1, 0.1])
+        expected: np.ndarray = inputs @ target.T
+
+        costs: dict[str, float] = {}
+        for (name, optimizer) in (("sgd", Sgd(0.1)), ("momentum", Sgd(0.1, momentum=0.9)), ("nesterov", Nesterov(0.1)), ("adam", Adam(0.05))):
+            network: Network = self._createNetwork(optimizer)
+
+            # Act:
+            for _ in range(200):
+                network.AccumulateGradients(inputs, expected)
+                network.UpdateLayers(len(inputs))
+
+            costs[name] = network.AccumulateGradients(inputs, expected)
+
+        # Assert:
+        self.assertLess(costs["momentum"], costs["sgd"])
+        self.assertLess(costs["nesterov"], costs["sgd"])
+        self.assertLess(costs["adam"], costs["sgd"])
+
+class TestOptimizerCompatibility(unittest.TestCase):
+    def test_learning_rate_means_sgd(self) -> None:
+        # Act:
+        network: Network = Sequential([Dense(2, 2)], Mse(2), 0.5)
+
+        # Assert:
+        self.assertIsInstance(network._optimizer, Sgd)
+        self.assertEqual(network._optimizer._learningRate, 0.5)
+
+    def test_migrates_network_saved_with_learning_rate(self) -> None:
+        # Arrange:
+        network: Network = Network.__new__(Network)
+
+        # Act:
+        network.__setstate__({"_layers": [Dense(2, 2)], "_cost": Mse(2), "_learningRate": 0.01})
+
+        # Assert:
+        self.assertFalse(hasattr(network, "_learningRate"))
+        self.assertIsInstance(network._optimizer, Sgd)
+        self.assertEqual(network._optimizer._learningRate, 1.0)
+
+if __name__ == "__main__":
+    unittest.main()
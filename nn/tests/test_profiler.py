@@ -0,0 +1,104 @@
+import tempfile
+import tracemalloc
+import unittest
+
+from mnist.mnist_dataloader import MnistDataloader
+from nn.costs.cross_entropy import CrossEntropy
+from nn.layers.dense import Dense
+from nn.layers.relu import Relu
+from nn.layers.softmax import Softmax
+from nn.memory import Memory
+from nn.network import Network
+from nn.networks.sequential import Sequential
+from nn.profiler import ProfileEntry, Profiler
+from pathlib import Path
+import numpy as np
+
+class TestNetworkProfiling(unittest.TestCase):
+    def setUp(self) -> None:
+        self._network: Network = Sequential([Dense(28 * 28, 8), Relu(8), Dense(8, 10), Softmax(10)], CrossEntropy(10), 0.1)
+        self._directory        = tempfile.TemporaryDirectory()
+        self._csvPath: Path    = Path(self._directory.name) / "mnist_small.csv"
+
+        with open(self._csvPath, "w") as f:
+            for label in range(25):
+                f.write(",".join(str(val) for val in [label % 10, *np.random.randint(0, 256, size=28 * 28)]) + "\n")
+
+    def tearDown(self) -> None:
+        self._directory.cleanup()
+
+    def test_records_every_phase(self) -> None:
+        # Arrange:
+        profiler: Profiler = self._network.EnableProfiling(Profiler(trackAllocations=True))
+
+        # Act:
+        self._network.TrainOneEpoch(MnistDataloader(self._csvPath, 10))
+        self._network.DisableProfiling()
+        self._network.TrainOneEpoch(MnistDataloader(self._csvPath, 10)) # Not recorded.
+
+        # Assert:
+        entries: dict[tuple[str, str], ProfileEntry] = {(entry.scope, entry.phase): entry for entry in profiler.GetReport()}
+        self.assertEqual(entries[("network", "read")].calls, 4) # 3 batches and the empty read at the end.
+        self.assertEqual(entries[("network", "cost")].calls, 3)
+        self.assertEqual(entries[("0:Dense", "forward")].calls, 3)
+        self.assertEqual(entries[("2:Dense", "backward")].calls, 3)
+        self.assertEqual(entries[("3:Softmax", "update")].calls, 3)
+        self.assertNotIn(("3:Softmax", "backward"), entries) # Fused with the cross entropy.
+        self.assertGreater(entries[("network", "read")].bytesAllocated, 0)
+        self.assertIn("0:Dense", profiler.GetSummary())
+
+    def test_disabling_stops_allocation_tracing(self) -> None:
+        # Arrange:
+        profiler: Profiler = self._network.EnableProfiling(Profiler(trackAllocations=True))
+        self._network.Compute(np.zeros(28 * 28))
+        tracing: bool = tracemalloc.is_tracing()
+
+        # Act:
+        self._network.DisableProfiling()
+
+        # Assert:
+        self.assertTrue(tracing)
+        self.assertFalse(tracemalloc.is_tracing())
+        self.assertGreater(len(profiler.GetReport()), 0)
+
+    def test_does_not_stop_tracing_it_did_not_start(self) -> None:
+        # Arrange:
+        tracemalloc.start()
+        self.addCleanup(tracemalloc.stop)
+        self._network.EnableProfiling(Profiler(trackAllocations=True))
+
+        # Act:
+        self._network.Compute(np.zeros(28 * 28))
+        self._network.DisableProfiling()
+
+        # Assert:
+        self.assertTrue(tracemalloc.is_tracing())
+
+    def test_callback(self) -> None:
+        # Arrange:
+        calls: list[tuple[str, str]] = []
+        self._network.EnableProfiling(Profiler(callback=lambda scope, phase, seconds, bytesAllocated: calls.append((scope, phase))))
+
+        # Act:
+        self._network.Compute(np.zeros(28 * 28))
+
+        # Assert:
+        self.assertEqual(calls, [("0:Dense", "infer"), ("1:Relu", "infer"), ("2:Dense", "infer"), ("3:Softmax", "infer")])
+
+    def test_profiler_is_not_saved(self) -> None:
+        # Arrange:
+        self._network.EnableProfiling(Profiler(callback=lambda *arguments: None))
+
+        with tempfile.TemporaryDirectory() as directory:
+            path: Path = Path(directory) / "network.pkl"
+
+            # Act:
+            Memory().SaveNetwork(self._network, path)
+            loaded: Network = Memory().LoadNetwork(path)
+
+        # Assert:
+        self.assertIsNone(loaded.GetProfiler())
+        self.assertIsNotNone(self._network.GetProfiler())
+
+if __name__ == "__main__":
+    unittest.main()
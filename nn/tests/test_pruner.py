@@ -0,0 +1,86 @@
+import tempfile
+import unittest
+
+from mnist.mnist_dataloader import MnistDataloader
+from nn.costs.cross_entropy import CrossEntropy
+from nn.layers.dense import Dense
+from nn.layers.relu import Relu
+from nn.layers.softmax import Softmax
+from nn.network import Network
+from nn.networks.sequential import Sequential
+from nn.pruner import Pruner, UnitStatistics
+from pathlib import Path
+import numpy as np
+
+class TestPruner(unittest.TestCase):
+    def setUp(self) -> None:
+        self._network: Network = Sequential([Dense(28 * 28, 8), Relu(8), Dense(8, 10), Relu(10), Softmax(10)], CrossEntropy(10), 0.1)
+        self._directory        = tempfile.TemporaryDirectory()
+        self._csvPath: Path    = Path(self._directory.name) / "mnist_small.csv"
+
+        for layer in self._network._layers:
+            for (parameter, _) in layer.GetParameters():
+                parameter[...] = np.abs(np.random.normal(scale=0.1, size=parameter.shape))
+
+        # Units 2 and 5 can never be above 0, since all their weights and their bias are negative.
+        hidden: Dense = self._network._layers[0]
+        hidden._weights[[2, 5]] *= -1.0
+        hidden._bias[[2, 5]]     = -1.0
+
+        with open(self._csvPath, "w") as f:
+            for label in range(30):
+                f.write(",".join(str(val) for val in [label % 10, *np.random.randint(0, 256, size=28 * 28)]) + "\n")
+
+    def tearDown(self) -> None:
+        self._directory.cleanup()
+
+    def test_collects_statistics(self) -> None:
+        # Act:
+        statistics: dict[int, UnitStatistics] = Pruner(chunkSize=7).CollectStatistics(self._network, MnistDataloader(self._csvPath, 10))
+
+        # Assert: Only the first Relu sits between two dense layers.
+        self.assertEqual(list(statistics.keys()), [1])
+        self.assertEqual(statistics[1].images, 30)
+        np.testing.assert_array_equal(np.flatnonzero(statistics[1].activeCounts == 0), [2, 5])
+        self.assertTrue(np.all(statistics[1].GetMeanActivation() >= 0.0))
+
+    def test_removes_dead_units_without_changing_outputs(self) -> None:
+        # Arrange:
+        images: np.ndarray = np.random.rand(20, 28 * 28)
+
+        # Act:
+        pruned: Network = Pruner().Prune(self._network, MnistDataloader(self._csvPath, 10))
+
+        # Assert:
+        self.assertEqual([layer.GetSize() for layer in pruned._layers], [(784, 6), (6, 6), (6, 10), (10, 10), (10, 10)])
+        np.testing.assert_allclose(pruned.Compute(images), self._network.Compute(images), rtol=1e-12)
+        np.testing.assert_array_equal(pruned._layers[2]._weights, self._network._layers[2]._weights[:, [0, 1, 3, 4, 6, 7]])
+        pruned.CheckLayerConnection()
+
+    def test_removes_weak_units_and_fine_tunes(self) -> None:
+        # Arrange:
+        before: np.ndarray = self._network._layers[2]._weights.copy()
+        self._network._layers[2]._weights[:, 0] = 1e-6 # Unit 0 barely reaches the next layer.
+
+        # Act:
+        pruned: Network    = Pruner(magnitudeRatio=0.01).Prune(self._network, MnistDataloader(self._csvPath, 10))
+        costs: list[float] = Pruner.FineTune(pruned, MnistDataloader(self._csvPath, 10), 2)
+
+        # Assert:
+        self.assertEqual(pruned._layers[0].GetOutputSize(), 5)
+        self.assertEqual(len(costs), 2)
+        np.testing.assert_array_equal(self._network._layers[2]._weights[:, 1:], before[:, 1:]) # The original isn't trained.
+
+    def test_keeps_one_unit(self) -> None:
+        # Arrange:
+        self._network._layers[0]._bias[:] = -1000.0 # Every unit is dead.
+
+        # Act:
+        pruned: Network = Pruner().Prune(self._network, MnistDataloader(self._csvPath, 10))
+
+        # Assert:
+        self.assertEqual(pruned._layers[1].GetSize(), (1, 1))
+        self.assertRaises(TypeError, Pruner, magnitudeRatio=1.0)
+
+if __name__ == "__main__":
+    unittest.main()
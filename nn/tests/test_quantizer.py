@@ -0,0 +1,145 @@
+import pickle
+import tempfile
+import unittest
+
+from mnist.mnist_dataloader import MnistDataloader
+from nn.costs.cross_entropy import CrossEntropy
+from nn.layers.dense import Dense
+from nn.layers.quantized_dense import QuantizedDense
+from nn.layers.relu import Relu
+from nn.layers.softmax import Softmax
+from nn.memory import Memory
+from nn.network import Network
+from nn.networks.sequential import Sequential
+from nn.quantizer import QuantizationReport, Quantizer
+from pathlib import Path
+import numpy as np
+
+class TestQuantizedDense(unittest.TestCase):
+    def test_close_to_dense(self) -> None:
+        # Arrange:
+        layer: Dense       = Dense(64, 8)
+        layer._weights[:]  = np.random.normal(scale=0.1, size=(8, 64))
+        layer._bias[:]     = np.random.normal(size=8)
+        inputs: np.ndarray = np.random.rand(20, 64)
+
+        # Act:
+        quantized: QuantizedDense = QuantizedDense.FromDense(layer, 1.0 / 127)
+        outputs: np.ndarray       = quantized.Infer(inputs)
+
+        # Assert: Every weight and input is off by at most half a step.
+        expected: np.ndarray = layer.Infer(inputs)
+        self.assertEqual(quantized.GetWeights()["weights"].dtype, np.int8)
+        self.assertLess(np.max(np.abs(outputs - expected)), 0.05)
+        np.testing.assert_array_equal(quantized.Infer(inputs[0]), outputs[0])
+
+    def test_accumulations_are_equal(self) -> None:
+        # Arrange: More outputs than fit in one block of the float accumulation.
+        layer: Dense       = Dense(784, 200, dtype=np.float32)
+        layer._weights[:]  = np.random.normal(scale=0.1, size=(200, 784))
+        inputs: np.ndarray = np.random.rand(10, 784).astype(np.float32)
+
+        # Act:
+        outputs: dict[str, np.ndarray] = {accumulate: QuantizedDense.FromDense(layer, 1.0 / 127, accumulate).Infer(inputs) for accumulate in QuantizedDense.ACCUMULATE}
+        single: np.ndarray             = QuantizedDense.FromDense(layer, 1.0 / 127, "float").Infer(inputs[3])
+
+        # Assert: The integer sums are exact in all of them.
+        self.assertGreater(200, QuantizedDense.BLOCK_SIZE // 784)
+        np.testing.assert_array_equal(outputs["float"], outputs["int32"])
+        np.testing.assert_array_equal(outputs["float-cached"], outputs["int32"])
+        np.testing.assert_array_equal(single, outputs["float"][3])
+        self.assertEqual(outputs["float"].dtype, np.float32)
+
+    def test_only_float_cached_keeps_a_float_copy(self) -> None:
+        # Arrange:
+        layer: Dense = Dense(16, 4, dtype=np.float32)
+
+        # Act:
+        layers: dict[str, QuantizedDense] = {accumulate: QuantizedDense.FromDense(layer, 1.0 / 127, accumulate) for accumulate in QuantizedDense.ACCUMULATE}
+
+        # Assert:
+        self.assertIsNone(layers["float"]._accumulateWeights)
+        self.assertIsNone(layers["int32"]._accumulateWeights)
+        self.assertEqual(layers["float-cached"]._accumulateWeights.dtype, np.float32)
+
+    def test_clips_inputs_and_cant_train(self) -> None:
+        # Arrange:
+        layer: QuantizedDense = QuantizedDense(4, 2, inputScale=0.5)
+
+        # Act:
+        steps: np.ndarray = layer.QuantizeInputs(np.array([0.26, -1.0, 100.0, -100.0]))
+
+        # Assert:
+        np.testing.assert_array_equal(steps, [1, -2, 127, -127])
+        self.assertRaises(RuntimeError, layer.Backward, np.zeros(2))
+        self.assertEqual(layer.GetParameters(), [])
+        self.assertRaises(TypeError, QuantizedDense, 4, 2, accumulate="int4")
+
+class TestQuantizer(unittest.TestCase):
+    def setUp(self) -> None:
+        self._network: Network = Sequential([Dense(28 * 28, 16), Relu(16), Dense(16, 10), Softmax(10)], CrossEntropy(10), 0.1)
+        self._directory        = tempfile.TemporaryDirectory()
+        self._csvPath: Path    = Path(self._directory.name) / "mnist_small.csv"
+
+        for layer in self._network._layers:
+            for (parameter, _) in layer.GetParameters():
+                parameter[...] = np.random.normal(scale=0.1, size=parameter.shape)
+
+        with open(self._csvPath, "w") as f:
+            for label in range(40):
+                f.write(",".join(str(val) for val in [label % 10, *np.random.randint(0, 256, size=28 * 28)]) + "\n")
+
+    def tearDown(self) -> None:
+        self._directory.cleanup()
+
+    def test_calibrates_dense_inputs(self) -> None:
+        # Act:
+        largest: list = Quantizer(calibrationSize=25).Calibrate(self._network, MnistDataloader(self._csvPath, 10))
+
+        # Assert:
+        self.assertEqual(largest[1::2], [None, None])
+        self.assertLessEqual(largest[0], 1.0)
+        self.assertGreater(largest[2], 0.0)
+
+    def test_quantize_and_compare(self) -> None:
+        # Arrange:
+        quantizer: Quantizer = Quantizer(calibrationSize=25)
+
+        # Act:
+        quantized: Network         = quantizer.Quantize(self._network, MnistDataloader(self._csvPath, 10))
+        report: QuantizationReport = Quantizer.Compare(self._network, quantized, MnistDataloader(self._csvPath, 10), 16)
+
+        # Assert:
+        images: np.ndarray = np.random.rand(40, 28 * 28)
+        self.assertEqual([type(layer).__name__ for layer in quantized._layers], ["QuantizedDense", "Relu", "QuantizedDense", "Softmax"])
+        self.assertGreaterEqual(np.mean(np.argmax(quantized.Compute(images), 1) == np.argmax(self._network.Compute(images), 1)), 0.9)
+        self.assertEqual(report.floatReport.total, 40)
+        self.assertEqual(report.quantizedReport.total, 40)
+        # float64 weights and 26 biases, against int8 weights and float64 biases and scales.
+        self.assertAlmostEqual(report.GetCompression(), (784 * 16 + 16 * 10 + 26) * 8 / (784 * 16 + 16 * 10 + 26 * 8 * 2))
+        self.assertIn("Accuracy drop", report.GetSummary())
+
+    def test_model_file_is_smaller(self) -> None:
+        # Arrange:
+        quantized: Network = Quantizer(calibrationSize=25).Quantize(self._network, MnistDataloader(self._csvPath, 10))
+        images: np.ndarray = np.random.rand(5, 28 * 28)
+
+        with tempfile.TemporaryDirectory() as directory:
+            floatPath: Path     = Path(directory) / "float.model"
+            quantizedPath: Path = Path(directory) / "int8.model"
+
+            # Act:
+            Memory().SaveNetwork(self._network, floatPath)
+            Memory().SaveNetwork(quantized, quantizedPath)
+            loaded: Network = Memory().LoadNetwork(quantizedPath, memoryMap=True)
+
+            # Assert:
+            self.assertLess(quantizedPath.stat().st_size * 6, floatPath.stat().st_size)
+            np.testing.assert_array_equal(loaded.Compute(images), quantized.Compute(images))
+            self.assertIsInstance(loaded._layers[0]._weights, np.memmap)
+            self.assertIsNone(loaded._layers[0]._accumulateWeights)
+            np.testing.assert_array_equal(pickle.loads(pickle.dumps(quantized)).Compute(images), quantized.Compute(images))
+            del loaded
+
+if __name__ == "__main__":
+    unittest.main()
@@ -37,5 +37,19 @@ class TestReluComputation(unittest.TestCase):
         np.testing.assert_array_equal(toProp1, np.array([1.0, -1.0, 0.0]))
         np.testing.assert_array_equal(toProp2, np.array([-1.0, 0.0, 0.0]))
 
+    def test_computes_correct_batch(self) -> None:
+        # Arrange:
+        relu: Layer            = Relu(3)
+        inputs: np.array      = np.array([[4.0, 3.0, -1.0], [1.0, -10.0, -15.0]])
+        derivatives: np.array = np.array([[1.0, -1.0, -2.0], [-1.0, 1.0, 1.0]])
+
+        # Act:
+        outputs: np.array = relu.Forward(inputs)
+        toProp: np.array  = relu.Backward(derivatives)
+
+        # Assert:
+        np.testing.assert_array_equal(outputs, np.array([[4.0, 3.0, 0.0], [1.0, 0.0, 0.0]]))
+        np.testing.assert_array_equal(toProp, np.array([[1.0, -1.0, 0.0], [-1.0, 0.0, 0.0]]))
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -35,5 +35,38 @@ class TestReluComputation(unittest.TestCase):
         # Assert:
         np.testing.assert_allclose(toProp, expectedToProp, rtol=1e-6)
 
+    def test_computes_correct_batch(self) -> None:
+        # Arrange:
+        softmax: Layer                = Softmax(3)
+        inputs: np.array              = np.array([[1.0, 2.0, 3.0], [2.0, 1.0, 0.1]])
+        incomingDerivatives: np.array = np.array([[0.1, -0.2, 0.3], [-0.5, 0.2, 0.0]])
+
+        # Act:
+        outputs: np.array = softmax.Forward(inputs)
+        toProp: np.array  = softmax.Backward(incomingDerivatives)
+
+        expectedOutputs: list[np.array] = []
+        expectedToProp: list[np.array]  = []
+        for (row, rowDerivatives) in zip(inputs, incomingDerivatives):
+            expectedOutputs.append(softmax.Forward(row))
+            expectedToProp.append(softmax.Backward(rowDerivatives))
+
+        # Assert:
+        np.testing.assert_allclose(outputs, np.array(expectedOutputs), rtol=1e-6)
+        np.testing.assert_allclose(toProp, np.array(expectedToProp), rtol=1e-6)
+
+    def test_infer_matches_forward(self) -> None:
+        # Arrange:
+        softmax: Layer   = Softmax(3)
+        inputs: np.array = np.array([[1.0, 2.0, 3.0], [2.0, 1.0, 0.1]], dtype=np.float32)
+
+        # Act:
+        inferred: np.array = softmax.Infer(inputs)
+
+        # Assert:
+        np.testing.assert_allclose(inferred, softmax.Forward(inputs), rtol=1e-6)
+        np.testing.assert_allclose(softmax.Infer(inputs[1]), inferred[1], rtol=1e-6)
+        self.assertEqual(inferred.dtype, np.float32)
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
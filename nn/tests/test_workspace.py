@@ -0,0 +1,79 @@
+import pickle
+import tracemalloc
+import unittest
+
+from mnist.mnist_image import MnistImage
+from nn.costs.cross_entropy import CrossEntropy
+from nn.layers.dense import Dense
+from nn.layers.relu import Relu
+from nn.layers.softmax import Softmax
+from nn.network import Network
+from nn.networks.sequential import Sequential
+from nn.workspace import Workspace
+import numpy as np
+
+class TestWorkspaceBuffers(unittest.TestCase):
+    def test_reuses_buffer(self) -> None:
+        # Arrange:
+        workspace: Workspace = Workspace()
+
+        # Act:
+        first: np.ndarray   = workspace._buffer("outputs", (8, 4), np.float64)
+        second: np.ndarray  = workspace._buffer("outputs", (8, 4), np.float64)
+        smaller: np.ndarray = workspace._buffer("outputs", (3, 4), np.float64)
+        other: np.ndarray   = workspace._buffer("outputs", (8, 4), np.float32)
+
+        # Assert:
+        self.assertIs(first, second)
+        self.assertEqual(smaller.shape, (3, 4))
+        self.assertTrue(np.shares_memory(first, smaller))
+        self.assertEqual(other.dtype, np.float32)
+
+    def test_layer_outputs_reuse_buffer(self) -> None:
+        # Arrange:
+        layer: Dense = Dense(4, 3)
+
+        # Act:
+        first: np.ndarray  = layer.Forward(np.ones((5, 4)))
+        second: np.ndarray = layer.Forward(np.zeros((5, 4)))
+
+        # Assert:
+        self.assertIs(first, second)
+        np.testing.assert_array_equal(second, np.tile(layer._bias, (5, 1)))
+
+    def test_buffers_are_not_pickled(self) -> None:
+        # Arrange:
+        layer: Dense = Dense(4, 3)
+        layer.Forward(np.ones((5, 4)))
+
+        # Act:
+        loaded: Dense = pickle.loads(pickle.dumps(layer))
+
+        # Assert:
+        self.assertIsNone(loaded._workspace)
+        np.testing.assert_array_equal(loaded._weights, layer._weights)
+
+class TestWorkspaceTraining(unittest.TestCase):
+    def test_steady_state_training_does_not_allocate(self) -> None:
+        # Arrange:
+        network: Network = Sequential([Dense(28 * 28, 64), Relu(64), Dense(64, 10), Softmax(10)], CrossEntropy(10), 0.1)
+        batch: list      = [(label % 10, MnistImage(list(np.random.randint(0, 256, size=28 * 28)))) for label in range(256)]
+
+        network._trainOneBatch(batch) # Allocates the buffers.
+
+        # Act:
+        tracemalloc.start()
+        (start, _) = tracemalloc.get_traced_memory()
+        for _ in range(5):
+            network._trainOneBatch(batch)
+        (end, peak) = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        # Assert: Nothing is kept between batches, and nothing the size of the batch's inputs or activations
+        # (256 * 784 * 8 and 256 * 64 * 8 bytes) is allocated. Broadcasting ufuncs may still use numpy's own
+        # fixed size iteration buffer (8192 elements) while they run.
+        self.assertLess(end - start, 1024)
+        self.assertLess(peak - start, 100 * 1024)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import numpy as np
+
+class Workspace():
+    """
+        A base class for objects that keep their intermediate arrays (outputs, gradients, scratch space)
+        between calls instead of allocating new ones every call. A buffer is allocated the first time it's
+        asked for and then reused, as long as it's big enough and of the right type. Asking for fewer rows than
+        the buffer has (ex: the last, smaller, batch of an epoch) returns a view of the first rows, so the buffer
+        isn't thrown away.
+
+        The buffers are not saved when pickling, since they only hold temporary values.
+    """
+
+    # Set on the class so that objects saved before the workspace existed still load.
+    _workspace: dict[str, np.ndarray] | None = None
+
+    def _buffer(self, name: str, shape: tuple[int, ...], dtype: np.typing.DTypeLike) -> np.ndarray:
+        """
+            Gets the buffer with the given name, allocating it if it doesn't exist yet or doesn't fit.
+            The content of the returned buffer is whatever was written to it last.
+
+            :param name: The name of the buffer, unique within the object.
+            :type name: str
+
+            :param shape: The shape of the buffer. The first dimension is the amount of rows.
+            :type shape: tuple[int, ...]
+
+            :param dtype: The type of the buffer.
+            :type dtype: numpy.typing.DTypeLike
+
+            :return: The buffer, of exactly the asked for shape.
+            :rtype: numpy.ndarray
+        """
+        if self._workspace is None:
+            self._workspace = {}
+
+        buffer: np.ndarray | None = self._workspace.get(name)
+
+        if buffer is None or buffer.dtype != dtype or buffer.shape[1:] != shape[1:] or buffer.shape[0] < shape[0]:
+            buffer                = np.empty(shape, dtype=dtype)
+            self._workspace[name] = buffer
+
+        return buffer if buffer.shape[0] == shape[0] else buffer[:shape[0]]
+
+    def __getstate__(self) -> dict:
+        state: dict = self.__dict__.copy()
+        state.pop("_workspace", None) # Temporary values only, don't save them.
+
+        return state
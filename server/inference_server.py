@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from mnist.preprocessor import Preprocessor
+from nn.network import Network
+from pathlib import Path
+from server.micro_batcher import BatcherStats, MicroBatcher
+import json
+import numpy as np
+import socketserver
+import threading
+
+class InferenceServer():
+    """
+        Serves a network over a local HTTP endpoint, either on a TCP port or on a Unix socket. Every request
+        is one image, and the requests of all connections are coalesced into batches by a MicroBatcher.
+
+        Endpoints:
+            POST /predict   body {"pixels": [784 values from 0 to 255]}, answers {"prediction": 7, "probabilities": [...]}.
+            GET  /stats     answers the queue depth, batch size histogram and latency percentiles.
+            GET  /health    answers {"status": "ok"}.
+    """
+
+    def __init__(self: "InferenceServer", network: Network, host: str = "127.0.0.1", port: int = 8000, unixSocket: str | Path | None = None,
+                 maxBatchSize: int = 32, maxWaitSeconds: float = 0.002, preprocessor: Preprocessor | None = None) -> None:
+        """
+            :param network: The network to serve. It's frozen (see nn.Network.Freeze), so training it
+            afterwards doesn't change what is served.
+            :type network: nn.Network
+
+            :param host: The host to listen on, when not using a Unix socket.
+            :type host: str
+
+            :param port: The port to listen on, when not using a Unix socket. 0 picks a free port (see GetAddress).
+            :type port: int
+
+            :param unixSocket: The path of a Unix socket to listen on instead of a TCP port.
+            :type unixSocket: str | pathlib.Path | None
+
+            :param maxBatchSize: The most requests run as one batch.
+            :type maxBatchSize: int
+
+            :param maxWaitSeconds: The longest time a request waits for more requests to join its batch.
+            :type maxWaitSeconds: float
+
+            :param preprocessor: Scales and centers the images like the mnist digits before they are predicted, for
+            clients that send digits as they were drawn. The images are used as they are if None.
+            :type preprocessor: mnist.Preprocessor | None
+        """
+        self._batcher: MicroBatcher             = MicroBatcher(network.Freeze(), maxBatchSize, maxWaitSeconds)
+        self._preprocessor: Preprocessor | None = preprocessor
+        self._thread: threading.Thread | None   = None
+        self._unixSocket: Path | None           = Path(unixSocket).resolve() if unixSocket is not None else None
+
+        if self._unixSocket is not None:
+            self._unixSocket.unlink(missing_ok=True) # Left over from a server that didn't shut down cleanly.
+            self._httpServer: socketserver.BaseServer = _UnixHTTPServer(str(self._unixSocket), _RequestHandler)
+        else:
+            self._httpServer: socketserver.BaseServer = ThreadingHTTPServer((host, port), _RequestHandler)
+
+        self._httpServer.daemon_threads  = True
+        self._httpServer.inferenceServer = self
+
+    def ServeForever(self) -> None:
+        """
+            Answers requests until Close is called (from another thread) or the process is interrupted.
+        """
+        try:
+            self._httpServer.serve_forever()
+        finally:
+            self.Close()
+
+    def Start(self) -> None:
+        """
+            Answers requests on a background thread.
+        """
+        self._thread = threading.Thread(target=self._httpServer.serve_forever, name="InferenceServer", daemon=True)
+        self._thread.start()
+
+    def Close(self) -> None:
+        """
+            Stops answering requests and closes the socket.
+        """
+        if self._thread is not None:
+            self._httpServer.shutdown()
+            self._thread.join()
+            self._thread = None
+
+        self._httpServer.server_close()
+        self._batcher.Close()
+
+        if self._unixSocket is not None:
+            self._unixSocket.unlink(missing_ok=True)
+
+    def GetAddress(self) -> tuple[str, int] | str:
+        """
+            :return: The (host, port) listened on, or the path of the Unix socket.
+            :rtype: tuple[str, int] | str
+        """
+        return self._httpServer.server_address
+
+    def GetBatcher(self) -> MicroBatcher:
+        return self._batcher
+
+    def GetStats(self) -> dict:
+        """
+            :return: The statistics answered by /stats.
+            :rtype: dict
+        """
+        stats: BatcherStats           = self._batcher.GetStats()
+        latencies: dict[float, float] = stats.GetLatencyPercentiles((50, 90, 99))
+
+        return {
+            "queueDepth": self._batcher.GetQueueDepth(),
+            "requests": stats.requests,
+            "batches": stats.batches,
+            "averageBatchSize": stats.GetAverageBatchSize(),
+            "batchSizeHistogram": {str(size): count for (size, count) in enumerate(stats.batchSizeHistogram) if count > 0},
+            "latencySeconds": {"p50": latencies[50], "p90": latencies[90], "p99": latencies[99]},
+            "maxBatchSize": self._batcher.GetMaxBatchSize(),
+            "maxWaitSeconds": self._batcher.GetMaxWaitSeconds()
+        }
+
+    def Predict(self, pixels: list[float]) -> dict:
+        """
+            :param pixels: The 28 * 28 pixels of one image, from 0 to 255.
+            :type pixels: list[float]
+
+            :return: The answer of /predict.
+            :rtype: dict
+
+            :raises TypeError: If the pixels aren't a list of the right amount of numbers.
+        """
+        try:
+            values: np.ndarray = np.asarray(pixels, dtype=np.float64)
+        except (TypeError, ValueError):
+            raise TypeError("The pixels have to be a list of numbers!")
+
+        values = np.clip(values, 0, 255) / 255
+
+        # Done on the request's own thread, the batcher's thread only runs the network.
+        if self._preprocessor is not None and np.shape(values) == (self._batcher.GetInputSize(),):
+            values = self._preprocessor.Process(values)
+
+        probabilities: np.ndarray = self._batcher.Compute(values)
+
+        return {"prediction": int(np.argmax(probabilities)), "probabilities": probabilities.tolist()}
+
+    def __enter__(self) -> "InferenceServer":
+        return self
+
+    def __exit__(self, *exception) -> None:
+        self.Close()
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+        The Unix socket version of http.server.ThreadingHTTPServer.
+    """
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """
+        Handles one HTTP request for the InferenceServer.
+    """
+
+    protocol_version: str = "HTTP/1.1" # Keeps connections open between requests.
+
+    def do_GET(self) -> None:
+        server: InferenceServer = self.server.inferenceServer
+
+        if self.path == "/stats":
+            self._answer(200, server.GetStats())
+        elif self.path == "/health":
+            self._answer(200, {"status": "ok"})
+        else:
+            self._answer(404, {"error": f"Unknown path: {self.path}"})
+
+    def do_POST(self) -> None:
+        server: InferenceServer = self.server.inferenceServer
+
+        if self.path != "/predict":
+            self._answer(404, {"error": f"Unknown path: {self.path}"})
+            return
+
+        try:
+            body: dict = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            self._answer(200, server.Predict(body["pixels"]))
+        except (ValueError, KeyError, TypeError) as exception:
+            self._answer(400, {"error": str(exception)})
+
+    def _answer(self, status: int, body: dict) -> None:
+        data: bytes = json.dumps(body).encode("utf-8")
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def address_string(self) -> str:
+        # Unix socket clients don't have an address.
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+
+    def log_message(self, format: str, *arguments) -> None:
+        pass # Every request would be logged otherwise, which costs more than answering it.
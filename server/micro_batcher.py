@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+from concurrent.futures import Future
+from nn.frozen_network import FrozenNetwork
+from nn.network import Network
+import numpy as np
+import queue
+import threading
+import time
+
+class BatcherStats():
+    """
+        Counters describing how a MicroBatcher is used. The batch size histogram tells how well requests
+        are coalesced, the latencies (from Submit until the result is ready, so including the time spent
+        waiting in the queue) tell what callers experience.
+    """
+
+    def __init__(self: "BatcherStats", maxBatchSize: int, latencyWindow: int) -> None:
+        """
+            :param maxBatchSize: The biggest batch the batcher runs.
+            :type maxBatchSize: int
+
+            :param latencyWindow: The amount of most recent requests the latency percentiles are taken over.
+            :type latencyWindow: int
+        """
+        self.requests: int                 = 0 # Requests answered.
+        self.batches: int                  = 0 # Batches run through the network.
+        self.batchSizeHistogram: list[int] = [0] * (maxBatchSize + 1) # batchSizeHistogram[size] := batches of that size.
+
+        self._latencies: np.ndarray = np.zeros(latencyWindow) # Ring buffer of the latest latencies, in seconds.
+        self._lock: threading.Lock  = threading.Lock()
+
+    def _recordBatch(self, latencies: list[float]) -> None:
+        with self._lock:
+            for latency in latencies:
+                self._latencies[self.requests % len(self._latencies)] = latency
+                self.requests += 1
+
+            self.batches                            += 1
+            self.batchSizeHistogram[len(latencies)] += 1
+
+    def GetLatencyPercentiles(self, percentiles: tuple[float, ...] = (50, 90, 99)) -> dict[float, float]:
+        """
+            :param percentiles: The percentiles to compute, from 0 to 100.
+            :type percentiles: tuple[float, ...]
+
+            :return: The latency in seconds of every asked percentile, over the most recent requests. 0 if there were no requests yet.
+            :rtype: dict[float, float]
+        """
+        with self._lock:
+            latencies: np.ndarray = self._latencies[:min(self.requests, len(self._latencies))].copy()
+
+        if len(latencies) <= 0:
+            return {percentile: 0.0 for percentile in percentiles}
+
+        return dict(zip(percentiles, np.percentile(latencies, percentiles).tolist()))
+
+    def GetAverageBatchSize(self) -> float:
+        return self.requests / self.batches if self.batches > 0 else 0.0
+
+    def __repr__(self) -> str:
+        latencies: dict[float, float] = self.GetLatencyPercentiles()
+
+        return (f"BatcherStats(requests={self.requests}, batches={self.batches}, averageBatchSize={self.GetAverageBatchSize():.2f}, "
+                f"p50={latencies[50] * 1e3:.3f}ms, p90={latencies[90] * 1e3:.3f}ms, p99={latencies[99] * 1e3:.3f}ms)")
+
+class MicroBatcher():
+    """
+        Coalesces single image requests from many threads into batches, and runs each batch with one batched
+        Network.Compute on a background thread. A matrix multiplication over a batch costs far less than one
+        per image, and since only one thread uses the network, the network doesn't have to be thread safe.
+
+        A batch is run as soon as it's full (maxBatchSize) or when the oldest request in it has waited maxWaitSeconds,
+        whichever comes first. So under low load a request waits at most maxWaitSeconds extra, and under high load
+        batches fill up before the wait is over.
+    """
+
+    def __init__(self: "MicroBatcher", network: Network | FrozenNetwork, maxBatchSize: int = 32, maxWaitSeconds: float = 0.002, latencyWindow: int = 10000) -> None:
+        """
+            :param network: The network to run the batches through.
+            :type network: nn.Network | nn.FrozenNetwork
+
+            :param maxBatchSize: The most requests run as one batch.
+            :type maxBatchSize: int
+
+            :param maxWaitSeconds: The longest time the first request of a batch waits for more requests to join.
+            :type maxWaitSeconds: float
+
+            :param latencyWindow: The amount of most recent requests the latency percentiles are taken over.
+            :type latencyWindow: int
+
+            :raises TypeError: If maxBatchSize is lower than 1 or maxWaitSeconds is negative.
+        """
+        if maxBatchSize < 1:
+            raise TypeError("The max batch size can't be lower than 1!")
+
+        if maxWaitSeconds < 0:
+            raise TypeError("The max wait time can't be negative!")
+
+        self._network: Network | FrozenNetwork = network
+        self._maxBatchSize: int                = maxBatchSize
+        self._maxWaitSeconds: float            = maxWaitSeconds
+        self._stats: BatcherStats              = BatcherStats(maxBatchSize, latencyWindow)
+        self._queue: queue.Queue               = queue.Queue()
+        self._closed: bool                     = False
+        self._inputSize: int                   = network.GetInputSize()
+
+        self._thread: threading.Thread = threading.Thread(target=self._work, name="MicroBatcher", daemon=True)
+        self._thread.start()
+
+    def Submit(self, inputs: np.ndarray) -> Future:
+        """
+            Queues one image to be computed.
+
+            :param inputs: The inputs of the network for one image, shape (inputs,).
+            :type inputs: numpy.ndarray
+
+            :return: A future which gets the output of the network, shape (outputs,).
+            :rtype: concurrent.futures.Future
+
+            :raises RuntimeError: If the batcher has been closed.
+            :raises TypeError: If the inputs are of the wrong shape.
+        """
+        if self._closed:
+            raise RuntimeError("The micro batcher has been closed!")
+
+        if np.shape(inputs) != (self._inputSize,):
+            raise TypeError(f"Expected the inputs of one image of shape ({self._inputSize},), got {np.shape(inputs)}!")
+
+        future: Future = Future()
+        self._queue.put((inputs, future, time.perf_counter()))
+
+        return future
+
+    def Compute(self, inputs: np.ndarray, timeout: float | None = None) -> np.ndarray:
+        """
+            Like Network.Compute for one image, but batched together with the other callers.
+
+            :param inputs: The inputs of the network for one image, shape (inputs,).
+            :type inputs: numpy.ndarray
+
+            :param timeout: The most seconds to wait for the result, forever if None.
+            :type timeout: float | None
+
+            :return: The output of the network, shape (outputs,).
+            :rtype: numpy.ndarray
+        """
+        return self.Submit(inputs).result(timeout)
+
+    def GetQueueDepth(self) -> int:
+        """
+            :return: The amount of requests waiting to be put in a batch.
+            :rtype: int
+        """
+        return self._queue.qsize()
+
+    def GetStats(self) -> BatcherStats:
+        return self._stats
+
+    def GetInputSize(self) -> int:
+        return self._inputSize
+
+    def GetMaxBatchSize(self) -> int:
+        return self._maxBatchSize
+
+    def GetMaxWaitSeconds(self) -> float:
+        return self._maxWaitSeconds
+
+    def Close(self) -> None:
+        """
+            Stops the background thread after the requests already queued have been answered.
+        """
+        if self._closed:
+            return
+
+        self._closed = True
+        self._queue.put(None) # Wakes up the thread.
+        self._thread.join()
+
+    def _work(self) -> None:
+        """
+            The loop of the background thread: waits for a request, gathers a batch and computes it.
+        """
+        inputs: np.ndarray | None = None
+
+        while True:
+            request: tuple | None = self._queue.get()
+
+            if request is None:
+                self._drain()
+                return
+
+            batch: list[tuple] = [request]
+            deadline: float    = request[2] + self._maxWaitSeconds
+            stopping: bool     = False
+
+            while len(batch) < self._maxBatchSize:
+                remaining: float = deadline - time.perf_counter()
+
+                try:
+                    request = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+                if request is None:
+                    stopping = True
+                    break
+
+                batch.append(request)
+
+            # The batch is copied into a matrix which is reused as long as it's big enough.
+            if inputs is None or len(inputs) < len(batch):
+                inputs = np.empty((self._maxBatchSize, self._inputSize), dtype=self._network.GetDtype())
+
+            for (row, (imageInputs, _, _)) in enumerate(batch):
+                inputs[row] = imageInputs
+
+            try:
+                outputs: np.ndarray = self._network.Compute(inputs[:len(batch)])
+            except Exception as exception:
+                for (_, future, _) in batch:
+                    future.set_exception(exception)
+            else:
+                for (row, (_, future, _)) in enumerate(batch):
+                    future.set_result(outputs[row])
+
+            finished: float = time.perf_counter()
+            self._stats._recordBatch([finished - submitted for (_, _, submitted) in batch])
+
+            if stopping:
+                self._drain()
+                return
+
+    def _drain(self) -> None:
+        """
+            Fails the requests that were queued while the batcher was closing.
+        """
+        while True:
+            try:
+                request: tuple | None = self._queue.get_nowait()
+            except queue.Empty:
+                return
+
+            if request is not None:
+                request[1].set_exception(RuntimeError("The micro batcher has been closed!"))
+
+    def __enter__(self) -> "MicroBatcher":
+        return self
+
+    def __exit__(self, *exception) -> None:
+        self.Close()
+
+    def __del__(self) -> None:
+        if not getattr(self, "_closed", True):
+            self.Close()
@@ -0,0 +1,142 @@
+import http.client
+import json
+import socket
+import tempfile
+import threading
+import unittest
+
+from mnist.preprocessor import Preprocessor
+from nn.costs.cross_entropy import CrossEntropy
+from nn.layers.dense import Dense
+from nn.layers.relu import Relu
+from nn.layers.softmax import Softmax
+from nn.network import Network
+from nn.networks.sequential import Sequential
+from pathlib import Path
+from server.inference_server import InferenceServer
+from server.micro_batcher import MicroBatcher
+import numpy as np
+
+def _createNetwork() -> Network:
+    return Sequential([Dense(28 * 28, 16), Relu(16), Dense(16, 10), Softmax(10)], CrossEntropy(10), 0.1)
+
+class TestMicroBatcher(unittest.TestCase):
+    def test_concurrent_requests_are_batched(self) -> None:
+        # Arrange:
+        network: Network   = _createNetwork()
+        images: np.ndarray = np.random.rand(64, 28 * 28)
+        expected: np.ndarray = network.Compute(images)
+        results: list      = [None] * len(images)
+        start: threading.Barrier = threading.Barrier(len(images))
+
+        with MicroBatcher(network, maxBatchSize=16, maxWaitSeconds=0.05) as batcher:
+            def request(index: int) -> None:
+                start.wait()
+                results[index] = batcher.Compute(images[index], timeout=10)
+
+            # Act:
+            threads: list[threading.Thread] = [threading.Thread(target=request, args=(index,)) for index in range(len(images))]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        # Assert:
+        np.testing.assert_allclose(np.array(results), expected, rtol=1e-12)
+        stats = batcher.GetStats()
+        self.assertEqual(stats.requests, 64)
+        self.assertLess(stats.batches, 64)
+        self.assertEqual(sum(size * count for (size, count) in enumerate(stats.batchSizeHistogram)), 64)
+        self.assertGreater(stats.GetLatencyPercentiles()[99], 0.0)
+
+    def test_waits_at_most_max_wait(self) -> None:
+        # Arrange:
+        with MicroBatcher(_createNetwork(), maxBatchSize=32, maxWaitSeconds=0.01) as batcher:
+            # Act:
+            batcher.Compute(np.random.rand(28 * 28), timeout=10)
+
+        # Assert:
+        self.assertEqual(batcher.GetStats().batchSizeHistogram[1], 1)
+
+    def test_wrong_inputs_and_closed(self) -> None:
+        # Arrange:
+        batcher: MicroBatcher = MicroBatcher(_createNetwork())
+
+        # Assert:
+        self.assertRaises(TypeError, batcher.Submit, np.zeros(10))
+        batcher.Close()
+        self.assertRaises(RuntimeError, batcher.Submit, np.zeros(28 * 28))
+
+class TestInferenceServer(unittest.TestCase):
+    def _request(self, connection: http.client.HTTPConnection, method: str, path: str, body: dict | None = None) -> tuple[int, dict]:
+        connection.request(method, path, body=None if body is None else json.dumps(body), headers={"Content-Type": "application/json"})
+        response: http.client.HTTPResponse = connection.getresponse()
+
+        return (response.status, json.loads(response.read()))
+
+    def test_predict_over_tcp(self) -> None:
+        # Arrange:
+        network: Network = _createNetwork()
+        pixels: np.ndarray = np.random.randint(0, 256, size=28 * 28)
+
+        with InferenceServer(network, port=0) as server:
+            server.Start()
+            (host, port) = server.GetAddress()
+            connection: http.client.HTTPConnection = http.client.HTTPConnection(host, port, timeout=10)
+
+            # Act:
+            (status, answer)          = self._request(connection, "POST", "/predict", {"pixels": pixels.tolist()})
+            (badStatus, _)            = self._request(connection, "POST", "/predict", {"pixels": [1, 2, 3]})
+            (statsStatus, stats)      = self._request(connection, "GET", "/stats")
+            connection.close()
+
+        # Assert:
+        expected: np.ndarray = network.Compute(pixels / 255)
+        self.assertEqual(status, 200)
+        self.assertEqual(answer["prediction"], int(np.argmax(expected)))
+        np.testing.assert_allclose(answer["probabilities"], expected, rtol=1e-12)
+        self.assertEqual(badStatus, 400)
+        self.assertEqual(statsStatus, 200)
+        self.assertEqual(stats["requests"], 1)
+        self.assertEqual(stats["batchSizeHistogram"], {"1": 1})
+        self.assertIn("p99", stats["latencySeconds"])
+
+    def test_predict_with_preprocessor(self) -> None:
+        # Arrange:
+        network: Network   = _createNetwork()
+        pixels: np.ndarray = np.zeros((28, 28))
+        pixels[2:9, 1:4]   = 255 # A small digit in the corner.
+
+        expected: np.ndarray = network.Compute(Preprocessor().Process(pixels.reshape(-1) / 255))
+
+        with InferenceServer(network, port=0, preprocessor=Preprocessor()) as server:
+            # Act:
+            answer: dict = server.Predict(pixels.reshape(-1).tolist())
+
+        # Assert:
+        np.testing.assert_allclose(answer["probabilities"], expected, rtol=1e-5)
+
+    @unittest.skipUnless(hasattr(socket, "AF_UNIX"), "Unix sockets aren't supported on this platform.")
+    def test_predict_over_unix_socket(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            # Arrange:
+            path: Path = Path(directory) / "server.sock"
+
+            with InferenceServer(_createNetwork(), unixSocket=path) as server:
+                server.Start()
+
+                connection: http.client.HTTPConnection = http.client.HTTPConnection("localhost", timeout=10)
+                connection.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                connection.sock.connect(str(path))
+
+                # Act:
+                (status, answer) = self._request(connection, "POST", "/predict", {"pixels": [0] * (28 * 28)})
+                connection.close()
+
+            # Assert:
+            self.assertEqual(status, 200)
+            self.assertIn(answer["prediction"], range(10))
+            self.assertFalse(path.exists())
+
+if __name__ == "__main__":
+    unittest.main()